@@ -17,6 +17,7 @@ import six
 from knack.cli import CLI
 from knack.commands import CLICommandsLoader
 from knack.completion import ARGCOMPLETE_ENV_NAME
+from knack.events import EVENT_CLI_POST_EXECUTE
 from knack.introspection import extract_args_from_signature, extract_full_summary_from_signature
 from knack.log import get_logger
 from knack.preview import PreviewItem
@@ -52,7 +53,7 @@ class AzCli(CLI):
             register_ids_argument, register_global_subscription_argument)
         from azure.cli.core.cloud import get_active_cloud
         from azure.cli.core.commands.transform import register_global_transforms
-        from azure.cli.core._session import ACCOUNT, CONFIG, SESSION
+        from azure.cli.core._session import ACCOUNT, CONFIG, SESSION, RESOURCE_IDS, flush_sessions
 
         from knack.util import ensure_dir
 
@@ -67,6 +68,8 @@ class AzCli(CLI):
         ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
         CONFIG.load(os.path.join(azure_folder, 'az.json'))
         SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
+        RESOURCE_IDS.load(os.path.join(azure_folder, 'resourceIds.json'))
+        self.register_event(EVENT_CLI_POST_EXECUTE, flush_sessions)
         self.cloud = get_active_cloud(self)
         logger.debug('Current cloud config:\n%s', str(self.cloud.name))
         self.local_context = AzCLILocalContext(
@@ -78,6 +81,8 @@ class AzCli(CLI):
         register_cache_arguments(self)
 
         self.progress_controller = None
+        self.lro_scheduler = None
+        self.resource_waiter = None
 
     def refresh_request_id(self):
         """Assign a new random GUID as x-ms-client-request-id
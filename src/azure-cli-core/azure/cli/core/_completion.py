@@ -0,0 +1,425 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import time
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+COMPLETION_TREE_FILE_NAME = 'completionTree.json'
+COMPLETION_CACHE_FILE_NAME = 'completionCache.json'
+COMPLETION_TREE_VERSION = 1
+DEFAULT_COMPLETION_CACHE_TTL = 60
+PREFETCH_ENV_NAME = '_AZ_COMPLETION_PREFETCH'
+
+
+def _completion_tree_fingerprint():
+    """ Changes whenever the set of available commands may have changed: a CLI upgrade or extension changes. """
+    from azure.cli.core import __version__
+    from azure.cli.core.extension import EXTENSIONS_DIR, DEV_EXTENSION_SOURCES, EXTENSIONS_SYS_DIR
+
+    parts = [__version__]
+    for ext_dir in [EXTENSIONS_DIR, EXTENSIONS_SYS_DIR] + DEV_EXTENSION_SOURCES:
+        try:
+            for name in sorted(os.listdir(ext_dir)):
+                parts.append('{}:{}'.format(name, os.stat(os.path.join(ext_dir, name)).st_mtime))
+        except (OSError, IOError):
+            continue
+    return '|'.join(parts)
+
+
+def _write_json(path, data):
+    from azure.cli.core.util import atomic_write
+    with atomic_write(path) as f:
+        json.dump(data, f, separators=(',', ':'))
+
+
+def _describe_action(action):
+    import argparse
+    from argcomplete.completers import SuppressCompleter
+
+    completer = getattr(action, 'completer', None)
+    suppressed = action.help == argparse.SUPPRESS or \
+        (isinstance(completer, SuppressCompleter) and completer.suppress())
+    choices = None
+    if completer is None and action.choices is not None:
+        choices = [str(c) for c in action.choices]
+    return {
+        'options': list(action.option_strings),
+        'nargs': action.nargs,
+        'choices': choices,
+        'completer': completer is not None,
+        'suppressed': suppressed
+    }
+
+
+class CompletionEngine(object):
+    """ Answers tab completion from a cached tree of command groups, commands and their arguments.
+
+    Completing through the parser requires loading every command module and building argparse parsers, which costs
+    around a second per <TAB>. The tree lets static completions (groups, commands, option names and choices) be
+    answered without importing command modules. The tree is filled in by the regular completion path: the command
+    names when the command table is loaded, the options of a command or group once its parser was built for a
+    completion. Results of dynamic completers (e.g. resource names) are kept in the CompletionCache.
+
+    `complete` returns None whenever the answer needs the parser, and the caller falls back to the regular path.
+    """
+
+    def __init__(self, cli_ctx):
+        from azure.cli.core._environment import get_config_dir
+
+        self.cli_ctx = cli_ctx
+        self.tree_path = os.path.join(get_config_dir(), COMPLETION_TREE_FILE_NAME)
+        self._tree = None
+        self._nodes = None
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            fingerprint = _completion_tree_fingerprint()
+            try:
+                with open(self.tree_path, 'r') as f:
+                    tree = json.load(f)
+                if tree.get('version') != COMPLETION_TREE_VERSION or tree.get('fingerprint') != fingerprint:
+                    raise ValueError('completion tree is out of date')
+            except (OSError, IOError, ValueError) as ex:
+                if os.path.exists(self.tree_path):
+                    logger.debug("Discarding completion tree '%s': %s", self.tree_path, ex)
+                tree = {'version': COMPLETION_TREE_VERSION, 'fingerprint': fingerprint, 'commands': [],
+                        'parsers': {}, 'external': False}
+            self._tree = tree
+        return self._tree
+
+    @property
+    def nodes(self):
+        """ Children of each group in command table order, keyed by group name ('' for the root). """
+        if self._nodes is None:
+            self._nodes = {}
+            for command in self.tree['commands']:
+                parts = command.split()
+                for i, part in enumerate(parts):
+                    children = self._nodes.setdefault(' '.join(parts[:i]), [])
+                    if part not in children:
+                        children.append(part)
+        return self._nodes
+
+    # Recording from the regular completion path
+
+    def record(self, commands_loader, parser):
+        """ Add the commands of the loaded command table and the parsers built for this completion to the tree. """
+        from azure.cli.core.commands.events import EVENT_INVOKER_ON_TAB_COMPLETION
+
+        tree = self.tree
+        changed = False
+        commands = list(commands_loader.cmd_to_loader_map)
+        if commands != tree['commands']:
+            tree['commands'] = commands
+            self._nodes = None
+            changed = True
+        # completions added by extensions through the event cannot be answered from the tree
+        external = bool(self.cli_ctx._event_handlers.get(EVENT_INVOKER_ON_TAB_COMPLETION))  # pylint: disable=protected-access
+        if external != tree['external']:
+            tree['external'] = external
+            changed = True
+
+        parsers = {'': parser}
+        for path, subparsers in parser.subparsers.items():
+            for name, sub in subparsers._name_parser_map.items():  # pylint: disable=protected-access
+                parsers[' '.join(path + (name,))] = sub
+        for name, sub in parsers.items():
+            actions = [_describe_action(a) for a in sub._actions if a.option_strings]  # pylint: disable=protected-access
+            record = {
+                'command': name in parser.subparser_map,
+                'actions': actions,
+                'positionals': any(not a.option_strings and a.nargs != 'A...'
+                                   for a in sub._actions)  # pylint: disable=protected-access
+            }
+            if tree['parsers'].get(name) != record:
+                tree['parsers'][name] = record
+                changed = True
+        if changed:
+            try:
+                _write_json(self.tree_path, tree)
+            except (OSError, IOError) as ex:
+                logger.debug("Unable to save the completion tree '%s': %s", self.tree_path, ex)
+
+    # Answering from the tree
+
+    def _resolve(self, comp_words):
+        """ Split the words after `az` into the command or group they name, its record and the remaining words. """
+        path = []
+        words = comp_words[1:]
+        for word in words:
+            name = ' '.join(path)
+            if name and self.tree['parsers'].get(name, {}).get('command'):
+                break
+            if word not in self.nodes.get(name, []):
+                return None
+            path.append(word)
+        name = ' '.join(path)
+        record = self.tree['parsers'].get(name)
+        if record is None:
+            return None
+        return name, record, words[len(path):]
+
+    def complete(self, comp_words, cword_prefix, quote=None):
+        """ Return the completions for the word being typed, or None if the parser is needed.
+
+        :param quote: callable applied to completions computed from the tree. Cached results of dynamic completers
+            were quoted when they were produced.
+        """
+        if self.tree['external'] or not self.tree['commands']:
+            return None
+        if cword_prefix.startswith('-') and '=' in cword_prefix:
+            return None
+        resolved = self._resolve(comp_words)
+        if resolved is None:
+            return None
+        name, record, rest = resolved
+        quote = quote or (lambda completions: completions)
+
+        if not record['command']:
+            if rest:
+                return None
+            children = [c for c in self.nodes.get(name, []) if c.lower().startswith(cword_prefix.lower())]
+            return quote(self._complete_options(record, cword_prefix) + children)
+
+        pending = self._pending_action(record, rest)
+        if pending is False:
+            return None
+        if cword_prefix.startswith('-'):
+            return quote(self._complete_options(record, cword_prefix))
+        if pending is not None:
+            if pending['nargs'] is not None:
+                return None
+            if pending['completer']:
+                return self._cached_result(name, comp_words, cword_prefix)
+            if pending['choices'] is not None:
+                return quote([c for c in pending['choices'] if c.lower().startswith(cword_prefix.lower())])
+            return []
+        if record['positionals']:
+            return None
+        return quote(self._complete_options(record, cword_prefix))
+
+    @staticmethod
+    def _find_action(record, word):
+        matches = [a for a in record['actions'] if word in a['options']]
+        if not matches and word.startswith('--'):
+            # argparse accepts unambiguous abbreviations of long options
+            matches = [a for a in record['actions'] if any(o.startswith(word) for o in a['options'])]
+        return matches[0] if len(matches) == 1 else None
+
+    def _pending_action(self, record, words):
+        """ The option still waiting for its value after `words`, None if there is none, False if unsure. """
+        pending = None
+        for word in words:
+            if word == '--':
+                return False
+            if word.startswith('-') and len(word) > 1:
+                action = self._find_action(record, word)
+                if action is None:
+                    return False
+                pending = action if action['nargs'] != 0 else None
+            elif pending is not None and pending['nargs'] is None:
+                pending = None
+            elif pending is None and not record['positionals']:
+                return False
+            elif pending is not None:
+                # values of options taking several of them, or positionals, need the parser
+                return False
+        return pending
+
+    @staticmethod
+    def _complete_options(record, cword_prefix):
+        return [o for a in record['actions'] if not a['suppressed']
+                for o in a['options'] if o.lower().startswith(cword_prefix.lower())]
+
+    # Results of dynamic completers
+
+    def _cache_key(self, comp_words, cword_prefix):
+        return '\x1f'.join(['words', _default_subscription_id(self.cli_ctx)] + comp_words[1:] + [cword_prefix])
+
+    def _cached_result(self, command, comp_words, cword_prefix):
+        result = CompletionCache(self.cli_ctx).get(self._cache_key(comp_words, cword_prefix))
+        if result is not None:
+            logger.debug("Using cached completions for '%s'", command)
+        return result
+
+    def cache_result(self, comp_words, cword_prefix, completions):
+        """ Keep the completions produced by a dynamic completer for the next <TAB> with the same words. """
+        if self.tree['external'] or cword_prefix.startswith('-'):
+            return
+        resolved = self._resolve(comp_words)
+        if resolved is None or not resolved[1]['command']:
+            return
+        pending = self._pending_action(resolved[1], resolved[2])
+        if not pending or not pending['completer'] or pending['nargs'] is not None:
+            return
+        CompletionCache(self.cli_ctx).set(self._cache_key(comp_words, cword_prefix), list(completions))
+
+
+def _default_subscription_id(cli_ctx):
+    """ The subscription completers list resources of, read from the profile without loading `Profile`. """
+    from azure.cli.core._session import ACCOUNT
+    cloud_name = getattr(getattr(cli_ctx, 'cloud', None), 'name', None)
+    for subscription in ACCOUNT.get('subscriptions') or []:
+        if subscription.get('isDefault') and subscription.get('environmentName', cloud_name) == cloud_name:
+            return subscription.get('id') or ''
+    return ''
+
+
+class CompletionCache(object):
+    """ Completion results kept for `core.completion_cache_ttl` seconds, shared by processes completing in a row.
+
+    Once an entry is past half of its lifetime, a hit also starts a detached `az` process that completes the same
+    line again (see `_spawn_prefetch`), so the entry is refreshed before it expires and later <TAB> presses keep
+    being answered from the cache.
+    """
+
+    def __init__(self, cli_ctx):
+        from azure.cli.core._environment import get_config_dir
+        self.path = os.path.join(get_config_dir(), COMPLETION_CACHE_FILE_NAME)
+        self.ttl = cli_ctx.config.getint('core', 'completion_cache_ttl', fallback=DEFAULT_COMPLETION_CACHE_TTL)
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, IOError, ValueError):
+            return {}
+
+    def _save(self, cache):
+        try:
+            _write_json(self.path, cache)
+        except (OSError, IOError) as ex:
+            logger.debug("Unable to save completions '%s': %s", self.path, ex)
+
+    def get(self, key):
+        """ Return the cached value, or None when there is none, it expired or this process is a prefetch. """
+        if self.ttl <= 0 or os.environ.get(PREFETCH_ENV_NAME):
+            return None
+        cache = self._load()
+        entry = cache.get(key)
+        now = time.time()
+        if not entry or entry['expires'] <= now:
+            return None
+        if entry['expires'] - now < self.ttl / 2.0 and entry.get('prefetch', 0) <= now:
+            # only one refresh per entry at a time
+            entry['prefetch'] = now + self.ttl / 2.0
+            self._save(cache)
+            _spawn_prefetch()
+        return entry['value']
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        now = time.time()
+        cache = {k: v for k, v in self._load().items() if isinstance(v, dict) and v.get('expires', 0) > now}
+        cache[key] = {'expires': now + self.ttl, 'value': value}
+        self._save(cache)
+
+
+def _spawn_prefetch():
+    """ Complete the current line again in a detached process that skips the caches and stores fresh results. """
+    import subprocess
+    import sys
+    if 'COMP_LINE' not in os.environ:
+        return
+    env = dict(os.environ)
+    env[PREFETCH_ENV_NAME] = '1'
+    env['_ARGCOMPLETE_STDOUT_FILENAME'] = os.devnull
+    kwargs = {'start_new_session': True} if os.name != 'nt' else \
+        {'creationflags': getattr(subprocess, 'DETACHED_PROCESS', 0)}
+    try:
+        subprocess.Popen([sys.executable, '-m', 'azure.cli'], env=env, stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=True, **kwargs)
+    except (OSError, ValueError) as ex:
+        logger.debug('Unable to prefetch completions: %s', ex)
+
+
+def _completer_identity(func):
+    """ The completer function and the values it closes over, e.g. the resource type of a resource name completer. """
+    parts = ['{}.{}'.format(func.__module__, getattr(func, '__qualname__', func.__name__))]
+    for cell in getattr(func, '__closure__', None) or []:
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue
+        if isinstance(value, (str, int, float, bool, type(None))):
+            parts.append(repr(value))
+        elif isinstance(value, (list, tuple)) and all(isinstance(v, str) for v in value):
+            parts.append(repr(list(value)))
+        else:
+            parts.append(getattr(value, '__qualname__', type(value).__name__))
+    return parts
+
+
+def get_completer_result(func, cmd, prefix, namespace):
+    """ Call a completer function, answering from the completion cache when possible.
+
+    Entries are keyed by subscription, completer identity and the arguments already on the command line, since
+    completers commonly scope their listing to them (e.g. to the resource group), and by the prefix, since some
+    completers filter their listing on it.
+    """
+    subscription = getattr(namespace, '_subscription', None) or _default_subscription_id(cmd.cli_ctx)
+    arguments = sorted('{}={}'.format(k, v) for k, v in vars(namespace).items()
+                       if not k.startswith('_') and isinstance(v, (str, int, float, bool)))
+    parts = ['completer', subscription] + _completer_identity(func) + arguments + ['prefix=' + (prefix or '')]
+    key = '\x1f'.join(parts)
+
+    cache = CompletionCache(cmd.cli_ctx)
+    result = cache.get(key)
+    if result is not None:
+        return result
+    result = func(cmd, prefix, namespace)
+    if result is not None:
+        result = list(result)
+        if all(isinstance(r, str) for r in result):
+            cache.set(key, result)
+    return result
+
+
+def try_fast_completion(cli_ctx, output_stream=None, exit_method=os._exit):  # pylint: disable=protected-access
+    """ Answer an argcomplete request from the completion tree if possible, without loading command modules.
+
+    Follows the protocol of `argcomplete.CompletionFinder.__call__` and returns if the regular path is needed.
+    """
+    import argcomplete
+    from argcomplete.compat import sys_encoding
+    from knack.completion import ARGCOMPLETE_ENV_NAME
+    from azure.cli.core.parser import AzCompletionFinder
+
+    if os.environ.get(PREFETCH_ENV_NAME) or \
+            not cli_ctx.config.getboolean('core', 'use_completion_tree', fallback=True):
+        return
+    try:
+        comp_line = os.environ['COMP_LINE']
+        comp_point = int(os.environ['COMP_POINT'])
+        start = int(os.environ[ARGCOMPLETE_ENV_NAME]) - 1
+    except (KeyError, ValueError):
+        return
+    ifs = os.environ.get('_ARGCOMPLETE_IFS', '\013')
+    if len(ifs) != 1 or os.environ.get('_ARGCOMPLETE_DFS'):
+        return
+
+    cword_prequote, cword_prefix, _, comp_words, last_wordbreak_pos = argcomplete.split_line(comp_line, comp_point)
+    finder = AzCompletionFinder()
+    completions = CompletionEngine(cli_ctx).complete(
+        comp_words[start:], cword_prefix,
+        quote=lambda c: finder.quote_completions(c, cword_prequote, last_wordbreak_pos))
+    if completions is None:
+        return
+
+    if output_stream is None:
+        try:
+            output_stream = os.fdopen(8, 'wb')
+        except (OSError, IOError):
+            return
+    output_stream.write(ifs.join(completions).encode(sys_encoding))
+    output_stream.flush()
+    exit_method(0)
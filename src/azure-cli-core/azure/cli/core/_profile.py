@@ -19,7 +19,7 @@ from six.moves import BaseHTTPServer
 from azure.cli.core._environment import get_config_dir
 from azure.cli.core._session import ACCOUNT
 from azure.cli.core.util import get_file_json, in_cloud_console, open_page_in_browser, can_launch_browser,\
-    is_windows, is_wsl
+    is_windows, is_wsl, atomic_write
 from azure.cli.core.cloud import get_active_cloud, set_cloud_subscription
 
 from knack.log import get_logger
@@ -117,6 +117,13 @@ def _load_tokens_from_file(file_path):
     return []
 
 
+def _write_tokens_to_file(file_path, entries):
+    """ Replace the token file atomically, so that readers never see a partially written file. """
+    file_path = os.path.realpath(file_path)  # keep a symbolic link to the token file
+    with atomic_write(file_path) as cred_file:  # created with 0o600
+        cred_file.write(json.dumps(entries))
+
+
 def _delete_file(file_path):
     try:
         os.remove(file_path)
@@ -979,6 +986,7 @@ class CredsCache(object):
         self._token_file = (os.environ.get('AZURE_ACCESS_TOKEN_FILE', None) or
                             os.path.join(get_config_dir(), 'accessTokens.json'))
         self._service_principal_creds = []
+        self._service_principal_changes = {}
         self._auth_ctx_factory = auth_ctx_factory
         self._adal_token_cache_attr = None
         self._should_flush_to_disk = False
@@ -996,20 +1004,46 @@ class CredsCache(object):
 
     def flush_to_disk(self):
         if self._should_flush_to_disk:
-            with os.fdopen(os.open(self._token_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600),
-                           'w+') as cred_file:
-                items = self.adal_token_cache.read_items()
-                all_creds = [entry for _, entry in items]
-
-                # trim away useless fields (needed for cred sharing with xplat)
-                for i in all_creds:
-                    for key in TOKEN_FIELDS_EXCLUDED_FROM_PERSISTENCE:
-                        i.pop(key, None)
-
-                all_creds.extend(self._service_principal_creds)
-                cred_file.write(json.dumps(all_creds))
+            import portalocker
+            # merge the changes of this process into the file under a lock, as other processes may have written
+            # their tokens meanwhile
+            try:
+                with portalocker.Lock(self._token_file + '.lock', timeout=10):
+                    self._merge_to_disk()
+            except portalocker.LockException:
+                logger.debug("Failed to lock %s, writing it without the lock.", self._token_file)
+                self._merge_to_disk()
+            self._should_flush_to_disk = False
+
+    def _merge_to_disk(self):
+        from azure.cli.core._token_cache import merge_token_entries
+        current = _load_tokens_from_file(self._token_file)
+        tokens = merge_token_entries([x for x in current if not x.get(_SERVICE_PRINCIPAL_ID)],
+                                     self.adal_token_cache.changes)
+
+        service_principal_creds = [x for x in current if x.get(_SERVICE_PRINCIPAL_ID)]
+        for key, cred in self._service_principal_changes.items():
+            service_principal_creds = [x for x in service_principal_creds
+                                       if (x[_SERVICE_PRINCIPAL_ID], x.get(_SERVICE_PRINCIPAL_TENANT)) != key]
+            if cred:
+                service_principal_creds.append(cred)
+
+        all_creds = []
+        for entry in tokens:
+            # trim away useless fields (needed for cred sharing with xplat)
+            all_creds.append({k: v for k, v in entry.items() if k not in TOKEN_FIELDS_EXCLUDED_FROM_PERSISTENCE})
+        all_creds.extend(service_principal_creds)
+        _write_tokens_to_file(self._token_file, all_creds)
+        self.adal_token_cache.changes = {}
+        self._service_principal_changes = {}
 
     def retrieve_token_for_user(self, username, tenant, resource):
+        # a valid token is taken straight from the index; ADAL handles refreshing and the multi-resource token
+        token_entry = self.adal_token_cache.lookup(_get_authority_url(self._ctx, tenant)[0], resource, _CLIENT_ID,
+                                                   username)
+        if token_entry:
+            return (token_entry[_TOKEN_ENTRY_TOKEN_TYPE], token_entry[_ACCESS_TOKEN], token_entry)
+
         context = self._auth_ctx_factory(self._ctx, tenant, cache=self.adal_token_cache)
         token_entry = context.acquire_token(resource, username, _CLIENT_ID)
         if not token_entry:
@@ -1070,11 +1104,11 @@ class CredsCache(object):
 
     def load_adal_token_cache(self):
         if self._adal_token_cache_attr is None:
-            import adal
+            from azure.cli.core._token_cache import IndexedTokenCache
             all_entries = _load_tokens_from_file(self._token_file)
             self._load_service_principal_creds(all_entries)
             real_token = [x for x in all_entries if x not in self._service_principal_creds]
-            self._adal_token_cache_attr = adal.TokenCache(json.dumps(real_token))
+            self._adal_token_cache_attr = IndexedTokenCache(json.dumps(real_token))
         return self._adal_token_cache_attr
 
     def save_service_principal_cred(self, sp_entry):
@@ -1095,6 +1129,8 @@ class CredsCache(object):
             state_changed = True
 
         if state_changed:
+            self._service_principal_changes[(sp_entry[_SERVICE_PRINCIPAL_ID],
+                                             sp_entry[_SERVICE_PRINCIPAL_TENANT])] = sp_entry
             self.persist_cached_creds()
 
     def _load_service_principal_creds(self, creds):
@@ -1118,6 +1154,8 @@ class CredsCache(object):
             state_changed = True
             self._service_principal_creds = [x for x in self._service_principal_creds
                                              if x not in matched]
+            for x in matched:
+                self._service_principal_changes[(x[_SERVICE_PRINCIPAL_ID], x.get(_SERVICE_PRINCIPAL_TENANT))] = None
 
         if state_changed:
             self.persist_cached_creds()
@@ -3,6 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import atexit
 import json
 import logging
 import os
@@ -22,48 +23,53 @@ try:
 except AttributeError:  # in Python 2.7
     t_JSONDecodeError = ValueError
 
+_LOCK_TIMEOUT = 10
+
 
 class Session(collections.MutableMapping):
     """
     A simple dict-like class that is backed by a JSON file.
 
-    All direct modifications will save the file. Indirect modifications should
-    be followed by a call to `save_with_retry` or `save`.
+    The file is read on first access. Direct modifications are kept in memory and written by `flush`, which runs
+    when the session is loaded again and, for the sessions of the CLI, at exit: the modified keys are merged into the
+    current content of the file while holding a lock on it, so concurrent processes don't overwrite each other's
+    changes. Indirect modifications should be followed by a call to `save_with_retry` or `save`, which replace the
+    content of the file with the data immediately. The file is always replaced atomically.
     """
 
     def __init__(self, encoding=None):
         super(Session, self).__init__()
         self.filename = None
-        self.data = {}
+        self._data = {}
+        self._modified_keys = set()
         self._encoding = encoding if encoding else 'utf-8-sig'
 
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = self._read(warn_on_error=True)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
     def load(self, filename, max_age=0):
+        self.flush()
         self.filename = filename
-        self.data = {}
-        try:
-            if max_age > 0:
-                st = os.stat(self.filename)
-                if st.st_mtime + max_age < time.time():
-                    self.save()
-            with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
-                self.data = json.load(f)
-        except (OSError, IOError, t_JSONDecodeError) as load_exception:
-            # OSError / IOError should imply file not found issues which are expected on fresh runs (e.g. on build
-            # agents or new systems). A parse error indicates invalid/bad data in the file. We do not wish to warn
-            # on missing files since we expect that, but do if the data isn't parsing as expected.
-            log_level = logging.INFO
-            if isinstance(load_exception, t_JSONDecodeError):
-                log_level = logging.WARNING
-
-            get_logger(__name__).log(log_level,
-                                     "Failed to load or parse file %s. It will be overridden by default settings.",
-                                     self.filename)
-            self.save()
+        self._data = None
+        self._modified_keys = set()
+        if max_age > 0:
+            try:
+                if os.stat(self.filename).st_mtime + max_age < time.time():
+                    os.remove(self.filename)  # expired, start over with an empty session
+            except OSError:
+                pass
 
     def save(self):
+        """ Replace the content of the file with the data of the session. """
         if self.filename:
-            with codecs_open(self.filename, 'w', encoding=self._encoding) as f:
-                json.dump(self.data, f)
+            self._commit(None)
 
     def save_with_retry(self, retries=5):
         for _ in range(retries - 1):
@@ -75,6 +81,59 @@ class Session(collections.MutableMapping):
         else:
             self.save()
 
+    def flush(self):
+        """ Write the keys modified since the last write. """
+        if self.filename and self._modified_keys:
+            try:
+                self._commit(self._modified_keys)
+            except OSError as ex:
+                get_logger(__name__).warning("Failed to save %s: %s", self.filename, ex)
+
+    def _commit(self, keys):
+        import portalocker
+        try:
+            with portalocker.Lock(self.filename + '.lock', timeout=_LOCK_TIMEOUT):
+                self._merge_and_write(keys)
+        except portalocker.LockException:
+            get_logger(__name__).debug("Failed to lock %s, writing it without the lock.", self.filename)
+            self._merge_and_write(keys)
+
+    def _merge_and_write(self, keys):
+        """ Write the given keys over the current content of the file, or all the data when keys is None. """
+        from azure.cli.core.util import atomic_write
+        if keys is None:
+            current = dict(self.data)
+        else:
+            current = self._read()
+            for key in keys:
+                if key in self.data:
+                    current[key] = self.data[key]
+                else:
+                    current.pop(key, None)
+
+        with atomic_write(self.filename, encoding=self._encoding) as f:
+            json.dump(current, f)
+        self._data = current
+        self._modified_keys = set()
+
+    def _read(self, warn_on_error=False):
+        try:
+            with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
+                return json.load(f)
+        except (OSError, IOError, t_JSONDecodeError) as load_exception:
+            # OSError / IOError should imply file not found issues which are expected on fresh runs (e.g. on build
+            # agents or new systems). A parse error indicates invalid/bad data in the file. We do not wish to warn
+            # on missing files since we expect that, but do if the data isn't parsing as expected.
+            if warn_on_error:
+                log_level = logging.INFO
+                if isinstance(load_exception, t_JSONDecodeError):
+                    log_level = logging.WARNING
+
+                get_logger(__name__).log(log_level,
+                                         "Failed to load or parse file %s. It will be overridden by default settings.",
+                                         self.filename)
+            return {}
+
     def get(self, key, default=None):
         return self.data.get(key, default)
 
@@ -83,11 +142,11 @@ class Session(collections.MutableMapping):
 
     def __setitem__(self, key, value):
         self.data[key] = value
-        self.save_with_retry()
+        self._modified_keys.add(key)
 
     def __delitem__(self, key):
         del self.data[key]
-        self.save_with_retry()
+        self._modified_keys.add(key)
 
     def __iter__(self):
         return iter(self.data)
@@ -104,3 +163,15 @@ CONFIG = Session()
 
 # SESSION provides read-write session variables
 SESSION = Session()
+
+# RESOURCE_IDS caches the IDs of resources resolved by name
+RESOURCE_IDS = Session()
+
+
+def flush_sessions(_, **kwargs):  # pylint: disable=unused-argument
+    """ Write the modifications of the CLI sessions when a command ends. """
+    for session in (ACCOUNT, CONFIG, SESSION, RESOURCE_IDS):
+        session.flush()
+
+
+atexit.register(flush_sessions, None)
@@ -0,0 +1,111 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+
+import adal
+from adal.constants import TokenResponseFields
+from adal.token_cache import TokenCacheKey, _get_cache_key
+
+# a token expiring within this time is refreshed by ADAL instead of being returned from the cache
+_CLOCK_BUFFER = datetime.timedelta(minutes=5)
+# refresh tokens are revoked after 90 days of inactivity
+_TOKEN_RETENTION = datetime.timedelta(days=90)
+
+
+def _index_key(client_id, user_id):
+    return (client_id or '').lower(), (user_id or '').lower()
+
+
+def _parse_expires_on(entry):
+    from dateutil import parser
+    try:
+        return parser.parse(entry[TokenResponseFields.EXPIRES_ON])
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return None
+
+
+class IndexedTokenCache(adal.TokenCache):
+    """
+    ADAL token cache which indexes the entries by client and user, so the lookups ADAL does when acquiring a token
+    don't scan the tokens of all users and tenants. The entries added and removed since the cache was loaded are
+    tracked in `changes`, so they can be merged into the token file written meanwhile by other processes.
+    """
+
+    def __init__(self, state=None):
+        self._index = {}
+        self.changes = {}
+        super(IndexedTokenCache, self).__init__(state)
+
+    def lookup(self, authority, resource, client_id, user_id):
+        """ Get the access token of a user for a resource, None if it is not cached or about to expire. """
+        entry = self._cache.get(TokenCacheKey(authority, resource, client_id, user_id))
+        if entry:
+            expires_on = _parse_expires_on(entry)
+            if expires_on and datetime.datetime.now(expires_on.tzinfo) + _CLOCK_BUFFER < expires_on:
+                return entry
+        return None
+
+    def find(self, query):
+        client_id = query.get(TokenResponseFields._CLIENT_ID)  # pylint: disable=protected-access
+        user_id = query.get(TokenResponseFields.USER_ID)
+        if client_id is None or user_id is None:
+            return super(IndexedTokenCache, self).find(query)
+
+        is_mrrt = query.get(TokenResponseFields.IS_MRRT)
+        with self._lock:
+            return [e for e in self._index.get(_index_key(client_id, user_id), {}).values()
+                    if is_mrrt is None or is_mrrt == e.get(TokenResponseFields.IS_MRRT)]
+
+    def add(self, entries):
+        with self._lock:
+            for e in entries:
+                key = _get_cache_key(e)
+                self._index.setdefault(_index_key(key.client_id, key.user_id), {})[key] = e
+                self.changes[key] = e
+            super(IndexedTokenCache, self).add(entries)
+
+    def remove(self, entries):
+        with self._lock:
+            for e in entries:
+                key = _get_cache_key(e)
+                bucket = self._index.get(_index_key(key.client_id, key.user_id), {})
+                bucket.pop(key, None)
+                self.changes[key] = None
+            super(IndexedTokenCache, self).remove(entries)
+
+    def deserialize(self, state):
+        with self._lock:
+            super(IndexedTokenCache, self).deserialize(state)
+            self._index = {}
+            for key, entry in self._cache.items():
+                self._index.setdefault(_index_key(key.client_id, key.user_id), {})[key] = entry
+
+
+def merge_token_entries(entries, changes, now=None):
+    """
+    Apply the changes of an IndexedTokenCache to the user token entries read from the token file, and drop the
+    entries which can't be used anymore: expired ones without a refresh token, and those expired for longer than
+    refresh tokens are kept by AAD.
+    """
+    merged = {}
+    for entry in entries:
+        merged[_get_cache_key(entry)] = entry
+    for key, entry in changes.items():
+        if entry is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = entry
+
+    result = []
+    for entry in merged.values():
+        expires_on = _parse_expires_on(entry)
+        if expires_on:
+            expired_for = (now or datetime.datetime.now(expires_on.tzinfo)) - expires_on
+            if expired_for > _TOKEN_RETENTION or \
+                    (expired_for > datetime.timedelta(0) and not entry.get(TokenResponseFields.REFRESH_TOKEN)):
+                continue
+        result.append(entry)
+    return result
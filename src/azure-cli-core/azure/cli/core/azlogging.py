@@ -24,8 +24,10 @@ omitted     Warning     Debug       Critical    Debug
 """
 
 import os
+import time
 import logging
 import datetime
+from collections import namedtuple
 
 from azure.cli.core.commands.events import EVENT_INVOKER_PRE_CMD_TBL_TRUNCATE
 
@@ -36,6 +38,11 @@ from knack.util import ensure_dir
 
 _UNKNOWN_COMMAND = "unknown_command"
 _CMD_LOG_LINE_PREFIX = "CMD-LOG-LINE-BEGIN"
+_COMMAND_LOG_SEGMENT_COUNT = 4
+_COMMAND_LOG_SEGMENT_SIZE = 512 * 1024
+_COMMAND_LOG_LOCK_TIMEOUT = 60
+
+CommandLogEntry = namedtuple('CommandLogEntry', ['name', 'segment_path', 'offset'])
 
 
 class AzCliLogging(CLILogging):
@@ -54,24 +61,6 @@ class AzCliLogging(CLILogging):
 
     @staticmethod
     def init_command_file_logging(cli_ctx, **kwargs):
-        def _delete_old_logs(log_dir):
-            """
-            Periodically delete the 5 oldest command log files, ensuring that only the history of the last
-            25 commands (or less) are kept.
-            """
-
-            # get log file names and sort them from newest to oldest file.
-            log_file_names = [file for file in os.listdir(log_dir) if file.endswith(".log")]
-            sorted_files = sorted(log_file_names, reverse=True)
-
-            # if we have too many files, delete the 5 last / oldest command log files.
-            if len(sorted_files) > 25:
-                for file in sorted_files[-5:]:
-                    try:
-                        os.remove(os.path.join(log_dir, file))
-                    except OSError:  # FileNotFoundError introduced in Python 3
-                        continue
-
         # if tab-completion and not command don't log to file.
         if not cli_ctx.data.get('completer_active', False):
             self = cli_ctx.logging
@@ -87,25 +76,28 @@ class AzCliLogging(CLILogging):
                 get_logger(__name__).debug("metadata file logging enabled - writing logs to '%s'.",
                                            self.command_log_dir)
 
-                _delete_old_logs(self.command_log_dir)
+    def get_command_log(self):
+        return CommandLog(self.command_log_dir,
+                          segment_count=self.cli_ctx.config.getint('logging', 'command_log_segments',
+                                                                   fallback=_COMMAND_LOG_SEGMENT_COUNT),
+                          segment_size=self.cli_ctx.config.getint('logging', 'command_log_segment_size',
+                                                                  fallback=_COMMAND_LOG_SEGMENT_SIZE))
 
     def _init_command_logfile_handlers(self, command_metadata_logger, args):
 
         ensure_dir(self.command_log_dir)
         command = self.cli_ctx.invocation._rudimentary_get_command(args) or _UNKNOWN_COMMAND  # pylint: disable=protected-access, line-too-long
         command_str = command.replace(" ", "_")
-        if command_str.lower() == "feedback":
+        if command_str.lower() == "feedback" or command_str.lower().startswith("command-log"):
             return
 
         date_str = str(datetime.datetime.now().date())
         time = datetime.datetime.now().time()
         time_str = "{:02}-{:02}-{:02}".format(time.hour, time.minute, time.second)
 
-        log_name = "{}.{}.{}.{}.{}".format(date_str, time_str, command_str, os.getpid(), "log")
-
-        log_file_path = os.path.join(self.command_log_dir, log_name)
+        log_name = "{}.{}.{}.{}".format(date_str, time_str, command_str, os.getpid())
 
-        logfile_handler = logging.FileHandler(log_file_path)
+        logfile_handler = CommandLogHandler(self.get_command_log(), log_name)
 
         lfmt = logging.Formatter(_CMD_LOG_LINE_PREFIX + ' %(process)d | %(asctime)s | %(levelname)s | %(name)s | %(message)s')  # pylint: disable=line-too-long
         logfile_handler.setFormatter(lfmt)
@@ -204,3 +196,207 @@ class CommandLoggerContext(object):
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.hdlr:
             self.logger.removeHandler(self.hdlr)
+
+
+class CommandLog(object):
+    """
+    Bounded log of the recent commands, shared by all CLI processes.
+
+    The records of the commands are appended to a ring of segment files, 'commands.<n>.seg'. The index file
+    'commands.idx' has one line '<name> <segment> <offset>' per command, where the name has the format
+    'date.time.command.pid'. When the active segment is full the next one is truncated and becomes active, and its
+    entries are dropped from the index. Neither writing nor reading lists the log directory, except once when the
+    ring is created, to move the per-command '.log' files of earlier versions into it.
+    """
+
+    def __init__(self, log_dir, segment_count=_COMMAND_LOG_SEGMENT_COUNT, segment_size=_COMMAND_LOG_SEGMENT_SIZE):
+        self.log_dir = log_dir
+        self.segment_count = max(segment_count, 2)
+        self.segment_size = segment_size
+        self.index_path = os.path.join(log_dir, 'commands.idx')
+        self._lock_path = os.path.join(log_dir, 'commands.lock')
+
+    def segment_path(self, segment):
+        return os.path.join(self.log_dir, 'commands.{}.seg'.format(segment))
+
+    def append(self, name, data, segment=None):
+        """
+        Append the formatted records of command `name` and return the segment they were written to. The first
+        append of a command starts a new entry; pass the returned segment to add more records to it.
+        """
+        new_entry = segment is None
+        if new_entry:
+            segment = self._get_writable_segment()
+        self._write(name, data.encode('utf-8'), segment, new_entry)
+        return segment
+
+    def _write(self, name, data, segment, new_entry):
+        # unbuffered, so that tell() gives the end of this write even when other processes append concurrently
+        with open(self.segment_path(segment), 'ab', buffering=0) as f:
+            f.write(data)
+            offset = f.tell() - len(data)
+        if new_entry:
+            with open(self.index_path, 'a') as f:
+                f.write('{} {} {}\n'.format(name, segment, offset))
+
+    def entries(self):
+        """ List the entries in the index, oldest first. """
+        entries = []
+        try:
+            with open(self.index_path, 'r') as f:
+                lines = f.readlines()
+        except (IOError, OSError):
+            return entries
+        for line in lines:
+            try:
+                name, segment, offset = line.split()
+                entries.append(CommandLogEntry(name, self.segment_path(int(segment)), int(offset)))
+            except ValueError:
+                continue
+        return entries
+
+    def _get_writable_segment(self):
+        # the active segment is the one written last; a stat per segment is cheaper than listing the directory
+        active, active_mtime = 0, None
+        for segment in range(self.segment_count):
+            try:
+                stat = os.stat(self.segment_path(segment))
+            except OSError:
+                continue
+            if active_mtime is None or stat.st_mtime > active_mtime:
+                active, active_mtime, active_size = segment, stat.st_mtime, stat.st_size
+
+        if active_mtime is None:
+            self._migrate_legacy_logs()
+            return active
+        if active_size < self.segment_size:
+            return active
+        next_segment = (active + 1) % self.segment_count
+        return next_segment if self._recycle_segment(next_segment) else active
+
+    def _lock(self):
+        """ Take the lock file of the log, False if another process holds it. """
+        try:
+            if time.time() - os.stat(self._lock_path).st_mtime > _COMMAND_LOG_LOCK_TIMEOUT:
+                os.remove(self._lock_path)  # left behind by a process which was killed
+        except OSError:
+            pass
+        try:
+            os.close(os.open(self._lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except OSError:
+            return False
+
+    def _unlock(self):
+        try:
+            os.remove(self._lock_path)
+        except OSError:
+            pass
+
+    def _recycle_segment(self, segment):
+        """ Truncate a segment and drop its entries. Only one process recycles at a time, the others keep
+        writing to the full segment meanwhile. """
+        from azure.cli.core.util import atomic_write
+        if not self._lock():
+            return False
+        try:
+            open(self.segment_path(segment), 'w').close()
+            kept = [entry for entry in self.entries() if entry.segment_path != self.segment_path(segment)]
+            with atomic_write(self.index_path) as f:
+                f.writelines('{} {} {}\n'.format(entry.name, _get_segment_number(entry.segment_path), entry.offset)
+                             for entry in kept)
+            return True
+        except (IOError, OSError) as ex:
+            get_logger(__name__).debug("Failed to recycle command log segment %s: %s", segment, ex)
+            return False
+        finally:
+            self._unlock()
+
+    def _migrate_legacy_logs(self):
+        """ Move the per-command '.log' files written by earlier versions into the first segment, oldest first. Only
+        done by the process creating the ring; the files are deleted once moved. """
+        if not self._lock():
+            return
+        try:
+            if os.path.exists(self.segment_path(0)):
+                return  # another process created the ring meanwhile
+            for file_name in sorted(f for f in os.listdir(self.log_dir) if f.endswith('.log')):
+                file_path = os.path.join(self.log_dir, file_name)
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+                if data:
+                    self._write(os.path.splitext(file_name)[0], data, 0, new_entry=True)
+                os.remove(file_path)
+        except (IOError, OSError) as ex:
+            get_logger(__name__).debug("Failed to move the command logs of earlier versions: %s", ex)
+        finally:
+            self._unlock()
+
+
+def _get_segment_number(segment_path):
+    return int(os.path.basename(segment_path).split('.')[1])
+
+
+def read_command_log_entry(entry):
+    """
+    Read the log lines of one command. Reading starts at the entry's offset and stops after the exit code record;
+    records of other processes written in between are skipped.
+    """
+    p_id = entry.name.rsplit('.', 1)[-1]
+    record_prefix = "{} {} |".format(_CMD_LOG_LINE_PREFIX, p_id)
+    lines = []
+    is_own_record = finished = False
+    with open(entry.segment_path, 'rb') as f:
+        f.seek(entry.offset)
+        for line in f:
+            line = line.decode('utf-8', errors='replace')
+            if not lines and not line.startswith(record_prefix):
+                break  # the segment was recycled since the entry was written
+            if line.startswith(_CMD_LOG_LINE_PREFIX):
+                if finished:
+                    break
+                is_own_record = line.startswith(record_prefix)
+                finished = is_own_record and line.split('|', 4)[-1].strip().startswith('exit code:')
+            if is_own_record:
+                lines.append(line)
+    return lines
+
+
+class CommandLogHandler(logging.Handler):
+    """
+    Keep the formatted records of a command in memory and append them to the command log in one write when the
+    handler is closed, so a command costs a single segment write and index line. Records are written earlier when
+    `capacity` of them are buffered.
+    """
+
+    def __init__(self, command_log, entry_name, capacity=200):
+        super(CommandLogHandler, self).__init__()
+        self.command_log = command_log
+        self.entry_name = entry_name
+        self.capacity = capacity
+        self.buffer = []
+        self._segment = None
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record) + '\n')
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+        if len(self.buffer) >= self.capacity:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.buffer:
+                data = ''.join(self.buffer)
+                self.buffer = []
+                self._segment = self.command_log.append(self.entry_name, data, self._segment)
+        except (IOError, OSError) as ex:
+            get_logger(__name__).debug("Failed to write the command log: %s", ex)
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super(CommandLogHandler, self).close()
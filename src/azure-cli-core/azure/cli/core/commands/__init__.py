@@ -14,6 +14,7 @@ import logging as logs
 import os
 import re
 import sys
+import threading
 import time
 import copy
 from importlib import import_module
@@ -501,6 +502,10 @@ class AzCliCommandInvoker(CommandInvoker):
         from azure.cli.core.commands.events import (
             EVENT_INVOKER_PRE_CMD_TBL_TRUNCATE, EVENT_INVOKER_PRE_LOAD_ARGUMENTS, EVENT_INVOKER_POST_LOAD_ARGUMENTS)
 
+        if self.cli_ctx.data['completer_active']:
+            from azure.cli.core._completion import try_fast_completion
+            try_fast_completion(self.cli_ctx)
+
         # TODO: Can't simply be invoked as an event because args are transformed
         args = _pre_command_table_create(self.cli_ctx, args)
 
@@ -558,6 +563,11 @@ class AzCliCommandInvoker(CommandInvoker):
         self.cli_ctx.raise_event(EVENT_INVOKER_CMD_TBL_LOADED, cmd_tbl=self.commands_loader.command_table,
                                  parser=self.parser)
 
+        if self.cli_ctx.data['completer_active']:
+            from azure.cli.core._completion import CompletionEngine
+            self.parser.completion_engine = CompletionEngine(self.cli_ctx)
+            self.parser.completion_engine.record(self.commands_loader, self.parser)
+
         arg_check = [a for a in args if a not in ['--debug', '--verbose']]
         if not arg_check:
             self.parser.enable_autocomplete()
@@ -699,15 +709,23 @@ class AzCliCommandInvoker(CommandInvoker):
 
     def _run_jobs_concurrently(self, jobs, ids):
         from concurrent.futures import ThreadPoolExecutor, as_completed
+        from azure.cli.core.commands.waiting import ResourceWaiter
         tasks, results, exceptions = [], [], []
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            for expanded_arg, cmd_copy in jobs:
-                tasks.append(executor.submit(self._run_job, expanded_arg, cmd_copy))
-            for index, task in enumerate(as_completed(tasks)):
-                try:
-                    results.append(task.result())
-                except (Exception, SystemExit) as ex:  # pylint: disable=broad-except
-                    exceptions.append((ex, ids[index]))
+        # the jobs share a scheduler and a waiter only while they run, so later invocations start afresh
+        previous_scheduler, previous_waiter = self.cli_ctx.lro_scheduler, self.cli_ctx.resource_waiter
+        self.cli_ctx.lro_scheduler = LongRunningOperationScheduler(self.cli_ctx)
+        self.cli_ctx.resource_waiter = ResourceWaiter(progress=self.cli_ctx.get_progress_controller())
+        try:
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                for expanded_arg, cmd_copy in jobs:
+                    tasks.append(executor.submit(self._run_job, expanded_arg, cmd_copy))
+                for index, task in enumerate(as_completed(tasks)):
+                    try:
+                        results.append(task.result())
+                    except (Exception, SystemExit) as ex:  # pylint: disable=broad-except
+                        exceptions.append((ex, ids[index]))
+        finally:
+            self.cli_ctx.lro_scheduler, self.cli_ctx.resource_waiter = previous_scheduler, previous_waiter
         return results, exceptions
 
     def resolve_warnings(self, cmd, parsed_args):
@@ -843,8 +861,8 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
         self.deploy_dict = {}
         self.last_progress_report = datetime.datetime.now()
 
-    def _delay(self):
-        time.sleep(self.poller_done_interval_ms / 1000.0)
+    def _delay(self, scheduler, operation):  # pylint: disable=no-self-use
+        scheduler.wait_for_change([operation])
 
     def _generate_template_progress(self, correlation_id):  # pylint: disable=no-self-use
         """ gets the progress for template deployments """
@@ -919,16 +937,17 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
         cli_logger = get_logger()  # get CLI logger which has the level set through command lines
         is_verbose = any(handler.level <= logs.INFO for handler in cli_logger.handlers)
 
-        while not poller.done():
-            self.cli_ctx.get_progress_controller().add(message='Running')
-            try:
-                # pylint: disable=protected-access
-                correlation_id = json.loads(
-                    poller._response.__dict__['_content'].decode())['properties']['correlationId']
+        # commands run concurrently for --ids share one scheduler, so they wait and report progress together
+        scheduler = getattr(self.cli_ctx, 'lro_scheduler', None)
+        if not isinstance(scheduler, LongRunningOperationScheduler):
+            scheduler = LongRunningOperationScheduler(self.cli_ctx, poller_done_interval_ms=self.poller_done_interval_ms)
+        operation = scheduler.submit(poller)
 
+        while not operation.done():
+            scheduler.report_progress()
+            correlation_id = operation.correlation_id or correlation_id
+            if correlation_id:
                 correlation_message = 'Correlation ID: {}'.format(correlation_id)
-            except:  # pylint: disable=bare-except
-                pass
 
             current_time = datetime.datetime.now()
             if is_verbose and current_time - self.last_progress_report >= datetime.timedelta(seconds=10):
@@ -938,7 +957,7 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
                 except Exception as ex:  # pylint: disable=broad-except
                     logger.warning('%s during progress reporting: %s', getattr(type(ex), '__name__', type(ex)), ex)
             try:
-                self._delay()
+                self._delay(scheduler, operation)
             except KeyboardInterrupt:
                 self.cli_ctx.get_progress_controller().stop()
                 logger.error('Long-running operation wait cancelled.  %s', correlation_message)
@@ -956,6 +975,135 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
         return result
 
 
+def _get_poller_response(poller):
+    # pylint: disable=protected-access
+    polling_method = getattr(poller, '_polling_method', None)
+    return getattr(polling_method, '_response', None) or getattr(poller, '_response', None)
+
+
+class ScheduledOperation(object):
+    """ A long-running operation submitted to a LongRunningOperationScheduler. """
+
+    def __init__(self, poller, name=None):
+        self.poller = poller
+        self.name = name
+        self._correlation_response = None
+        self._correlation_id = None
+
+    def done(self):
+        return self.poller.done()
+
+    def result(self, timeout=None):
+        return self.poller.result(timeout)
+
+    @property
+    def correlation_id(self):
+        """ Correlation ID of the operation, the response is only parsed again once the poller received a new one. """
+        response = _get_poller_response(self.poller)
+        if response is not None and response is not self._correlation_response:
+            self._correlation_response = response
+            try:
+                self._correlation_id = json.loads(
+                    response.__dict__['_content'].decode())['properties']['correlationId']
+            except:  # pylint: disable=bare-except
+                pass
+        return self._correlation_id
+
+    @property
+    def retry_after(self):
+        """ Seconds the service asked to wait before the operation is checked again, if any. """
+        try:
+            return int(_get_poller_response(self.poller).headers['Retry-After'])
+        except:  # pylint: disable=bare-except
+            return None
+
+
+class LongRunningOperationScheduler(object):
+    """ Waits on any number of long-running operations from a single loop.
+
+    The SDK pollers wake the scheduler as soon as they complete, so waiting threads do not sleep and poll on
+    their own, and progress for all pending operations is reported as one message. Composite commands can
+    start several operations and await them together:
+
+        scheduler = LongRunningOperationScheduler(cmd.cli_ctx)
+        scheduler.submit(client.disks.create_or_update(...), name='disk')
+        scheduler.submit(client.network_interfaces.create_or_update(...), name='nic')
+        disk, nic = scheduler.wait()
+    """
+
+    def __init__(self, cli_ctx, poller_done_interval_ms=1000.0):
+        self.cli_ctx = cli_ctx
+        self.poller_done_interval_ms = poller_done_interval_ms
+        self.operations = []
+        self._changed = threading.Condition()
+        self._last_progress_report = None
+
+    def submit(self, poller, name=None):
+        """ Start tracking a poller and return its ScheduledOperation. """
+        operation = ScheduledOperation(poller, name)
+        with self._changed:
+            self.operations.append(operation)
+        try:
+            poller.add_done_callback(self._notify)
+        except (AttributeError, ValueError):
+            # the operation already completed or the poller does not support callbacks, it is picked up by the
+            # periodic check instead
+            pass
+        return operation
+
+    def _notify(self, *_):
+        with self._changed:
+            self._changed.notify_all()
+
+    def pending(self, operations=None):
+        return [o for o in (self.operations if operations is None else operations) if not o.done()]
+
+    def next_delay(self, operations=None):
+        """ Seconds until the given operations need to be checked again. """
+        delay = self.poller_done_interval_ms / 1000.0
+        retry_after = [o.retry_after for o in self.pending(operations)]
+        if retry_after and all(retry_after):
+            # no point looking before every service said it would have news
+            delay = max(delay, min(retry_after))
+        return delay
+
+    def wait_for_change(self, operations=None):
+        """ Block until one of the operations completes or the next check is due. """
+        with self._changed:
+            pending = self.pending(operations)
+            if pending:
+                self._changed.wait(self.next_delay(pending))
+
+    def report_progress(self):
+        """ Report a single progress message for every pending operation, at most once per check interval. """
+        now = time.time()
+        with self._changed:
+            if self._last_progress_report and \
+                    now - self._last_progress_report < self.poller_done_interval_ms / 1000.0:
+                return
+            self._last_progress_report = now
+            pending = self.pending()
+        if len(self.operations) > 1:
+            names = [o.name for o in pending if o.name]
+            message = 'Running {} of {} operations'.format(len(pending), len(self.operations))
+            if names:
+                message += ': {}'.format(', '.join(names))
+        else:
+            message = 'Running'
+        self.cli_ctx.get_progress_controller().add(message=message)
+
+    def wait(self, operations=None):
+        """ Wait for the operations (all submitted ones by default) and return their results in submission order.
+
+        If an operation failed its exception is raised once every operation has completed.
+        """
+        operations = list(self.operations if operations is None else operations)
+        while self.pending(operations):
+            self.report_progress()
+            self.wait_for_change(operations)
+        return [o.result() for o in operations]
+
+
 # pylint: disable=too-few-public-methods
 class DeploymentOutputLongRunningOperation(LongRunningOperation):
     def __call__(self, result):
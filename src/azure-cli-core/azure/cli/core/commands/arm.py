@@ -603,7 +603,7 @@ def _cli_wait_command(context, name, getter_op, custom_command=False, **kwargs):
         )
         cmd_args['interval'] = CLICommandArgument(
             'interval', options_list=['--interval'], default=30, arg_group=group_name, type=int,
-            help='polling interval in seconds'
+            help='maximum polling interval in seconds, polls back off exponentially up to it'
         )
         cmd_args['deleted'] = CLICommandArgument(
             'deleted', options_list=['--deleted'], action='store_true', arg_group=group_name,
@@ -640,8 +640,7 @@ def _cli_wait_command(context, name, getter_op, custom_command=False, **kwargs):
 
     def handler(args):
         from azure.cli.core.commands.client_factory import resolve_client_arg_name
-        from msrest.exceptions import ClientException
-        import time
+        from azure.cli.core.commands.waiting import ResourceWaiter, WaitTarget
 
         context_copy = copy.copy(context)
         getter_args = dict(extract_args_from_signature(context.get_op_handler(
@@ -671,43 +670,43 @@ def _cli_wait_command(context, name, getter_op, custom_command=False, **kwargs):
             raise CLIError(
                 "incorrect usage: --created | --updated | --deleted | --exists | --custom JMESPATH")
 
-        progress_indicator = context_copy.cli_ctx.get_progress_controller()
-        progress_indicator.begin()
-        for _ in range(0, timeout, interval):
-            try:
-                progress_indicator.add(message='Waiting')
-                instance = getter(**args)
-                if wait_for_exists:
-                    progress_indicator.end()
-                    return None
-                provisioning_state = get_provisioning_state(instance)
-                # until we have any needs to wait for 'Failed', let us bail out on this
-                if provisioning_state:
-                    provisioning_state = provisioning_state.lower()
-                if provisioning_state == 'failed':
-                    progress_indicator.stop()
-                    raise CLIError('The operation failed')
-                if ((wait_for_created or wait_for_updated) and provisioning_state == 'succeeded') or \
-                        custom_condition and bool(verify_property(instance, custom_condition)):
-                    progress_indicator.end()
-                    return None
-            except ClientException as ex:
-                progress_indicator.stop()
-                if getattr(ex, 'status_code', None) == 404:
+        def check(instance, error):
+            if error is not None:
+                if getattr(error, 'status_code', None) == 404:
                     if wait_for_deleted:
-                        return None
+                        return True
                     if not any([wait_for_created, wait_for_exists, custom_condition]):
-                        raise
-                else:
-                    raise
-            except Exception:  # pylint: disable=broad-except
-                progress_indicator.stop()
-                raise
-
-            time.sleep(interval)
+                        raise error
+                    return False
+                raise error
+            if wait_for_exists:
+                return True
+            provisioning_state = get_provisioning_state(instance)
+            # until we have any needs to wait for 'Failed', let us bail out on this
+            if provisioning_state:
+                provisioning_state = provisioning_state.lower()
+            if provisioning_state == 'failed':
+                raise CLIError('The operation failed')
+            return ((wait_for_created or wait_for_updated) and provisioning_state == 'succeeded') or \
+                bool(custom_condition and verify_property(instance, custom_condition))
 
+        progress_indicator = context_copy.cli_ctx.get_progress_controller()
+        progress_indicator.begin()
+        progress_indicator.add(message='Waiting')
+        # jobs of a concurrent `wait --ids` run share one waiter so every resource is polled from a single loop
+        waiter = getattr(cmd.cli_ctx, 'resource_waiter', None)
+        if not isinstance(waiter, ResourceWaiter):
+            waiter = ResourceWaiter(timeout=timeout, progress=progress_indicator)
+        target = WaitTarget(lambda: getter(**args), check, max_interval=interval)
+        waiter.wait([target], timeout=timeout)
+
+        if target.error is not None:
+            progress_indicator.stop()
+            raise target.error
         progress_indicator.end()
-        return CLIError('Wait operation timed-out after {} seconds'.format(timeout))
+        if target.timed_out:
+            return CLIError('Wait operation timed-out after {} seconds'.format(timeout))
+        return None
 
     context._cli_command(name, handler=handler, argument_loader=generic_wait_arguments_loader, **kwargs)  # pylint: disable=protected-access
 
@@ -0,0 +1,119 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Cache of the IDs of resources, by subscription, resource type and name.
+
+Commands which accept a resource name without its resource group look the resource up by listing all the resources
+of its type in the subscription. The IDs of the listed resources are kept for RESOURCE_ID_CACHE_TTL seconds, so the
+next commands, including the ones of other processes, resolve any of them without listing again. Commands creating or
+deleting resources should call `invalidate_resource_id`.
+
+Names are only unique per subscription for some resource types, e.g. storage accounts or IoT hubs. The cache keeps a
+single ID per name, so it shouldn't be used for the types whose names are only unique in a resource group.
+"""
+
+import time
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+RESOURCE_ID_CACHE_TTL = 3600
+
+
+def _cache_key(subscription_id, resource_type):
+    return '{}/{}'.format(subscription_id, resource_type).lower()
+
+
+def _cached_ids(subscription_id, resource_type):
+    from azure.cli.core._session import RESOURCE_IDS
+    entry = RESOURCE_IDS.get(_cache_key(subscription_id, resource_type))
+    if entry and entry.get('time', 0) + RESOURCE_ID_CACHE_TTL > time.time():
+        return entry['ids']
+    return None
+
+
+def prefetch_resource_ids(subscription_id, resource_type, list_resources):
+    """
+    List the resources of a type and cache their IDs.
+    :param str subscription_id: The subscription of the resources.
+    :param str resource_type: The resource type, e.g. 'Microsoft.Devices/IotHubs'.
+    :param list_resources: A function returning the resources of the type in the subscription. The resources must
+     have `name` and `id` attributes.
+    :returns: dict of the lower case resource names to their IDs.
+    """
+    from azure.cli.core._session import RESOURCE_IDS
+    ids = {r.name.lower(): r.id for r in list_resources() or []}
+    logger.debug("Caching the IDs of %d resources of type '%s'", len(ids), resource_type)
+    RESOURCE_IDS[_cache_key(subscription_id, resource_type)] = {'time': time.time(), 'ids': ids}
+    return ids
+
+
+def resolve_resource_ids(subscription_id, resource_type, names, list_resources):
+    """
+    Resolve the IDs of resources of a type by their names. The resources are listed at most once, when one of the
+    names isn't cached.
+    :returns: dict of the names to their IDs, None for the names of resources which don't exist.
+    """
+    ids = _cached_ids(subscription_id, resource_type)
+    if ids is None or any(n.lower() not in ids for n in names):
+        ids = prefetch_resource_ids(subscription_id, resource_type, list_resources)
+    return {n: ids.get(n.lower()) for n in names}
+
+
+def resolve_resource_id(subscription_id, resource_type, name, list_resources):
+    """
+    Resolve the ID of a resource of a type by its name.
+    :returns: The ID of the resource, None if it doesn't exist.
+    """
+    return resolve_resource_ids(subscription_id, resource_type, [name], list_resources)[name]
+
+
+def invalidate_resource_id(subscription_id, resource_type, name=None):
+    """
+    Remove a resource, or all the resources of a type when no name is given, from the cache.
+    """
+    from azure.cli.core._session import RESOURCE_IDS
+    key = _cache_key(subscription_id, resource_type)
+    entry = RESOURCE_IDS.get(key)
+    if not entry:
+        return
+    if name is None:
+        del RESOURCE_IDS[key]
+    elif name.lower() in entry['ids']:
+        ids = dict(entry['ids'])
+        del ids[name.lower()]
+        RESOURCE_IDS[key] = dict(entry, ids=ids)
+
+
+def _list_resources_by_type(cli_ctx, subscription_id, resource_type):
+    def _list_resources():
+        from azure.cli.core.commands.client_factory import get_mgmt_service_client
+        from azure.cli.core.profiles import ResourceType
+        client = get_mgmt_service_client(cli_ctx, ResourceType.MGMT_RESOURCE_RESOURCES, subscription_id=subscription_id)
+        return client.resources.list(filter="resourceType eq '{}'".format(resource_type))
+    return _list_resources
+
+
+def resolve_resource_ids_by_type(cli_ctx, resource_type, names, subscription_id=None):
+    """
+    Resolve the IDs of resources of a type by their names, listing all the resources of the type in the subscription
+    with the generic resources API at most once.
+    :param str subscription_id: The subscription of the resources, the current subscription if None.
+    :returns: dict of the names to their IDs, None for the names of resources which don't exist.
+    """
+    from azure.cli.core.commands.client_factory import get_subscription_id
+    subscription_id = subscription_id or get_subscription_id(cli_ctx)
+    return resolve_resource_ids(subscription_id, resource_type, names,
+                                _list_resources_by_type(cli_ctx, subscription_id, resource_type))
+
+
+def resolve_resource_id_by_type(cli_ctx, resource_type, name, subscription_id=None):
+    """
+    Resolve the ID of a resource of a type by its name with the generic resources API.
+    :returns: The ID of the resource, None if it doesn't exist.
+    """
+    return resolve_resource_ids_by_type(cli_ctx, resource_type, [name], subscription_id)[name]
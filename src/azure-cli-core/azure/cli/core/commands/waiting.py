@@ -0,0 +1,154 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import random
+import threading
+import time
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+INITIAL_INTERVAL = 2
+BACKOFF_JITTER = 0.2
+
+
+class WaitTarget(object):  # pylint: disable=too-many-instance-attributes
+    """ A resource polled by a ResourceWaiter until its wait condition is met.
+
+    :param getter: callable returning the current state of the resource.
+    :param check: callable taking (instance, error) that returns True once the condition is met. `error` is the
+        ClientException raised by the getter, if any. Raising from `check` aborts the wait for this target.
+    :param int max_interval: upper bound in seconds for the delay between two polls.
+    """
+
+    def __init__(self, getter, check, max_interval=30, name=None):
+        self.getter = getter
+        self.check = check
+        self.max_interval = max(max_interval, 1)
+        self.name = name
+        self.deadline = None
+        self.next_poll = 0
+        self.timed_out = False
+        self.error = None
+        self._delay = None
+        self._done = threading.Event()
+
+    def done(self):
+        return self._done.is_set()
+
+    def finish(self, error=None, timed_out=False):
+        self.error = error
+        self.timed_out = timed_out
+        self._done.set()
+
+    def schedule(self, polled_at, retry_after=None):
+        """ Schedule the next poll relative to when the last one started, so request latency counts towards it. """
+        if retry_after:
+            delay = retry_after
+        else:
+            self._delay = min(INITIAL_INTERVAL if self._delay is None else self._delay * 2, self.max_interval)
+            delay = self._delay * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+        self.next_poll = polled_at + delay
+
+
+def _get_retry_after(ex):
+    if getattr(ex, 'status_code', None) != 429:
+        return None
+    headers = getattr(getattr(ex, 'response', None), 'headers', None) or {}
+    try:
+        return int(headers.get('Retry-After', INITIAL_INTERVAL))
+    except (TypeError, ValueError):
+        return INITIAL_INTERVAL
+
+
+class ResourceWaiter(object):
+    """ Polls any number of WaitTargets from a single loop with exponential backoff and jitter.
+
+    Several threads may wait on the same waiter, e.g. the jobs of a `wait --ids a b c` command. One of them drives
+    the loop for every registered target while the others block until their own target is done.
+
+        waiter = ResourceWaiter(timeout=600)
+        waiter.wait([WaitTarget(lambda: client.get(rg, 'vm1'), is_running),
+                     WaitTarget(lambda: client.get(rg, 'vm2'), is_running)])
+    """
+
+    def __init__(self, timeout=3600, progress=None):
+        self.timeout = timeout
+        self.progress = progress
+        self._targets = []
+        self._changed = threading.Condition()
+        self._driving = False
+
+    def wait(self, targets, timeout=None):
+        """ Block until every target met its condition, failed or timed out, then return the targets. """
+        from msrest.exceptions import ClientException
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        for target in targets:
+            target.deadline = deadline
+            # the first poll happens right away rather than waiting for the loop
+            self._poll(target, ClientException)
+        with self._changed:
+            self._targets.extend(t for t in targets if not t.done())
+
+        while True:
+            with self._changed:
+                if all(t.done() for t in targets):
+                    return targets
+                if self._driving:
+                    self._changed.wait()
+                    continue
+                self._driving = True
+            try:
+                self._drive(targets, ClientException)
+            finally:
+                with self._changed:
+                    self._driving = False
+                    self._changed.notify_all()
+
+    def _drive(self, targets, client_exception_type):
+        wake_at = 0
+        while not all(t.done() for t in targets):
+            # whatever the sleep was for is due once it returns, even if it returned early
+            now = max(time.monotonic(), wake_at)
+            with self._changed:
+                self._targets = [t for t in self._targets if not t.done()]
+                pending = list(self._targets)
+            for target in pending:
+                if target.deadline <= now:
+                    target.finish(timed_out=True)
+                elif target.next_poll <= now:
+                    self._poll(target, client_exception_type, now)
+            with self._changed:
+                self._changed.notify_all()
+                pending = [t for t in self._targets if not t.done()]
+            if self.progress:
+                self.progress.add(message='Waiting')
+            if pending and not all(t.done() for t in targets):
+                wake_at = min(min(t.next_poll, t.deadline) for t in pending)
+                time.sleep(max(wake_at - time.monotonic(), 0))
+
+    @staticmethod
+    def _poll(target, client_exception_type, now=0):
+        polled_at = max(time.monotonic(), now)
+        instance, error = None, None
+        try:
+            instance = target.getter()
+        except client_exception_type as ex:  # pylint: disable=broad-except
+            retry_after = _get_retry_after(ex)
+            if retry_after:
+                logger.debug("Throttled while waiting, retrying in %s seconds", retry_after)
+                target.schedule(polled_at, retry_after)
+                return
+            error = ex
+        except Exception as ex:  # pylint: disable=broad-except
+            target.finish(error=ex)
+            return
+        try:
+            if target.check(instance, error):
+                target.finish()
+            else:
+                target.schedule(polled_at)
+        except Exception as ex:  # pylint: disable=broad-except
+            target.finish(error=ex)
@@ -26,7 +26,8 @@ class Completer(object):
         namespace = kwargs['parsed_args']
         prefix = kwargs['prefix']
         cmd = namespace._cmd  # pylint: disable=protected-access
-        return self.func(cmd, prefix, namespace)
+        from azure.cli.core._completion import get_completer_result
+        return get_completer_result(self.func, cmd, prefix, namespace)
 
 
 def call_once(factory_func):
@@ -40,6 +41,7 @@ def call_once(factory_func):
     def _wrapped(*args, **kwargs):
         if not factory_func.executed:
             factory_func.cached_result = factory_func(*args, **kwargs)
+            factory_func.executed = True
 
         return factory_func.cached_result
 
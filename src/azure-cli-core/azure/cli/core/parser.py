@@ -44,10 +44,14 @@ class AzCompletionFinder(argcomplete.CompletionFinder):
                                          cword_prequote=cword_prequote,
                                          last_wordbreak_pos=last_wordbreak_pos)
 
-        return external_completions + super(AzCompletionFinder, self)._get_completions(comp_words,
-                                                                                       cword_prefix,
-                                                                                       cword_prequote,
-                                                                                       last_wordbreak_pos)
+        completions = external_completions + super(AzCompletionFinder, self)._get_completions(comp_words,
+                                                                                              cword_prefix,
+                                                                                              cword_prequote,
+                                                                                              last_wordbreak_pos)
+        completion_engine = getattr(self._parser, 'completion_engine', None)
+        if completion_engine:
+            completion_engine.cache_result(comp_words, cword_prefix, completions)
+        return completions
 
 
 class AzCliCommandParser(CLICommandParser):
@@ -66,6 +70,7 @@ class AzCliCommandParser(CLICommandParser):
         self._suggestion_msg = []
         self.subparser_map = {}
         self.specified_arguments = []
+        self.completion_engine = None
         super(AzCliCommandParser, self).__init__(cli_ctx, cli_help=cli_help, **kwargs)
 
     def load_command_table(self, command_loader):
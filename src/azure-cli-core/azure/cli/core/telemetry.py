@@ -22,6 +22,8 @@ TELEMETRY_VERSION = '0.0.1.4'
 AZURE_CLI_PREFIX = 'Context.Default.AzureCLI.'
 DEFAULT_INSTRUMENTATION_KEY = 'c4395b75-49cc-422c-bc95-c7d51aef5d46'
 CORRELATION_ID_PROP_NAME = 'Reserved.DataModel.CorrelationId'
+MACHINE_PROPERTIES_FILE_NAME = 'telemetryProperties.json'
+MACHINE_PROPERTIES_MAX_AGE = datetime.timedelta(days=7)
 
 
 class TelemetrySession(object):  # pylint: disable=too-many-instance-attributes
@@ -116,10 +118,10 @@ class TelemetrySession(object):  # pylint: disable=too-many-instance-attributes
             'Context.Default.VS.Core.ExeName': PRODUCT_NAME,
             'Context.Default.VS.Core.ExeVersion': '{}@{}'.format(
                 self.product_version, self.module_version),
-            'Context.Default.VS.Core.MacAddressHash': _get_hash_mac_address(),
-            'Context.Default.VS.Core.Machine.Id': _get_hash_machine_id(),
-            'Context.Default.VS.Core.OS.Type': platform.system().lower(),  # eg. darwin, windows
-            'Context.Default.VS.Core.OS.Version': platform.version().lower(),  # eg. 10.0.14942
+            'Context.Default.VS.Core.MacAddressHash': _get_machine_properties().get('mac_address_hash', ''),
+            'Context.Default.VS.Core.Machine.Id': _get_machine_properties().get('machine_id', ''),
+            'Context.Default.VS.Core.OS.Type': _get_machine_properties().get('os_type'),  # eg. darwin, windows
+            'Context.Default.VS.Core.OS.Version': _get_machine_properties().get('os_version'),  # eg. 10.0.14942
             'Context.Default.VS.Core.User.Id': _get_installation_id(),
             'Context.Default.VS.Core.User.IsMicrosoftInternal': 'False',
             'Context.Default.VS.Core.User.IsOptedIn': 'True',
@@ -160,8 +162,7 @@ class TelemetrySession(object):  # pylint: disable=too-many-instance-attributes
         set_custom_properties(result, 'DefaultOutputType',
                               lambda: _get_config().get('core', 'output', fallback='unknown'))
         set_custom_properties(result, 'EnvironmentVariables', _get_env_string)
-        set_custom_properties(result, 'Locale',
-                              lambda: '{},{}'.format(locale.getdefaultlocale()[0], locale.getdefaultlocale()[1]))
+        set_custom_properties(result, 'Locale', lambda: _get_machine_properties().get('locale'))
         set_custom_properties(result, 'StartTime', str(self.start_time))
         set_custom_properties(result, 'EndTime', str(self.end_time))
         set_custom_properties(result, 'OutputType', self.output_type)
@@ -396,6 +397,38 @@ def _get_profile():
     return Profile(cli_ctx=_session.application)
 
 
+@decorators.call_once
+@decorators.suppress_all_exceptions(fallback_return={})
+def _get_machine_properties():
+    """ Properties of the machine sent with every event. They are costly to compute, `uuid.getnode` may run external
+    programs to find the MAC address, so they are cached in the configuration directory for a while. """
+    from azure.cli.core._environment import get_config_dir
+    path = os.path.join(get_config_dir(), MACHINE_PROPERTIES_FILE_NAME)
+    try:
+        if datetime.datetime.now().timestamp() - os.path.getmtime(path) < MACHINE_PROPERTIES_MAX_AGE.total_seconds():
+            with open(path, 'r') as f:
+                properties = json.load(f)
+            if properties.get('python_version') == platform.python_version():
+                return properties
+    except (OSError, IOError, ValueError):
+        pass
+
+    properties = {
+        'mac_address_hash': _get_hash_mac_address(),
+        'machine_id': _get_hash_machine_id(),
+        'os_type': platform.system().lower(),
+        'os_version': platform.version().lower(),
+        'locale': '{},{}'.format(locale.getdefaultlocale()[0], locale.getdefaultlocale()[1]),
+        'python_version': platform.python_version()
+    }
+    try:
+        with open(path, 'w') as f:
+            json.dump(properties, f)
+    except (OSError, IOError):
+        pass
+    return properties
+
+
 @decorators.suppress_all_exceptions(fallback_return='')
 @decorators.hash256_result
 def _get_hash_mac_address():
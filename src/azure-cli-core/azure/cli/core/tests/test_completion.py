@@ -0,0 +1,178 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import argparse
+import io
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+from azure.cli.core._completion import CompletionEngine, try_fast_completion, PREFETCH_ENV_NAME
+from azure.cli.core.commands import AzCliCommand
+from azure.cli.core.decorators import Completer
+from azure.cli.core.mock import DummyCli
+from azure.cli.core.parser import AzCliCommandParser
+
+
+def _handler():
+    pass
+
+
+class TestCompletionEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir, ignore_errors=True)
+        patcher = mock.patch('azure.cli.core._environment.get_config_dir', return_value=self.config_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.cli = DummyCli()
+        self.cli.loader = mock.MagicMock()
+        self.cli.loader.cli_ctx = self.cli
+        create = AzCliCommand(self.cli.loader, 'network vnet create', _handler)
+        create.add_argument('resource_group_name', '--resource-group', '-g', completer=lambda **_: ['rg1'])
+        create.add_argument('location', '--location', '-l')
+        create.add_argument('sku', '--sku', choices=['Basic', 'Standard'])
+        create.add_argument('no_wait', '--no-wait', action='store_true')
+        self.cli.commands_loader.command_table = {'network vnet create': create}
+        self.cli.commands_loader.cmd_to_loader_map = {'network vnet create': None, 'network vnet list': None,
+                                                      'network lb create': None, 'vm create': None}
+        self.parser = AzCliCommandParser(self.cli)
+        self.parser.load_command_table(self.cli.commands_loader)
+        CompletionEngine(self.cli).record(self.cli.commands_loader, self.parser)
+
+    def _complete(self, line):
+        words = line.split()
+        prefix = '' if line.endswith(' ') else words.pop()
+        return CompletionEngine(self.cli).complete(words, prefix)
+
+    def test_complete_groups_and_commands(self):
+        self.assertEqual(self._complete('az '), ['-h', '--help', 'network', 'vm'])
+        self.assertEqual(self._complete('az net'), ['network'])
+        self.assertEqual(self._complete('az network '), ['-h', '--help', 'vnet', 'lb'])
+        # the parser of this group was not built yet
+        self.assertIsNone(self._complete('az vm '))
+        self.assertIsNone(self._complete('az storage '))
+
+    def test_complete_options_and_choices(self):
+        options = self._complete('az network vnet create ')
+        self.assertIn('--resource-group', options)
+        self.assertIn('--no-wait', options)
+        self.assertEqual(self._complete('az network vnet create --l'), ['--location'])
+        self.assertEqual(self._complete('az network vnet create --no-wait --sku '), ['Basic', 'Standard'])
+        self.assertEqual(self._complete('az network vnet create --sk s'), ['Standard'])
+        self.assertEqual(self._complete('az network vnet create -l '), [])
+        # commands whose options were not recorded yet need the parser
+        self.assertIsNone(self._complete('az network vnet list '))
+        self.assertIsNone(self._complete('az network vnet create --unknown '))
+
+    def test_dynamic_completions_are_cached(self):
+        words = ['az', 'network', 'vnet', 'create', '-g']
+        self.assertIsNone(self._complete('az network vnet create -g '))
+
+        CompletionEngine(self.cli).cache_result(words, '', ['rg1 '])
+        self.assertEqual(self._complete('az network vnet create -g '), ['rg1 '])
+        self.assertIsNone(self._complete('az network vnet create -g r'))
+
+        expired = time.time() + 3600
+        with mock.patch('azure.cli.core._completion.time.time', return_value=expired):
+            self.assertIsNone(self._complete('az network vnet create -g '))
+
+    def test_tree_is_discarded_when_extensions_change(self):
+        self.assertEqual(self._complete('az net'), ['network'])
+        with mock.patch('azure.cli.core._completion._completion_tree_fingerprint', return_value='changed'):
+            self.assertIsNone(self._complete('az net'))
+
+    def test_try_fast_completion_writes_completions(self):
+        output = io.BytesIO()
+        exit_method = mock.MagicMock()
+        line = 'az network vnet create --sku B'
+        env = {'_ARGCOMPLETE': '1', 'COMP_LINE': line, 'COMP_POINT': str(len(line))}
+        with mock.patch.dict('os.environ', env):
+            try_fast_completion(self.cli, output_stream=output, exit_method=exit_method)
+        exit_method.assert_called_once_with(0)
+        self.assertEqual(output.getvalue(), b'Basic ')
+
+        line = 'az vm create --'
+        env.update(COMP_LINE=line, COMP_POINT=str(len(line)))
+        exit_method.reset_mock()
+        with mock.patch.dict('os.environ', env):
+            try_fast_completion(self.cli, output_stream=output, exit_method=exit_method)
+        exit_method.assert_not_called()
+
+
+class TestCompleterCache(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir, ignore_errors=True)
+        for target, kwargs in [('azure.cli.core._environment.get_config_dir', {'return_value': self.config_dir}),
+                               ('azure.cli.core._completion._default_subscription_id', {'return_value': 'sub1'}),
+                               ('azure.cli.core._completion._spawn_prefetch', {})]:
+            patcher = mock.patch(target, **kwargs)
+            self.addCleanup(patcher.stop)
+            if target.endswith('_spawn_prefetch'):
+                self.spawn_prefetch = patcher.start()
+            else:
+                patcher.start()
+
+        self.calls = []
+        self.cli = DummyCli()
+
+        def _list_accounts(resource_type):
+            @Completer
+            def completer(cmd, prefix, namespace):  # pylint: disable=unused-argument
+                self.calls.append((resource_type, namespace.resource_group_name))
+                return [n for n in ['{}-{}'.format(resource_type, namespace.resource_group_name)]
+                        if n.startswith(prefix)]
+            return completer
+
+        self.storage_completer = _list_accounts('storage')
+        self.vault_completer = _list_accounts('vault')
+
+    def _complete(self, completer, resource_group=None, prefix=''):
+        cmd = mock.MagicMock(cli_ctx=self.cli)
+        namespace = argparse.Namespace(_cmd=cmd, resource_group_name=resource_group)
+        return completer(prefix=prefix, parsed_args=namespace)
+
+    def test_completer_results_are_cached_per_completer_and_arguments(self):
+        self.assertEqual(self._complete(self.storage_completer, 'rg1'), ['storage-rg1'])
+        self.assertEqual(self._complete(self.storage_completer, 'rg1'), ['storage-rg1'])
+        self.assertEqual(self._complete(self.vault_completer, 'rg1'), ['vault-rg1'])
+        self.assertEqual(self._complete(self.storage_completer, 'rg2'), ['storage-rg2'])
+        self.assertEqual(self.calls, [('storage', 'rg1'), ('vault', 'rg1'), ('storage', 'rg2')])
+        self.spawn_prefetch.assert_not_called()
+
+        with mock.patch('azure.cli.core._completion._default_subscription_id', return_value='sub2'):
+            self._complete(self.storage_completer, 'rg1')
+        self.assertEqual(len(self.calls), 4)
+
+    def test_completer_results_are_cached_per_prefix(self):
+        self.assertEqual(self._complete(self.storage_completer, 'rg1', prefix='x'), [])
+        self.assertEqual(self._complete(self.storage_completer, 'rg1', prefix='st'), ['storage-rg1'])
+        self.assertEqual(self._complete(self.storage_completer, 'rg1', prefix='st'), ['storage-rg1'])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_aging_entries_are_prefetched_once(self):
+        self._complete(self.storage_completer, 'rg1')
+        aging = time.time() + 40
+        with mock.patch('azure.cli.core._completion.time.time', return_value=aging):
+            self.assertEqual(self._complete(self.storage_completer, 'rg1'), ['storage-rg1'])
+            self._complete(self.storage_completer, 'rg1')
+        self.assertEqual(len(self.calls), 1)
+        self.spawn_prefetch.assert_called_once_with()
+
+    def test_prefetch_process_skips_the_cache(self):
+        self._complete(self.storage_completer, 'rg1')
+        with mock.patch.dict('os.environ', {PREFETCH_ENV_NAME: '1'}):
+            self._complete(self.storage_completer, 'rg1')
+        self.assertEqual(len(self.calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
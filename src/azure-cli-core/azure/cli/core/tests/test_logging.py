@@ -0,0 +1,93 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from azure.cli.core.azlogging import CommandLog, CommandLogHandler, read_command_log_entry, _CMD_LOG_LINE_PREFIX
+
+
+def _records(p_id, *messages):
+    return ''.join('{} {} | 2020-05-01 10:00:00,000 | INFO | cli | {}\n'.format(_CMD_LOG_LINE_PREFIX, p_id, message)
+                   for message in messages)
+
+
+class TestCommandLog(unittest.TestCase):
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.log_dir, ignore_errors=True)
+
+    def test_entries_are_read_back(self):
+        command_log = CommandLog(self.log_dir)
+        command_log.append('2020-05-01.10-00-00.vm_list.1', _records(1, 'command args: vm list', 'exit code: 0'))
+        segment = command_log.append('2020-05-01.10-00-01.vm_create.2', _records(2, 'command args: vm create'))
+        # another process logs while vm create is still running
+        command_log.append('2020-05-01.10-00-02.vm_show.3', _records(3, 'command args: vm show', 'exit code: 0'))
+        command_log.append('2020-05-01.10-00-01.vm_create.2', _records(2, 'exit code: 1'), segment)
+
+        entries = command_log.entries()
+        self.assertEqual([e.name for e in entries],
+                         ['2020-05-01.10-00-00.vm_list.1', '2020-05-01.10-00-01.vm_create.2',
+                          '2020-05-01.10-00-02.vm_show.3'])
+        lines = read_command_log_entry(entries[1])
+        self.assertEqual([line.split('|')[-1].strip() for line in lines], ['command args: vm create', 'exit code: 1'])
+        self.assertEqual(len(read_command_log_entry(entries[0])), 2)
+
+    def test_segments_are_recycled(self):
+        command_log = CommandLog(self.log_dir, segment_count=3, segment_size=100)
+        for i in range(12):
+            segment = command_log.append('2020-05-01.10-00-{:02}.vm_list.{}'.format(i, i),
+                                         _records(i, 'command args: vm list', 'exit code: 0'))
+            # the active segment is the last modified one, make it independent of the file system time resolution
+            os.utime(command_log.segment_path(segment), (i + 1, i + 1))
+
+        self.assertEqual(sorted(os.listdir(self.log_dir)),
+                         ['commands.0.seg', 'commands.1.seg', 'commands.2.seg', 'commands.idx'])
+        entries = command_log.entries()
+        self.assertEqual([e.name.split('.')[-1] for e in entries], ['9', '10', '11'])
+        for entry in entries:
+            self.assertEqual(len(read_command_log_entry(entry)), 2)
+
+    def test_logs_of_earlier_versions_are_moved_into_the_ring(self):
+        for i, name in enumerate(['2020-05-01.09-00-00.vm_list.1', '2020-05-01.09-30-00.vm_show.2']):
+            with open(os.path.join(self.log_dir, name + '.log'), 'w') as f:
+                f.write(_records(i + 1, 'command args: vm', 'exit code: 0'))
+
+        command_log = CommandLog(self.log_dir)
+        command_log.append('2020-05-01.10-00-00.vm_create.3', _records(3, 'command args: vm create', 'exit code: 0'))
+        entries = command_log.entries()
+        self.assertEqual([e.name for e in entries],
+                         ['2020-05-01.09-00-00.vm_list.1', '2020-05-01.09-30-00.vm_show.2',
+                          '2020-05-01.10-00-00.vm_create.3'])
+        for entry in entries:
+            self.assertEqual(len(read_command_log_entry(entry)), 2)
+        self.assertEqual(sorted(os.listdir(self.log_dir)), ['commands.0.seg', 'commands.idx'])
+
+    def test_handler_writes_records_when_closed(self):
+        command_log = CommandLog(self.log_dir)
+        handler = CommandLogHandler(command_log, '2020-05-01.10-00-00.vm_list.{}'.format(os.getpid()))
+        handler.setFormatter(logging.Formatter(_CMD_LOG_LINE_PREFIX + ' %(process)d | %(asctime)s | %(levelname)s | '
+                                                                      '%(name)s | %(message)s'))
+        logger = logging.getLogger('test_command_log')
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            logger.warning('command args: vm list')
+            self.assertEqual(command_log.entries(), [])
+            logger.warning('exit code: 0')
+        finally:
+            handler.close()
+            logger.removeHandler(handler)
+
+        entries = command_log.entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(len(read_command_log_entry(entries[0])), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import json
+import threading
+import time
+import unittest
+
+import mock
+
+from azure.cli.core.commands import LongRunningOperation, LongRunningOperationScheduler
+from azure.cli.core.mock import DummyCli
+
+
+class _FakePoller(object):
+    """ Completes on a background timer and notifies its done callbacks, like the SDK pollers. """
+
+    def __init__(self, result, seconds, response=None):
+        self._result = result
+        self._response = response
+        self._done = threading.Event()
+        self._callbacks = []
+        self._timer = threading.Timer(seconds, self._finish)
+        self._timer.start()
+
+    def _finish(self):
+        self._done.set()
+        for callback in self._callbacks:
+            callback(self)
+
+    def done(self):
+        return self._done.is_set()
+
+    def add_done_callback(self, func):
+        if self._done.is_set():
+            raise ValueError("Process is complete.")
+        self._callbacks.append(func)
+
+    def result(self, timeout=None):
+        self._done.wait(timeout)
+        if isinstance(self._result, Exception):
+            raise self._result
+        return self._result
+
+
+class TestLongRunningOperationScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.cli_ctx = DummyCli()
+        self.cli_ctx.get_progress_controller = mock.MagicMock()
+
+    def test_scheduler_wait_is_woken_by_completed_operations(self):
+        scheduler = LongRunningOperationScheduler(self.cli_ctx, poller_done_interval_ms=30000)
+        scheduler.submit(_FakePoller('disk', 0.2), name='disk')
+        scheduler.submit(_FakePoller('nic', 0.1), name='nic')
+        scheduler.submit(_FakePoller('ip', 0), name='ip')
+
+        start = time.time()
+        self.assertEqual(scheduler.wait(), ['disk', 'nic', 'ip'])
+        self.assertLess(time.time() - start, 5)
+
+        # a single coalesced progress message covers every pending operation
+        message = self.cli_ctx.get_progress_controller.return_value.add.call_args_list[0][1]['message']
+        self.assertRegex(message, r'^Running \d of 3 operations: ')
+
+    def test_scheduler_wait_raises_failures_after_all_complete(self):
+        scheduler = LongRunningOperationScheduler(self.cli_ctx, poller_done_interval_ms=30000)
+        failing = scheduler.submit(_FakePoller(ValueError('failed'), 0))
+        slow = scheduler.submit(_FakePoller('ok', 0.2))
+
+        with self.assertRaises(ValueError):
+            scheduler.wait()
+        self.assertTrue(slow.done())
+        self.assertTrue(failing.done())
+
+    def test_scheduler_honors_retry_after(self):
+        scheduler = LongRunningOperationScheduler(self.cli_ctx, poller_done_interval_ms=1000)
+        response = mock.MagicMock(headers={'Retry-After': '15'})
+        poller = _FakePoller('ok', 30, response=response)
+        self.addCleanup(poller._timer.cancel)
+        operation = scheduler.submit(poller)
+
+        self.assertEqual(operation.retry_after, 15)
+        self.assertEqual(scheduler.next_delay(), 15)
+
+        response.headers = {}
+        self.assertIsNone(operation.retry_after)
+        self.assertEqual(scheduler.next_delay(), 1)
+
+    def test_long_running_operation_parses_correlation_id_once_per_response(self):
+        response = mock.MagicMock()
+        response.__dict__['_content'] = b'{"properties": {"correlationId": "00000000-1111"}}'
+        poller = _FakePoller('result', 0.2, response=response)
+
+        with mock.patch('azure.cli.core.commands.json.loads', wraps=json.loads) as json_loads:
+            result = LongRunningOperation(self.cli_ctx, poller_done_interval_ms=10)(poller)
+
+        self.assertEqual(result, 'result')
+        self.assertEqual(json_loads.call_count, 1)
+
+    def test_concurrent_jobs_share_a_scheduler_and_a_waiter_only_while_they_run(self):
+        from azure.cli.core.commands import AzCliCommandInvoker
+        invoker = AzCliCommandInvoker.__new__(AzCliCommandInvoker)
+        invoker.cli_ctx = self.cli_ctx
+        cmd = mock.Mock(cli_ctx=self.cli_ctx)
+        schedulers, waiters = [], []
+
+        def _run_job(_, cmd_copy):
+            schedulers.append(cmd_copy.cli_ctx.lro_scheduler)
+            waiters.append(cmd_copy.cli_ctx.resource_waiter)
+
+        with mock.patch.object(invoker, '_run_job', side_effect=_run_job):
+            invoker._run_jobs_concurrently([(None, cmd), (None, cmd)], ['id1', 'id2'])
+            invoker._run_jobs_concurrently([(None, cmd)], ['id3'])
+
+        self.assertIs(schedulers[0], schedulers[1])
+        self.assertIsNot(schedulers[0], schedulers[2])
+        self.assertIsInstance(schedulers[2], LongRunningOperationScheduler)
+        self.assertIsNone(self.cli_ctx.lro_scheduler)
+        self.assertIs(waiters[0], waiters[1])
+        self.assertIsNot(waiters[0], waiters[2])
+        self.assertIsNone(self.cli_ctx.resource_waiter)
+
+
+if __name__ == '__main__':
+    unittest.main()
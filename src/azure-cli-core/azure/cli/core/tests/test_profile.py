@@ -1598,9 +1598,8 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache.retrieve_secret_of_service_principal(test_sp['servicePrincipalId']), None)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_add_new_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._profile._write_tokens_to_file', autospec=True)
+    def test_credscache_add_new_sp_creds(self, mock_write_file, mock_read_file):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1612,7 +1611,6 @@ class TestProfile(unittest.TestCase):
             "servicePrincipalTenant": "mytenant2",
             "accessToken": "Secret2"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1, test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1623,19 +1621,18 @@ class TestProfile(unittest.TestCase):
         token_entries = [e for _, e in creds_cache.adal_token_cache.read_items()]  # noqa: F812
         self.assertEqual(token_entries, [self.token_entry1])
         self.assertEqual(creds_cache._service_principal_creds, [test_sp, test_sp2])
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
+        # the expired token without use for longer than refresh tokens are kept is dropped from the file
+        mock_write_file.assert_called_once_with(mock.ANY, [test_sp, test_sp2])
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_add_preexisting_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._profile._write_tokens_to_file', autospec=True)
+    def test_credscache_add_preexisting_sp_creds(self, mock_write_file, mock_read_file):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1644,19 +1641,17 @@ class TestProfile(unittest.TestCase):
 
         # assert
         self.assertEqual(creds_cache._service_principal_creds, [test_sp])
-        self.assertFalse(mock_open_for_write.called)
+        self.assertFalse(mock_write_file.called)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_add_preexisting_sp_new_secret(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._profile._write_tokens_to_file', autospec=True)
+    def test_credscache_add_preexisting_sp_new_secret(self, mock_write_file, mock_read_file):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1667,19 +1662,17 @@ class TestProfile(unittest.TestCase):
 
         # assert
         self.assertEqual(creds_cache._service_principal_creds, [new_creds])
-        self.assertTrue(mock_open_for_write.called)
+        mock_write_file.assert_called_once_with(mock.ANY, [new_creds])
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_match_service_principal_correctly(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._profile._write_tokens_to_file', autospec=True)
+    def test_credscache_match_service_principal_correctly(self, mock_write_file, mock_read_file):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [test_sp]
         factory = mock.MagicMock()
         factory.side_effect = ValueError('SP was found')
@@ -1697,16 +1690,14 @@ class TestProfile(unittest.TestCase):
                           'myapp', 'resource1', 'mytenant2', False)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_remove_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._profile._write_tokens_to_file', autospec=True)
+    def test_credscache_remove_creds(self, mock_write_file, mock_read_file):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1, test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1723,14 +1714,13 @@ class TestProfile(unittest.TestCase):
         # assert #2
         self.assertEqual(creds_cache._service_principal_creds, [])
 
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
-        self.assertEqual(mock_open_for_write.call_count, 2)
+        mock_write_file.assert_called_with(mock.ANY, [])
+        self.assertEqual(mock_write_file.call_count, 2)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
+    @mock.patch('azure.cli.core._profile._write_tokens_to_file', autospec=True)
     @mock.patch('adal.AuthenticationContext', autospec=True)
-    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, _, mock_open_for_write, mock_read_file):  # pylint: disable=line-too-long
+    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, mock_write_file, mock_read_file):  # pylint: disable=line-too-long
         cli = DummyCli()
         token_entry2 = {
             "accessToken": "new token",
@@ -1747,7 +1737,6 @@ class TestProfile(unittest.TestCase):
             return mock_adal_auth_context
 
         mock_adal_auth_context.acquire_token.side_effect = acquire_token_side_effect
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1]
         creds_cache = CredsCache(cli, auth_ctx_factory=get_auth_context, async_persist=False)
 
@@ -1761,7 +1750,7 @@ class TestProfile(unittest.TestCase):
             mock.ANY)
 
         # assert
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
+        self.assertTrue(mock_write_file.called)
         self.assertEqual(token, 'new token')
         self.assertEqual(token_type, token_entry2['tokenType'])
 
@@ -1941,18 +1930,6 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(access_token, 'fake_access_token')
 
 
-class FileHandleStub(object):  # pylint: disable=too-few-public-methods
-
-    def write(self, content):
-        pass
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, _2, _3, _4):
-        pass
-
-
 class SubscriptionStub(Subscription):  # pylint: disable=too-few-public-methods
 
     def __init__(self, id, display_name, state, tenant_id, managed_by_tenants=[], home_tenant_id=None):  # pylint: disable=redefined-builtin
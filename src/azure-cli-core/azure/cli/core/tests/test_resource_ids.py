@@ -0,0 +1,88 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+from azure.cli.core._session import Session
+from azure.cli.core.commands.resource_ids import (resolve_resource_id, resolve_resource_ids, invalidate_resource_id,
+                                                  resolve_resource_ids_by_type, RESOURCE_ID_CACHE_TTL)
+from azure.cli.core.mock import DummyCli
+
+_HUB_TYPE = 'Microsoft.Devices/IotHubs'
+
+
+def _hub(name, resource_group):
+    hub = mock.Mock(id='/subscriptions/sub1/resourceGroups/{}/providers/{}/{}'.format(resource_group, _HUB_TYPE, name))
+    hub.name = name
+    return hub
+
+
+class TestResourceIds(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.filename = os.path.join(self.temp_dir, 'resourceIds.json')
+        self.session = Session()
+        self.session.load(self.filename)
+        self.addCleanup(self.session.flush)
+        patcher = mock.patch('azure.cli.core._session.RESOURCE_IDS', self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.list_hubs = mock.Mock(return_value=[_hub('hub1', 'rg1'), _hub('Hub2', 'rg2')])
+
+    def test_resources_are_listed_once(self):
+        hub_id = resolve_resource_id('sub1', _HUB_TYPE, 'HUB1', self.list_hubs)
+        self.assertEqual(hub_id, '/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Devices/IotHubs/hub1')
+        self.assertEqual(resolve_resource_ids('sub1', _HUB_TYPE, ['hub1', 'hub2'], self.list_hubs),
+                         {'hub1': self.list_hubs.return_value[0].id, 'hub2': self.list_hubs.return_value[1].id})
+        self.assertEqual(self.list_hubs.call_count, 1)
+
+        # the cache is shared with the next commands through the session file
+        self.session.flush()
+        self.session.load(self.filename)
+        resolve_resource_id('sub1', _HUB_TYPE, 'hub2', self.list_hubs)
+        self.assertEqual(self.list_hubs.call_count, 1)
+        resolve_resource_id('sub2', _HUB_TYPE, 'hub2', self.list_hubs)
+        self.assertEqual(self.list_hubs.call_count, 2)
+
+    def test_unknown_and_invalidated_names_are_listed_again(self):
+        resolve_resource_id('sub1', _HUB_TYPE, 'hub1', self.list_hubs)
+        self.assertIsNone(resolve_resource_id('sub1', _HUB_TYPE, 'hub3', self.list_hubs))
+        self.assertEqual(self.list_hubs.call_count, 2)
+
+        invalidate_resource_id('sub1', _HUB_TYPE, 'hub1')
+        resolve_resource_id('sub1', _HUB_TYPE, 'hub2', self.list_hubs)
+        self.assertEqual(self.list_hubs.call_count, 2)
+        resolve_resource_id('sub1', _HUB_TYPE, 'hub1', self.list_hubs)
+        self.assertEqual(self.list_hubs.call_count, 3)
+
+    def test_expired_ids_are_listed_again(self):
+        resolve_resource_id('sub1', _HUB_TYPE, 'hub1', self.list_hubs)
+        with mock.patch('time.time', return_value=time.time() + RESOURCE_ID_CACHE_TTL + 1):
+            resolve_resource_id('sub1', _HUB_TYPE, 'hub1', self.list_hubs)
+        self.assertEqual(self.list_hubs.call_count, 2)
+
+    @mock.patch('azure.cli.core.commands.client_factory.get_mgmt_service_client', autospec=True)
+    def test_resources_are_listed_by_type(self, get_client):
+        get_client.return_value.resources.list.return_value = self.list_hubs.return_value
+        cli_ctx = DummyCli()
+        self.assertEqual(resolve_resource_ids_by_type(cli_ctx, _HUB_TYPE, ['hub1', 'hub3'], subscription_id='sub1'),
+                         {'hub1': self.list_hubs.return_value[0].id, 'hub3': None})
+        get_client.return_value.resources.list.assert_called_once_with(
+            filter="resourceType eq 'Microsoft.Devices/IotHubs'")
+        self.assertEqual(get_client.call_args[1]['subscription_id'], 'sub1')
+        self.assertEqual(resolve_resource_id('sub1', _HUB_TYPE, 'hub2', self.list_hubs),
+                         self.list_hubs.return_value[1].id)
+        self.list_hubs.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+from azure.cli.core._session import Session
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.filename = os.path.join(self.temp_dir, 'azureProfile.json')
+
+    def _read_file(self):
+        with open(self.filename, 'r', encoding='utf-8-sig') as f:
+            return json.load(f)
+
+    def test_session_is_loaded_on_first_access(self):
+        with open(self.filename, 'w') as f:
+            json.dump({'installationId': '1'}, f)
+        session = Session()
+        with mock.patch('azure.cli.core._session.codecs_open', wraps=open) as open_file:
+            session.load(self.filename)
+            open_file.assert_not_called()
+            self.assertEqual(session.get('installationId'), '1')
+            self.assertEqual(open_file.call_count, 1)
+
+    def test_modifications_are_written_when_flushed(self):
+        session = Session()
+        session.load(self.filename)
+        session['subscriptions'] = [{'id': 'sub1'}]
+        session['installationId'] = '1'
+        self.assertFalse(os.path.exists(self.filename))
+
+        session.flush()
+        self.assertEqual(self._read_file(), {'subscriptions': [{'id': 'sub1'}], 'installationId': '1'})
+        del session['installationId']
+        session.flush()
+        self.assertEqual(self._read_file(), {'subscriptions': [{'id': 'sub1'}]})
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['azureProfile.json', 'azureProfile.json.lock'])
+
+    def test_concurrent_sessions_keep_each_others_modifications(self):
+        first, second = Session(), Session()
+        first.load(self.filename)
+        second.load(self.filename)
+        first.get('subscriptions')
+        second.get('subscriptions')
+
+        first['subscriptions'] = [{'id': 'sub1'}]
+        second['installationId'] = '1'
+        first.flush()
+        second.flush()
+        self.assertEqual(self._read_file(), {'subscriptions': [{'id': 'sub1'}], 'installationId': '1'})
+        self.assertEqual(second.get('subscriptions'), [{'id': 'sub1'}])
+
+    def test_save_replaces_the_file(self):
+        session = Session()
+        session.load(self.filename)
+        session['subscriptions'] = [{'id': 'sub1'}]
+        session['installationId'] = '1'
+        session.save()
+        del session.data['installationId']
+        session.save()
+        self.assertEqual(self._read_file(), {'subscriptions': [{'id': 'sub1'}]})
+
+    def test_loading_flushes_pending_modifications(self):
+        session = Session()
+        session.load(self.filename)
+        session['installationId'] = '1'
+        session.load(self.filename)
+        self.assertEqual(session.get('installationId'), '1')
+
+    def test_expired_session_is_cleared(self):
+        with open(self.filename, 'w') as f:
+            json.dump({'key': 'value'}, f)
+        expired = time.time() - 7200
+        os.utime(self.filename, (expired, expired))
+        session = Session()
+        session.load(self.filename, max_age=3600)
+        self.assertIsNone(session.get('key'))
+
+    def test_sessions_are_not_registered_for_exit(self):
+        # only the CLI sessions are flushed at exit, so short-lived sessions can be garbage collected
+        with mock.patch('atexit.register') as register:
+            Session()
+        register.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
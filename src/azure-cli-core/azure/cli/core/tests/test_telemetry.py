@@ -28,6 +28,19 @@ class TestCoreTelemetry(unittest.TestCase):
         else:
             self.assertEqual(_error_fn(), fallback_return)
 
+    def test_call_once(self):
+        from azure.cli.core.decorators import call_once
+        calls = []
+
+        @call_once
+        def _factory():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(_factory(), 1)
+        self.assertEqual(_factory(), 1)
+        self.assertEqual(len(calls), 1)
+
     def test_extract_parameters_correctly(self):
         from azure.cli.core.commands import AzCliCommandInvoker
         args = ['vm', 'user', 'update', '-g', 'rg', '-n', 'vm1', '-u', 'user',
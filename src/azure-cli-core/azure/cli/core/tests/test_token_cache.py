@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from azure.cli.core._profile import CredsCache
+from azure.cli.core._token_cache import IndexedTokenCache, merge_token_entries
+from azure.cli.core.mock import DummyCli
+
+_CLIENT_ID = '04b07795-8ddb-461a-bbee-02f9e1bf7b46'
+_MANAGEMENT = 'https://management.core.windows.net/'
+
+
+def _token(user, tenant, resource=_MANAGEMENT, expires_in=datetime.timedelta(hours=1), refresh_token='refresh'):
+    entry = {
+        '_clientId': _CLIENT_ID,
+        '_authority': 'https://login.microsoftonline.com/' + tenant,
+        'resource': resource,
+        'userId': user,
+        'tokenType': 'Bearer',
+        'accessToken': 'token-{}-{}'.format(user, tenant),
+        'expiresOn': str(datetime.datetime.now() + expires_in),
+        'isMRRT': True
+    }
+    if refresh_token:
+        entry['refreshToken'] = refresh_token
+    return entry
+
+
+class TestIndexedTokenCache(unittest.TestCase):
+
+    def test_find_returns_the_tokens_of_the_user(self):
+        tokens = [_token(user, tenant) for user in ['user1', 'user2'] for tenant in ['t1', 't2', 't3']]
+        cache = IndexedTokenCache(json.dumps(tokens))
+
+        found = cache.find({'_clientId': _CLIENT_ID, 'userId': 'USER1'})
+        self.assertEqual(sorted(e['accessToken'] for e in found), ['token-user1-t1', 'token-user1-t2', 'token-user1-t3'])
+        self.assertEqual(cache.find({'_clientId': _CLIENT_ID, 'userId': 'user1', 'isMRRT': False}), [])
+        self.assertEqual(len(cache.find({'_clientId': _CLIENT_ID})), 6)
+
+        cache.remove(found[:1])
+        cache.add([_token('user1', 't4')])
+        self.assertEqual(len(cache.find({'_clientId': _CLIENT_ID, 'userId': 'user1'})), 3)
+        self.assertEqual(len(cache.changes), 2)
+
+    def test_lookup_skips_expiring_tokens(self):
+        cache = IndexedTokenCache(json.dumps([_token('user1', 't1'),
+                                              _token('user1', 't2', expires_in=datetime.timedelta(minutes=1))]))
+        authority = 'https://login.microsoftonline.com/'
+        self.assertEqual(cache.lookup(authority + 't1', _MANAGEMENT, _CLIENT_ID, 'user1')['accessToken'],
+                         'token-user1-t1')
+        self.assertIsNone(cache.lookup(authority + 't2', _MANAGEMENT, _CLIENT_ID, 'user1'))
+        self.assertIsNone(cache.lookup(authority + 't1', 'https://vault.azure.net', _CLIENT_ID, 'user1'))
+
+    def test_merge_applies_changes_and_prunes_unusable_tokens(self):
+        on_disk = [_token('user1', 't1'), _token('user2', 't1'),
+                   _token('user1', 't2', expires_in=-datetime.timedelta(days=100)),
+                   _token('user1', 't3', expires_in=-datetime.timedelta(hours=1), refresh_token=None),
+                   _token('user1', 't4', expires_in=-datetime.timedelta(hours=1))]
+        cache = IndexedTokenCache(json.dumps(on_disk[:1]))
+        cache.remove(cache.find({'_clientId': _CLIENT_ID, 'userId': 'user1'}))
+        cache.add([_token('user3', 't1')])
+
+        merged = merge_token_entries(on_disk, cache.changes)
+        self.assertEqual([e['accessToken'] for e in merged], ['token-user2-t1', 'token-user1-t4', 'token-user3-t1'])
+
+
+class TestCredsCacheMerge(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.token_file = os.path.join(self.temp_dir, 'accessTokens.json')
+        patcher = mock.patch.dict('os.environ', {'AZURE_ACCESS_TOKEN_FILE': self.token_file})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_flush_keeps_tokens_written_by_other_processes(self):
+        test_sp = {'servicePrincipalId': 'myapp', 'servicePrincipalTenant': 'mytenant', 'accessToken': 'Secret'}
+        with open(self.token_file, 'w') as f:
+            json.dump([_token('user1', 't1'), test_sp], f)
+
+        first = CredsCache(DummyCli(), async_persist=False)
+        second = CredsCache(DummyCli(), async_persist=False)
+        first.load_adal_token_cache()
+        second.load_adal_token_cache()
+        first.remove_cached_creds('myapp')
+        second.adal_token_cache.add([_token('user2', 't1')])
+        second.persist_cached_creds()
+
+        with open(self.token_file, 'r') as f:
+            entries = json.load(f)
+        self.assertEqual([e.get('userId') or e.get('servicePrincipalId') for e in entries], ['user1', 'user2'])
+        self.assertEqual(os.stat(self.token_file).st_mode & 0o777, 0o600)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['accessTokens.json', 'accessTokens.json.lock'])
+
+
+if __name__ == '__main__':
+    unittest.main()
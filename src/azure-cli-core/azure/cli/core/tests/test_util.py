@@ -15,7 +15,7 @@ import json
 from azure.cli.core.util import \
     (get_file_json, truncate_text, shell_safe_json_parse, b64_to_hex, hash_string, random_string,
      open_page_in_browser, can_launch_browser, handle_exception, ConfiguredDefaultSetter, send_raw_request,
-     should_disable_connection_verify, parse_proxy_resource_id, get_az_user_agent)
+     should_disable_connection_verify, parse_proxy_resource_id, get_az_user_agent, atomic_write)
 from azure.cli.core.mock import DummyCli
 
 
@@ -40,6 +40,25 @@ class TestUtils(unittest.TestCase):
                 self.assertTrue(str(ex).find(
                     'contains error: Expecting value: line 1 column 1 (char 0)'))
 
+    def test_atomic_write(self):
+        import shutil
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        pathname = os.path.join(temp_dir, 'data.json')
+        with open(pathname, 'w') as f:
+            f.write('{"key": "old"}')
+
+        with self.assertRaises(ValueError):
+            with atomic_write(pathname) as f:
+                f.write('{"key": ')
+                raise ValueError('not serializable')
+        self.assertEqual(get_file_json(pathname), {'key': 'old'})
+
+        with atomic_write(pathname) as f:
+            json.dump({'key': 'new'}, f)
+        self.assertEqual(get_file_json(pathname), {'key': 'new'})
+        self.assertEqual(os.listdir(temp_dir), ['data.json'])
+
     def test_truncate_text(self):
         expected = 'stri [...]'
         actual = truncate_text('string to shorten', width=10)
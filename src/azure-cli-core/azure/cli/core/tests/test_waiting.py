@@ -0,0 +1,113 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import threading
+import unittest
+
+import mock
+from msrest.exceptions import ClientException
+
+from azure.cli.core.commands.waiting import ResourceWaiter, WaitTarget
+
+
+def _error(status_code, headers=None):
+    ex = ClientException('error')
+    ex.status_code = status_code
+    ex.response = mock.MagicMock(headers=headers or {})
+    return ex
+
+
+class _Resource(object):
+    """ Returns the given states one poll at a time, raising the ones that are exceptions. """
+
+    def __init__(self, *states):
+        self.states = list(states)
+        self.polls = 0
+
+    def get(self):
+        state = self.states[min(self.polls, len(self.states) - 1)]
+        self.polls += 1
+        if isinstance(state, Exception):
+            raise state
+        return state
+
+
+def _succeeded(instance, error):
+    if error is not None:
+        raise error
+    return instance == 'Succeeded'
+
+
+class TestResourceWaiter(unittest.TestCase):
+
+    def setUp(self):
+        # a fake clock that only moves when the waiter sleeps
+        self.now = 1000.0
+        self.sleeps = []
+
+        def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+        for name, func in [('sleep', sleep), ('monotonic', lambda: self.now)]:
+            patcher = mock.patch('azure.cli.core.commands.waiting.time.' + name, side_effect=func)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_waiter_backs_off_exponentially_up_to_max_interval(self):
+        resource = _Resource('Creating', 'Creating', 'Creating', 'Creating', 'Creating', 'Succeeded')
+        target = WaitTarget(resource.get, _succeeded, max_interval=10)
+
+        with mock.patch('azure.cli.core.commands.waiting.random.uniform', return_value=1):
+            ResourceWaiter().wait([target])
+
+        self.assertTrue(target.done())
+        self.assertIsNone(target.error)
+        self.assertFalse(target.timed_out)
+        self.assertEqual(resource.polls, 6)
+        self.assertEqual(self.sleeps, [2, 4, 8, 10, 10])
+
+    def test_waiter_honors_retry_after_when_throttled(self):
+        resource = _Resource(_error(429, {'Retry-After': '7'}), 'Succeeded')
+        target = WaitTarget(resource.get, _succeeded)
+
+        ResourceWaiter().wait([target])
+
+        self.assertIsNone(target.error)
+        self.assertEqual(resource.polls, 2)
+        self.assertEqual(self.sleeps, [7])
+
+    def test_waiter_surfaces_check_errors(self):
+        resource = _Resource(_error(404))
+        target = WaitTarget(resource.get, _succeeded)
+
+        ResourceWaiter().wait([target])
+
+        self.assertEqual(target.error.status_code, 404)
+
+    def test_waiter_times_out(self):
+        target = WaitTarget(_Resource('Creating').get, _succeeded, max_interval=60)
+
+        ResourceWaiter(timeout=100).wait([target])
+
+        self.assertTrue(target.timed_out)
+        self.assertIsNone(target.error)
+        self.assertAlmostEqual(sum(self.sleeps), 100)
+
+    def test_waiter_polls_targets_of_several_threads_from_one_loop(self):
+        waiter = ResourceWaiter()
+        resources = [_Resource('Creating', 'Creating', 'Succeeded') for _ in range(5)]
+        targets = [WaitTarget(r.get, _succeeded) for r in resources]
+        threads = [threading.Thread(target=waiter.wait, args=([t],)) for t in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertTrue(all(t.done() and t.error is None for t in targets))
+        self.assertEqual([r.polls for r in resources], [3] * 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
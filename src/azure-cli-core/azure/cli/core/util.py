@@ -14,6 +14,7 @@ import ssl
 import six
 import re
 import logging
+from contextlib import contextmanager
 
 from six.moves.urllib.request import urlopen  # pylint: disable=import-error
 
@@ -279,6 +280,26 @@ def read_file_content(file_path, allow_binary=False):
     raise CLIError('Failed to decode file {} - unknown decoding'.format(file_path))
 
 
+@contextmanager
+def atomic_write(file_path, mode='w', encoding=None):
+    """
+    Open a temporary file next to `file_path` for writing, and replace `file_path` with it when the block exits
+    without an error, so that readers never see a partially written file. The temporary file is removed otherwise.
+    Like the files of tempfile.mkstemp, the new file is only readable and writable by the current user.
+    """
+    import os
+    import tempfile
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or None, prefix='.' + os.path.basename(file_path))
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 def shell_safe_json_parse(json_or_dict_string, preserve_order=False):
     """ Allows the passing of JSON or Python dictionary strings. This is needed because certain
     JSON strings in CMD shell are not received in main's argv. This allows the user to specify
@@ -58,10 +58,10 @@ def _start(config_dir):
 
 
 def save(config_dir, payload):
-    from azure.cli.telemetry.util import should_upload
+    from azure.cli.telemetry.util import should_upload, is_batch_ready
     from azure.cli.telemetry.components.telemetry_logging import get_logger
 
-    if save_payload(config_dir, payload) and should_upload(config_dir):
+    if save_payload(config_dir, payload) and should_upload(config_dir) and is_batch_ready(config_dir):
         logger = get_logger('main')
         logger.info('Begin creating telemetry upload process.')
         _start(config_dir)
@@ -3,7 +3,6 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-import datetime
 import os
 import shutil
 import stat
@@ -29,14 +28,21 @@ class RecordsCollection(object):
 
     def snapshot_and_read(self):
         """ Scan the telemetry cache files and move all the rotated files to a temp directory. """
-        from azure.cli.telemetry.const import TELEMETRY_CACHE_DIR
+        from azure.cli.telemetry.const import TELEMETRY_CACHE_DIR, TELEMETRY_SPOOL_NAME
+        from azure.cli.telemetry.components.telemetry_spool import TelemetrySpool
 
         folder = os.path.join(self._config_dir, TELEMETRY_CACHE_DIR)
         if not os.path.isdir(folder):
             return
 
-        # sort the cache files base on their last modification time.
-        candidates = [(fn, os.stat(os.path.join(folder, fn))) for fn in os.listdir(folder) if fn != 'cache']
+        # records saved from now on go to a new spool file
+        TelemetrySpool(self._config_dir).snapshot()
+
+        # sort the cache files base on their last modification time. The spool and the 'cache' file of earlier
+        # versions may still be written to, other files are snapshots of the spool or rotated cache files.
+        candidates = [(fn, os.stat(os.path.join(folder, fn))) for fn in os.listdir(folder)
+                      if fn not in ('cache', TELEMETRY_SPOOL_NAME) and not fn.startswith('.')
+                      and not fn.endswith('.lock')]
         candidates = [(fn, file_stat) for fn, file_stat in candidates if stat.S_ISREG(file_stat.st_mode)]
         candidates.sort(key=lambda pair: pair[1].st_mtime, reverse=True)  # move the newer cache file first
 
@@ -67,21 +73,23 @@ class RecordsCollection(object):
         self._logger.info('Remove directory %s', tmp)
 
     def _read_file(self, path):
-        """ Read content of a telemetry cache file and parse them into records. """
+        """ Read content of a telemetry spool snapshot or cache file and parse them into records. """
         try:
             with open(path, mode='r') as fh:
-                for line in fh.readlines():
-                    self._add_record(line)
+                lines = fh.read().splitlines()
+            for line in lines:
+                self._add_record(line)
 
-                self._logger.info("Processed file %s into %d records.", path, len(self._records))
+            self._logger.info("Processed file %s into %d records.", path, len(self._records))
         except IOError as err:
             self._logger.warning("Fail to open file %s. Reason: %s.", path, err)
 
     def _add_record(self, content_line):
         """ Parse a line in the recording file. """
+        from azure.cli.telemetry.components.telemetry_spool import parse_record
+
         try:
-            time, content = content_line.split(',', 1)
-            time = datetime.datetime.strptime(time, '%Y-%m-%dT%H:%M:%S')
+            time, content = parse_record(content_line)
             if time > self._last_sent:
                 self._next_send = max(self._next_send, time)
                 self._records.append(content)
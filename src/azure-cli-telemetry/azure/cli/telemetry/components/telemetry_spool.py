@@ -0,0 +1,127 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import json
+import os
+import uuid
+
+RECORD_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+_LOCK_TIMEOUT = 5
+
+
+class TelemetrySpool(object):
+    """ Append-only file of telemetry records, one JSON array [time, payload] per line.
+
+    Each CLI invocation appends its payload with a single write. When the spool grows over `max_size` the oldest
+    records are dropped. The upload process takes the spool with `snapshot`, so records saved meanwhile go to a new
+    spool file. Appending, compacting and taking a snapshot hold the lock file of the spool, so a compaction cannot
+    drop the records appended while it rewrites the spool.
+    """
+
+    def __init__(self, config_dir, max_size=None):
+        from azure.cli.telemetry.const import TELEMETRY_CACHE_DIR, TELEMETRY_SPOOL_NAME, MAX_SPOOL_SIZE
+        from azure.cli.telemetry.components.telemetry_logging import get_logger
+
+        self.folder = os.path.join(config_dir, TELEMETRY_CACHE_DIR)
+        self.path = os.path.join(self.folder, TELEMETRY_SPOOL_NAME)
+        self.max_size = max_size or MAX_SPOOL_SIZE
+        self._logger = get_logger('spool')
+
+    def _lock(self, timeout=_LOCK_TIMEOUT, fail_when_locked=False):
+        import portalocker
+        return portalocker.Lock(self.path + '.lock', mode='a', timeout=timeout, fail_when_locked=fail_when_locked)
+
+    def append(self, payload, time=None):
+        """ Append a record. Returns True if it was saved. """
+        import portalocker
+
+        time = time or datetime.datetime.now()
+        line = json.dumps([time.strftime(RECORD_TIME_FORMAT), payload], separators=(',', ':')) + '\n'
+        try:
+            if not os.path.isdir(self.folder):
+                os.makedirs(self.folder)
+            with self._lock():
+                with open(self.path, mode='a') as fh:
+                    fh.write(line)
+                    size = fh.tell()
+        except portalocker.LockException as err:
+            self._logger.warning('Fail to lock telemetry spool %s. Reason %s.', self.path, err)
+            return False
+        except (OSError, IOError) as err:
+            self._logger.warning('Fail to append to telemetry spool %s. Reason %s.', self.path, err)
+            return False
+
+        if size > self.max_size:
+            self.compact()
+        return True
+
+    def compact(self):
+        """ Drop the oldest records so that the spool is at most half of its maximum size. """
+        import portalocker
+        import tempfile
+
+        try:
+            with self._lock(timeout=0, fail_when_locked=True):
+                with open(self.path, mode='r') as fh:
+                    lines = fh.readlines()
+                kept, size = [], 0
+                for line in reversed(lines):
+                    size += len(line)
+                    if size > self.max_size // 2:
+                        break
+                    kept.append(line)
+                fd, temp_path = tempfile.mkstemp(dir=self.folder, prefix='.spool')
+                with os.fdopen(fd, 'w') as fh:
+                    fh.writelines(reversed(kept))
+                os.replace(temp_path, self.path)
+                self._logger.info('Compact telemetry spool from %d to %d records.', len(lines), len(kept))
+        except (portalocker.AlreadyLocked, portalocker.LockException):
+            self._logger.info('Skip compacting the telemetry spool locked by another process.')
+        except (OSError, IOError) as err:
+            self._logger.warning('Fail to compact telemetry spool %s. Reason %s.', self.path, err)
+
+    def size(self):
+        try:
+            return os.stat(self.path).st_size
+        except (OSError, IOError):
+            return 0
+
+    def oldest_record_time(self):
+        """ Time of the first record in the spool, None if it is empty. """
+        try:
+            with open(self.path, mode='r') as fh:
+                return parse_record(fh.readline())[0]
+        except (OSError, IOError, ValueError):
+            return None
+
+    def snapshot(self):
+        """ Move the spool aside for upload and return the path of the snapshot, None if there is nothing to send. """
+        if not self.size():
+            return None
+        import portalocker
+
+        snapshot_path = '{}.{}'.format(self.path, uuid.uuid4().hex)
+        try:
+            with self._lock():
+                os.rename(self.path, snapshot_path)
+            self._logger.info('Move telemetry spool to %s', snapshot_path)
+            return snapshot_path
+        except portalocker.LockException as err:
+            self._logger.warning('Fail to lock telemetry spool %s. Reason %s.', self.path, err)
+            return None
+        except (OSError, IOError) as err:
+            self._logger.warning('Fail to take snapshot of telemetry spool %s. Reason %s.', self.path, err)
+            return None
+
+
+def parse_record(line):
+    """ Parse a spool line, or a line of the `time,payload` cache files written by earlier versions, into the
+    record time and payload. Raises ValueError when the line is not a record. """
+    if line.startswith('['):
+        time, payload = json.loads(line)
+    else:
+        time, payload = line.split(',', 1)
+    return datetime.datetime.strptime(time, RECORD_TIME_FORMAT), payload
@@ -6,8 +6,13 @@
 from datetime import timedelta
 
 MANDATORY_WAIT_PERIOD = timedelta(minutes=10)
+# an upload process is only started once this much telemetry accumulated, or the oldest record is this old
+UPLOAD_BATCH_SIZE = 64 * 1024
+MAX_BATCH_DELAY = timedelta(hours=1)
+MAX_SPOOL_SIZE = 4 * 1024 * 1024
 
 TELEMETRY_CACHE_DIR = 'telemetry'
+TELEMETRY_SPOOL_NAME = 'spool'
 TELEMETRY_NOTE_NAME = 'telemetry.txt'
 TELEMETRY_LOG_NAME = 'telemetry.log'
 TELEMETRY_LOG_DIR = 'logs'
@@ -0,0 +1,92 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+from azure.cli.telemetry.const import TELEMETRY_CACHE_DIR
+from azure.cli.telemetry.components.records_collection import RecordsCollection
+from azure.cli.telemetry.components.telemetry_spool import TelemetrySpool
+from azure.cli.telemetry.util import is_batch_ready, save_payload
+
+SAMPLE_PAYLOAD = '{"c4395b75-49cc-422c-bc95-c7d51aef5d46":[{"name":"azurecli/command","properties":{}}]}'
+
+
+class TestTelemetrySpool(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_save_payload_appends_to_spool(self):
+        self.assertTrue(save_payload(self.work_dir, SAMPLE_PAYLOAD))
+        self.assertTrue(save_payload(self.work_dir, SAMPLE_PAYLOAD))
+        self.assertFalse(save_payload(self.work_dir, None))
+
+        self.assertEqual(['spool', 'spool.lock'], sorted(os.listdir(os.path.join(self.work_dir, TELEMETRY_CACHE_DIR))))
+        collection = RecordsCollection(datetime.datetime.min, self.work_dir)
+        collection.snapshot_and_read()
+        self.assertEqual([SAMPLE_PAYLOAD] * 2, list(collection))
+        self.assertEqual(['spool.lock'], os.listdir(os.path.join(self.work_dir, TELEMETRY_CACHE_DIR)))
+
+    def test_spool_is_compacted_to_newest_records(self):
+        spool = TelemetrySpool(self.work_dir, max_size=10 * 1024)
+        start = datetime.datetime(year=2020, month=1, day=1)
+        for i in range(100):
+            spool.append(SAMPLE_PAYLOAD, start + datetime.timedelta(minutes=i))
+            self.assertLessEqual(spool.size(), 10 * 1024)
+
+        oldest = spool.oldest_record_time()
+        self.assertGreater(oldest, start)
+        collection = RecordsCollection(datetime.datetime.min, self.work_dir)
+        collection.snapshot_and_read()
+        self.assertEqual(start + datetime.timedelta(minutes=99), collection.next_send)
+        self.assertEqual(100 - (oldest - start).seconds // 60, len(list(collection)))
+
+    def test_append_waits_for_the_spool_lock(self):
+        import threading
+        import portalocker
+
+        spool = TelemetrySpool(self.work_dir, max_size=1024)
+        spool.append(SAMPLE_PAYLOAD)
+        lock = portalocker.Lock(spool.path + '.lock', mode='a')
+        lock.acquire()
+        try:
+            # a compaction started while the spool is locked is skipped
+            spool.compact()
+            threading.Timer(0.5, lock.release).start()
+            self.assertTrue(spool.append(SAMPLE_PAYLOAD))
+        finally:
+            lock.release()
+
+        collection = RecordsCollection(datetime.datetime.min, self.work_dir)
+        collection.snapshot_and_read()
+        self.assertEqual([SAMPLE_PAYLOAD] * 2, list(collection))
+
+    def test_batch_is_ready_by_size_or_age(self):
+        self.assertFalse(is_batch_ready(self.work_dir))
+
+        spool = TelemetrySpool(self.work_dir)
+        spool.append(SAMPLE_PAYLOAD)
+        self.assertFalse(is_batch_ready(self.work_dir))
+
+        spool.append(SAMPLE_PAYLOAD, datetime.datetime.now() - datetime.timedelta(hours=2))
+        self.assertFalse(is_batch_ready(self.work_dir))
+        shutil.rmtree(os.path.join(self.work_dir, TELEMETRY_CACHE_DIR))
+        spool.append(SAMPLE_PAYLOAD, datetime.datetime.now() - datetime.timedelta(hours=2))
+        self.assertTrue(is_batch_ready(self.work_dir))
+
+        shutil.rmtree(os.path.join(self.work_dir, TELEMETRY_CACHE_DIR))
+        for _ in range(1000):
+            spool.append(SAMPLE_PAYLOAD)
+        self.assertTrue(is_batch_ready(self.work_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,10 +6,9 @@
 import os
 import stat
 import logging
-import logging.handlers
 from datetime import datetime
 
-from azure.cli.telemetry.const import TELEMETRY_NOTE_NAME, MANDATORY_WAIT_PERIOD
+from azure.cli.telemetry.const import TELEMETRY_NOTE_NAME, MANDATORY_WAIT_PERIOD, UPLOAD_BATCH_SIZE, MAX_BATCH_DELAY
 
 
 def should_upload(config_dir):
@@ -41,38 +40,36 @@ def should_upload(config_dir):
     return True
 
 
+def is_batch_ready(config_dir):
+    """Returns True if enough telemetry accumulated in the spool to be worth starting an upload process, either in size
+    or in how long the oldest record has been waiting."""
+    from azure.cli.telemetry.components.telemetry_spool import TelemetrySpool
+
+    logger = logging.getLogger('telemetry.check')
+
+    spool = TelemetrySpool(config_dir)
+    if spool.size() >= UPLOAD_BATCH_SIZE:
+        logger.info('Positive: The spool reached the batch size.')
+        return True
+
+    oldest = spool.oldest_record_time()
+    if oldest and datetime.now() - oldest >= MAX_BATCH_DELAY:
+        logger.info('Positive: The oldest record in the spool was saved at %s.', oldest)
+        return True
+
+    logger.info('Negative: Wait for more records to upload them in one batch.')
+    return False
+
+
 def save_payload(config_dir, payload):
     """
-    Save a telemetry payload to the telemetry cache directory under the given configuration directory
+    Save a telemetry payload to the telemetry spool under the given configuration directory
     """
-    logger = logging.getLogger('telemetry.save')
+    from azure.cli.telemetry.components.telemetry_spool import TelemetrySpool
 
-    if payload:
-        cache_saver = _create_rotate_file_logger(config_dir)
-        if cache_saver:
-            cache_saver.info(payload)
-            logger.info('Save telemetry record of length %d in cache', len(payload))
+    logger = logging.getLogger('telemetry.save')
 
-            return True
+    if payload and TelemetrySpool(config_dir).append(payload):
+        logger.info('Save telemetry record of length %d in spool', len(payload))
+        return True
     return False
-
-
-def _create_rotate_file_logger(log_dir):
-    cache_name = os.path.join(log_dir, 'telemetry', 'cache')
-    try:
-        if not os.path.exists(os.path.dirname(cache_name)):
-            os.makedirs(os.path.dirname(cache_name))
-
-        handler = logging.handlers.RotatingFileHandler(cache_name, maxBytes=128 * 1024, backupCount=100)
-        handler.setLevel(logging.INFO)
-        handler.setFormatter(logging.Formatter(fmt='%(asctime)s,%(message)s',
-                                               datefmt='%Y-%m-%dT%H:%M:%S'))
-
-        logger = logging.Logger(name='telemetry_cache', level=logging.INFO)
-        logger.addHandler(handler)
-        return logger
-    except OSError as err:
-        logging.getLogger('telemetry.save').warning('Fail to create telemetry cache directory for %s. Reason %s.',
-                                                    cache_name,
-                                                    err)
-        return None
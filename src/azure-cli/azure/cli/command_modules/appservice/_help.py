@@ -1642,11 +1642,15 @@ examples:
 helps['webapp log download'] = """
 type: command
 short-summary: Download a web app's log history as a zip file.
-long-summary: This command may not work with web apps running on Linux.
+long-summary: >
+    This command may not work with web apps running on Linux. An interrupted download is resumed when the
+    server supports it, and restarted otherwise.
 examples:
   - name: Download a web app's log history as a zip file. (autogenerated)
     text: az webapp log download --name MyWebApp --resource-group MyResourceGroup
     crafted: true
+  - name: Extract the HTTP logs of a web app while they are downloaded, without saving the zip file.
+    text: az webapp log download --name MyWebApp --resource-group MyResourceGroup --include "LogFiles/http/*" --extract-to ./logs
 """
 
 helps['webapp log show'] = """
@@ -1661,7 +1665,12 @@ examples:
 helps['webapp log tail'] = """
 type: command
 short-summary: Start live log tracing for a web app.
-long-summary: This command may not work with web apps running on Linux.
+long-summary: >
+    This command may not work with web apps running on Linux. The log streams are reconnected when the
+    connections are lost.
+examples:
+  - name: Show the errors logged by a web app and its staging slot.
+    text: az webapp log tail --name MyWebapp --resource-group MyResourceGroup --apps MyWebapp/staging --filter ERROR
 """
 
 helps['webapp restart'] = """
@@ -310,9 +310,15 @@ def load_arguments(self, _):
 
     with self.argument_context('webapp log tail') as c:
         c.argument('provider', help="By default all live traces configured by `az webapp log config` will be shown, but you can scope to certain providers/folders, e.g. 'application', 'http', etc. For details, check out https://github.com/projectkudu/kudu/wiki/Diagnostic-Log-Stream")
+        c.argument('line_filter', options_list=['--filter'], help="Regular expression which the log lines must match to be shown, e.g. 'ERROR|WARN'.")
+        c.argument('apps', nargs='+', help="Space-separated other web apps or slots whose logs are streamed along, each line prefixed with its app. Either the resource ID of an app or slot, or 'name' or 'name/slot' in the resource group.")
 
     with self.argument_context('webapp log download') as c:
         c.argument('log_file', default='webapp_logs.zip', type=file_type, completer=FilesCompleter(), help='the downloaded zipped log file path')
+        c.argument('include_patterns', options_list=['--include'], nargs='+', arg_group='Extraction',
+                   help='space-separated glob patterns of the log files to extract, e.g. "LogFiles/http/*". The logs are extracted while they are downloaded, without saving the zip file')
+        c.argument('extract_dir', options_list=['--extract-to'], arg_group='Extraction',
+                   help='the directory to extract the log files to. Defaults to the current directory when --include is specified')
 
     for scope in ['appsettings', 'connection-string']:
         with self.argument_context('webapp config ' + scope) as c:
@@ -2017,26 +2017,55 @@ def show_cors(cmd, resource_group_name, name, slot=None):
     return configs.cors
 
 
-def get_streaming_log(cmd, resource_group_name, name, provider=None, slot=None):
-    scm_url = _get_scm_url(cmd, resource_group_name, name, slot)
-    streaming_url = scm_url + '/logstream'
-    if provider:
-        streaming_url += ('/' + provider.lstrip('/'))
-
-    user, password = _get_site_credential(cmd.cli_ctx, resource_group_name, name, slot)
-    t = threading.Thread(target=_get_log, args=(streaming_url, user, password))
-    t.daemon = True
-    t.start()
-
-    while True:
-        time.sleep(100)  # so that ctrl+c can stop the command
+def get_streaming_log(cmd, resource_group_name, name, provider=None, slot=None, line_filter=None, apps=None):
+    import re
+    from .log_stream import LogStream, LogWriter, stream_logs
 
-
-def download_historical_logs(cmd, resource_group_name, name, log_file=None, slot=None):
+    if line_filter:
+        try:
+            line_filter = re.compile(line_filter.encode('utf-8'))
+        except re.error as ex:
+            raise CLIError("Invalid filter '{}': {}".format(line_filter, ex))
+
+    targets = [(resource_group_name, name, slot)] + [_parse_app_or_slot(resource_group_name, a) for a in apps or []]
+    writer = LogWriter(line_filter, split_lines=len(targets) > 1)
+    streams = []
+    for app_resource_group, app_name, app_slot in targets:
+        scm_url = _get_scm_url(cmd, app_resource_group, app_name, app_slot)
+        streaming_url = scm_url + '/logstream'
+        if provider:
+            streaming_url += ('/' + provider.lstrip('/'))
+        user, password = _get_site_credential(cmd.cli_ctx, app_resource_group, app_name, app_slot)
+        display_name = app_name + ('/' + app_slot if app_slot else '')
+        prefix = '[{}] '.format(display_name).encode('utf-8') if len(targets) > 1 else b''
+        streams.append(LogStream(display_name, streaming_url, user, password, writer, prefix))
+
+    stream_logs(streams)
+
+
+def _parse_app_or_slot(resource_group_name, app):
+    """Parse the resource ID, or the 'name' or 'name/slot' in the resource group, of an app or slot"""
+    if is_valid_resource_id(app):
+        parts = parse_resource_id(app)
+        slot = parts.get('child_name_1') if parts.get('child_type_1', '').lower() == 'slots' else None
+        return parts['resource_group'], parts['name'], slot
+    if not resource_group_name:
+        raise CLIError("Use the resource ID of app '{}' or specify --resource-group.".format(app))
+    name, _, slot = app.partition('/')
+    return resource_group_name, name, slot or None
+
+
+def download_historical_logs(cmd, resource_group_name, name, log_file=None, slot=None, include_patterns=None,
+                             extract_dir=None):
     scm_url = _get_scm_url(cmd, resource_group_name, name, slot)
     url = scm_url.rstrip('/') + '/dump'
     user_name, password = _get_site_credential(cmd.cli_ctx, resource_group_name, name, slot)
-    _get_log(url, user_name, password, log_file)
+    if include_patterns or extract_dir:
+        extracted = _extract_log(url, user_name, password, extract_dir or '.', include_patterns or ['*'],
+                                 cmd.cli_ctx)
+        logger.warning('Extracted %d log files to %s', len(extracted), extract_dir or '.')
+        return
+    _get_log(url, user_name, password, log_file, cmd.cli_ctx)
     logger.warning('Downloaded logs to %s', log_file)
 
 
@@ -2046,42 +2075,40 @@ def _get_site_credential(cli_ctx, resource_group_name, name, slot=None):
     return (creds.publishing_user_name, creds.publishing_password)
 
 
-def _get_log(url, user_name, password, log_file=None):
-    import certifi
+def _get_log(url, user_name, password, log_file, cli_ctx=None):
     import urllib3
-    try:
-        import urllib3.contrib.pyopenssl
-        urllib3.contrib.pyopenssl.inject_into_urllib3()
-    except ImportError:
-        pass
+    from .log_stream import _get_pool_manager
+    from .log_download import iter_download, DownloadProgress
 
-    http = urllib3.PoolManager(cert_reqs='CERT_REQUIRED', ca_certs=certifi.where())
     headers = urllib3.util.make_headers(basic_auth='{0}:{1}'.format(user_name, password))
-    r = http.request(
-        'GET',
-        url,
-        headers=headers,
-        preload_content=False
-    )
-    if r.status != 200:
-        raise CLIError("Failed to connect to '{}' with status code '{}' and reason '{}'".format(
-            url, r.status, r.reason))
-    if log_file:  # download logs
-        with open(log_file, 'wb') as f:
-            while True:
-                data = r.read(1024)
-                if not data:
-                    break
-                f.write(data)
-    else:  # streaming
-        std_encoding = sys.stdout.encoding
-        for chunk in r.stream():
-            if chunk:
-                # Extra encode() and decode for stdout which does not surpport 'utf-8'
-                print(chunk.decode(encoding='utf-8', errors='replace')
-                      .encode(std_encoding, errors='replace')
-                      .decode(std_encoding, errors='replace'), end='')  # each line of log has CRLF.
-    r.release_conn()
+    progress = DownloadProgress(cli_ctx) if cli_ctx else None
+    with open(log_file, 'wb') as f:
+        def _restart():
+            f.seek(0)
+            f.truncate()
+
+        try:
+            for chunk in iter_download(_get_pool_manager(), url, headers, progress=progress, restart=_restart):
+                f.write(chunk)
+        finally:
+            if progress:
+                progress.end()
+
+
+def _extract_log(url, user_name, password, extract_dir, include_patterns, cli_ctx=None):
+    import urllib3
+    from .log_stream import _get_pool_manager
+    from .log_download import iter_download, extract_zip_stream, DownloadProgress
+
+    headers = urllib3.util.make_headers(basic_auth='{0}:{1}'.format(user_name, password))
+    progress = DownloadProgress(cli_ctx) if cli_ctx else None
+    chunks = iter_download(_get_pool_manager(), url, headers, progress=progress)
+    try:
+        return extract_zip_stream(chunks, extract_dir, include_patterns)
+    finally:
+        chunks.close()
+        if progress:
+            progress.end()
 
 
 def upload_ssl_cert(cmd, resource_group_name, name, certificate_password, certificate_file, slot=None):
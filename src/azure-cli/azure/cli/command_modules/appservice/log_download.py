@@ -0,0 +1,255 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import fnmatch
+import os
+import struct
+import time
+import zlib
+
+from knack.log import get_logger
+from knack.util import CLIError
+
+logger = get_logger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_DOWNLOAD_RETRIES = 3
+READ_TIMEOUT = 300
+
+_LOCAL_FILE_HEADER = b'PK\x03\x04'
+_DATA_DESCRIPTOR = b'PK\x07\x08'
+_LOCAL_FILE_HEADER_FORMAT = struct.Struct('<HHHHHIIIHH')
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_ZIP64_EXTRA = 0x0001
+_ZIP64_LIMIT = 0xFFFFFFFF
+_STORED = 0
+_DEFLATED = 8
+
+
+def iter_download(http, url, headers, progress=None, restart=None):
+    """
+    Iterate over the content of a URL by chunks of DOWNLOAD_CHUNK_SIZE bytes.
+
+    When the connection is lost, the download is resumed with a range request if the server supports them for this
+    content, and restarted from the beginning otherwise, calling `restart` first. Without `restart`, a download
+    which cannot be resumed fails.
+    :param progress: Called with the number of bytes downloaded and the total size, None if unknown.
+    """
+    import urllib3
+    offset = 0
+    total = None
+    validator = None
+    for attempt in range(MAX_DOWNLOAD_RETRIES + 1):
+        request_headers = dict(headers)
+        if offset:
+            request_headers['Range'] = 'bytes={}-'.format(offset)
+            request_headers['If-Range'] = validator
+        r = None
+        try:
+            r = http.request('GET', url, headers=request_headers, preload_content=False, retries=False,
+                             timeout=urllib3.Timeout(connect=30, read=READ_TIMEOUT))
+            if r.status == 200:
+                if offset:
+                    raise CLIError("The content of '{}' changed while it was downloaded.".format(url))
+                length = r.headers.get('Content-Length')
+                total = int(length) if length and length.isdigit() else None
+                if r.headers.get('Accept-Ranges', '').lower() == 'bytes':
+                    validator = r.headers.get('ETag') or r.headers.get('Last-Modified')
+            elif r.status != 206 or not offset:
+                raise CLIError("Failed to connect to '{}' with status code '{}' and reason '{}'".format(
+                    url, r.status, r.reason))
+            for chunk in r.stream(DOWNLOAD_CHUNK_SIZE, decode_content=False):
+                offset += len(chunk)
+                if progress:
+                    progress(offset, total)
+                yield chunk
+            if total is None or offset >= total:
+                return
+            logger.debug("Downloaded %d of the %d bytes of '%s'", offset, total, url)
+        except (urllib3.exceptions.HTTPError, IOError, OSError) as ex:
+            logger.debug("Download of '%s' failed: %s", url, ex)
+        finally:
+            if r is not None:
+                r.release_conn()
+
+        if attempt == MAX_DOWNLOAD_RETRIES:
+            break
+        if not validator:
+            if restart is None:
+                raise CLIError("The connection to '{}' was lost and the download cannot be resumed.".format(url))
+            logger.warning('The connection was lost, restarting the download.')
+            restart()
+            offset = 0
+        else:
+            logger.warning('The connection was lost, resuming the download at byte %d.', offset)
+    raise CLIError("Failed to download '{}' after {} attempts.".format(url, MAX_DOWNLOAD_RETRIES + 1))
+
+
+class DownloadProgress(object):
+    """Progress callback of a download, which also reports the bytes downloaded per second."""
+
+    def __init__(self, cli_ctx):
+        self._cli_ctx = cli_ctx
+        self._hook = None
+        self._start_time = time.time()
+
+    def __call__(self, current, total):
+        if self._hook is None:
+            self._hook = self._cli_ctx.get_progress_controller(det=bool(total))
+        message = '{:.1f} MiB, {:.1f} MiB/s'.format(
+            current / 1024.0 / 1024, current / max(time.time() - self._start_time, 0.001) / 1024 / 1024)
+        if total:
+            self._hook.add(message=message, value=min(current, total), total_val=total)
+        else:
+            self._hook.add(message=message)
+
+    def end(self):
+        if self._hook:
+            self._hook.end()
+
+
+class _ChunkReader(object):
+    """Reads exact amounts of bytes from an iterator of chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def read_some(self, size):
+        """Read up to size bytes, at least one unless the end of the chunks was reached."""
+        if not self._buffer:
+            self._buffer = next(self._chunks, b'')
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def read(self, size):
+        parts = []
+        while size > 0:
+            data = self.read_some(size)
+            if not data:
+                raise CLIError('The zip file is truncated.')
+            parts.append(data)
+            size -= len(data)
+        return b''.join(parts)
+
+    def unread(self, data):
+        self._buffer = data + self._buffer
+
+    def at_end(self):
+        data = self.read_some(1)
+        self.unread(data)
+        return not data
+
+
+def _zip64_sizes(extra, compressed_size, size):
+    while len(extra) >= 4:
+        header_id, length = struct.unpack('<HH', extra[:4])
+        if header_id == _ZIP64_EXTRA:
+            values = list(struct.unpack('<{}Q'.format(length // 8), extra[4:4 + length // 8 * 8]))
+            if size == _ZIP64_LIMIT and values:
+                size = values.pop(0)
+            if compressed_size == _ZIP64_LIMIT and values:
+                compressed_size = values.pop(0)
+            return compressed_size, size, True
+        extra = extra[4 + length:]
+    return compressed_size, size, False
+
+
+def _safe_path(destination, name):
+    parts = [p for p in name.replace('\\', '/').split('/') if p not in ('', '.')]
+    if not parts or '..' in parts or ':' in parts[0]:
+        raise CLIError("The zip file contains the unsafe path '{}'.".format(name))
+    return os.path.join(destination, *parts)
+
+
+def extract_zip_stream(chunks, destination, patterns):
+    """
+    Extract the files of a zip archive whose names match glob patterns while it is downloaded, without storing the
+    archive. The entries are read from their local headers; the central directory at the end is ignored.
+    :param chunks: Iterator of the bytes of the archive.
+    :returns: list of the paths of the extracted files.
+    """
+    reader = _ChunkReader(chunks)
+    extracted = []
+    while not reader.at_end():
+        signature = reader.read(4)
+        if signature != _LOCAL_FILE_HEADER:
+            # the central directory follows the last entry
+            break
+        _, flags, method, _, _, crc, compressed_size, size, name_length, extra_length = \
+            _LOCAL_FILE_HEADER_FORMAT.unpack(reader.read(_LOCAL_FILE_HEADER_FORMAT.size))
+        name = reader.read(name_length).decode('utf-8' if flags & _FLAG_UTF8 else 'cp437')
+        compressed_size, _, is_zip64 = _zip64_sizes(reader.read(extra_length), compressed_size, size)
+        has_descriptor = bool(flags & _FLAG_DATA_DESCRIPTOR)
+
+        path = None
+        if not name.endswith('/') and any(fnmatch.fnmatch(name, p) for p in patterns):
+            path = _safe_path(destination, name)
+        if path is None and not has_descriptor:
+            # skip the entry without decompressing it
+            for _ in _read_stored(reader, compressed_size):
+                pass
+            continue
+
+        if method == _DEFLATED:
+            data = _inflate(reader)
+        elif method == _STORED and not has_descriptor:
+            data = _read_stored(reader, compressed_size)
+        elif method == _STORED and name.endswith('/'):
+            # the data descriptor of a directory follows its header
+            data = []
+        else:
+            raise CLIError("The zip entry '{}' cannot be extracted while downloading "
+                           "(compression method {}).".format(name, method))
+
+        output = None
+        checksum = 0
+        try:
+            if path:
+                if not os.path.isdir(os.path.dirname(path)):
+                    os.makedirs(os.path.dirname(path))
+                output = open(path, 'wb')
+            for block in data:
+                if output:
+                    checksum = zlib.crc32(block, checksum)
+                    output.write(block)
+        finally:
+            if output:
+                output.close()
+
+        if has_descriptor:
+            descriptor = reader.read(4)
+            if descriptor == _DATA_DESCRIPTOR:
+                descriptor = reader.read(4)
+            crc = struct.unpack('<I', descriptor)[0]
+            reader.read(16 if is_zip64 else 8)
+        if path:
+            if checksum & 0xFFFFFFFF != crc:
+                raise CLIError("The zip entry '{}' is corrupted.".format(name))
+            logger.info('Extracted %s', path)
+            extracted.append(path)
+    return extracted
+
+
+def _inflate(reader):
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    while not decompressor.eof:
+        data = reader.read_some(DOWNLOAD_CHUNK_SIZE)
+        if not data:
+            raise CLIError('The zip file is truncated.')
+        block = decompressor.decompress(data)
+        if block:
+            yield block
+    reader.unread(decompressor.unused_data)
+
+
+def _read_stored(reader, size):
+    while size:
+        block = reader.read_some(min(size, DOWNLOAD_CHUNK_SIZE))
+        if not block:
+            raise CLIError('The zip file is truncated.')
+        size -= len(block)
+        yield block
@@ -0,0 +1,151 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import codecs
+import sys
+import threading
+import time
+
+from knack.log import get_logger
+from knack.util import CLIError
+
+logger = get_logger(__name__)
+
+RECONNECT_DELAY = 1
+MAX_RECONNECT_DELAY = 30
+# The log stream sends a heartbeat every minute, so a longer silence means the connection is lost
+READ_TIMEOUT = 300
+# Statuses after which reconnecting cannot succeed
+_FATAL_STATUSES = (401, 403, 404)
+
+
+def _get_pool_manager():
+    import certifi
+    import urllib3
+    try:
+        import urllib3.contrib.pyopenssl
+        urllib3.contrib.pyopenssl.inject_into_urllib3()
+    except ImportError:
+        pass
+    return urllib3.PoolManager(cert_reqs='CERT_REQUIRED', ca_certs=certifi.where())
+
+
+class LogWriter(object):
+    """
+    Writes the logs of one or more streams to the standard output.
+
+    The logs are written as received to the binary buffer of the standard output when it is encoded in UTF-8, like
+    the logs, and transcoded otherwise. The logs are only split into lines when several streams are multiplexed,
+    so that each line can be prefixed with its app and lines of different apps aren't mixed, or when they are
+    filtered.
+    """
+
+    def __init__(self, line_filter=None, split_lines=False, out=None):
+        out = out or sys.stdout
+        self._lock = threading.Lock()
+        self._filter = line_filter
+        self._encoding = getattr(out, 'encoding', None) or 'utf-8'
+        self._is_utf8 = codecs.lookup(self._encoding).name == 'utf-8'
+        buffer = getattr(out, 'buffer', None)
+        self._binary = self._is_utf8 and buffer is not None
+        self._out = buffer if self._binary else out
+        self.split_lines = split_lines or line_filter is not None
+
+    def write(self, data):
+        if not self._binary:
+            # Extra encode() and decode for stdout which does not support 'utf-8'
+            data = data.decode('utf-8', errors='replace')
+            if not self._is_utf8:
+                data = data.encode(self._encoding, errors='replace').decode(self._encoding, errors='replace')
+        with self._lock:
+            self._out.write(data)
+            self._out.flush()
+
+    def write_lines(self, prefix, lines):
+        if self._filter is not None:
+            lines = [line for line in lines if self._filter.search(line)]
+        if lines:
+            self.write(b''.join(prefix + line for line in lines))
+
+
+class LogStream(object):
+    """
+    Streams the logs of an app, reconnecting with an exponential backoff when the connection is lost.
+    """
+
+    def __init__(self, name, url, user_name, password, writer, prefix=b''):
+        self.name = name
+        self.url = url
+        self.error = None
+        self._user_name = user_name
+        self._password = password
+        self._writer = writer
+        self._prefix = prefix
+        self._partial_line = b''
+
+    def _write(self, chunk):
+        if not self._writer.split_lines:
+            self._writer.write(chunk)
+            return
+        lines = (self._partial_line + chunk).split(b'\n')
+        self._partial_line = lines.pop()
+        self._writer.write_lines(self._prefix, [line + b'\n' for line in lines])
+
+    def _flush(self):
+        if self._partial_line:
+            self._writer.write_lines(self._prefix, [self._partial_line + b'\n'])
+            self._partial_line = b''
+
+    def run(self, shutdown_event, http=None):
+        import urllib3
+        http = http or _get_pool_manager()
+        headers = urllib3.util.make_headers(basic_auth='{0}:{1}'.format(self._user_name, self._password))
+        delay = RECONNECT_DELAY
+        while not shutdown_event.is_set():
+            response = None
+            try:
+                response = http.request('GET', self.url, headers=headers, preload_content=False, retries=False,
+                                        timeout=urllib3.Timeout(connect=30, read=READ_TIMEOUT))
+                if response.status in _FATAL_STATUSES:
+                    self.error = "Failed to connect to '{}' with status code '{}' and reason '{}'".format(
+                        self.url, response.status, response.reason)
+                    return
+                if response.status == 200:
+                    for chunk in response.stream():
+                        if chunk:
+                            self._write(chunk)
+                            delay = RECONNECT_DELAY
+                        if shutdown_event.is_set():
+                            return
+                else:
+                    logger.debug("Log stream '%s' returned status code %s", self.url, response.status)
+            except (urllib3.exceptions.HTTPError, IOError, OSError) as ex:
+                logger.debug("Log stream '%s' failed: %s", self.url, ex)
+            finally:
+                if response is not None:
+                    response.release_conn()
+            self._flush()
+            logger.warning("Lost the log stream of '%s', reconnecting in %s seconds.", self.name, delay)
+            shutdown_event.wait(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+
+def stream_logs(streams):
+    """
+    Streams the logs of several apps until interrupted, each one on its own connection. Raises CLIError once all
+    the streams failed for good.
+    """
+    shutdown_event = threading.Event()
+    http = _get_pool_manager()
+    threads = [threading.Thread(target=s.run, args=(shutdown_event, http)) for s in streams]
+    for t in threads:
+        t.daemon = True
+        t.start()
+    try:
+        while any(t.is_alive() for t in threads):
+            time.sleep(1)  # so that ctrl+c can stop the command
+    finally:
+        shutdown_event.set()
+    raise CLIError('\n'.join(s.error for s in streams if s.error))
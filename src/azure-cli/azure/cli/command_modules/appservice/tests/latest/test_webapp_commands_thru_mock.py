@@ -311,6 +311,29 @@ class TestWebappMocked(unittest.TestCase):
             # assert
             site_op_mock.assert_called_with(cli_ctx_mock, 'rg', 'web1', 'list_publishing_credentials', None)
 
+    def test_log_stream_reconnects_and_filters_lines(self):
+        import io
+        import re
+        from urllib3.exceptions import ProtocolError
+        from azure.cli.command_modules.appservice.log_stream import LogStream, LogWriter
+
+        out = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        writer = LogWriter(re.compile(b'ERROR'), split_lines=True, out=out)
+        stream = LogStream('web1', 'https://web1.scm/logstream', 'user', 'secret', writer, prefix=b'[web1] ')
+        http = mock.MagicMock()
+        http.request.side_effect = [ProtocolError('connection reset'),
+                                    mock.MagicMock(status=200, **{'stream.return_value': [b'INFO a\nERROR b\nERR', b'OR c\n']}),
+                                    mock.MagicMock(status=503),
+                                    mock.MagicMock(status=401, reason='Unauthorized')]
+        shutdown_event = mock.MagicMock(**{'is_set.return_value': False})
+
+        stream.run(shutdown_event, http)
+
+        self.assertEqual(out.buffer.getvalue(), b'[web1] ERROR b\n[web1] ERROR c\n')
+        self.assertEqual(http.request.call_count, 4)
+        self.assertEqual([c[0][0] for c in shutdown_event.wait.call_args_list], [1, 1, 2])
+        self.assertIn("status code '401'", stream.error)
+
     @mock.patch('azure.cli.command_modules.appservice.custom._generic_site_operation', autospec=True)
     def test_restore_deleted_webapp(self, site_op_mock):
         cmd_mock = mock.MagicMock()
@@ -387,7 +410,75 @@ class TestWebappMocked(unittest.TestCase):
 
         # assert
         site_op_mock.assert_called_with(cli_ctx_mock, 'rg', 'web1', 'list_publishing_credentials', None)
-        get_log_mock.assert_called_with(test_scm_url + '/dump', 'great_user', 'secret_password', None)
+        get_log_mock.assert_called_with(test_scm_url + '/dump', 'great_user', 'secret_password', None, cli_ctx_mock)
+
+    def test_log_download_resumes_and_extracts_selected_files(self):
+        import io
+        import os
+        import shutil
+        import tempfile
+        import zipfile
+        from urllib3.exceptions import ProtocolError
+        from azure.cli.command_modules.appservice.log_download import iter_download, extract_zip_stream
+
+        class _UnseekableStream(io.RawIOBase):
+            def __init__(self):
+                self.data = b''
+
+            def writable(self):
+                return True
+
+            def write(self, b):
+                self.data += bytes(b)
+                return len(b)
+
+        # written to a stream which cannot seek, the sizes of the entries follow their data
+        archive = _UnseekableStream()
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as z:
+            z.writestr('LogFiles/http/raw.log', b'GET / 200\n' * 1000)
+            z.writestr('LogFiles/eventlog.xml', b'<events/>')
+            z.writestr(zipfile.ZipInfo('deployments/'), b'')
+            z.writestr('LogFiles/http/error.log', b'GET /error 500\n')
+        content = archive.data
+
+        def _response(status, body, headers):
+            def _stream(*_, **__):
+                yield body[:len(body) // 2]
+                if status == 200:
+                    raise ProtocolError('connection reset')
+                yield body[len(body) // 2:]
+            return mock.MagicMock(status=status, headers=headers, **{'stream.side_effect': _stream})
+
+        headers = {'Content-Length': str(len(content)), 'Accept-Ranges': 'bytes', 'ETag': '"1"'}
+        http = mock.MagicMock()
+        http.request.side_effect = [_response(200, content, headers),
+                                    _response(206, content[len(content) // 2:], headers)]
+        destination = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, destination)
+
+        with mock.patch('azure.cli.command_modules.appservice.log_download.logger'):
+            extracted = extract_zip_stream(iter_download(http, 'https://web1.scm/dump', {}), destination,
+                                           ['LogFiles/http/*'])
+
+        self.assertEqual(extracted, [os.path.join(destination, 'LogFiles', 'http', 'raw.log'),
+                                     os.path.join(destination, 'LogFiles', 'http', 'error.log')])
+        with open(extracted[0], 'rb') as f:
+            self.assertEqual(f.read(), b'GET / 200\n' * 1000)
+        self.assertFalse(os.path.exists(os.path.join(destination, 'LogFiles', 'eventlog.xml')))
+        range_headers = http.request.call_args_list[1][1]['headers']
+        self.assertEqual(range_headers['Range'], 'bytes={}-'.format(len(content) // 2))
+        self.assertEqual(range_headers['If-Range'], '"1"')
+
+        # a reconnection which fails counts as an attempt
+        http.request.side_effect = [_response(200, content, headers), ProtocolError('connection refused'),
+                                    _response(206, content[len(content) // 2:], headers)]
+        with mock.patch('azure.cli.command_modules.appservice.log_download.logger'):
+            self.assertEqual(b''.join(iter_download(http, 'https://web1.scm/dump', {})), content)
+
+        # without range support, a lost connection fails the extraction rather than restarting it
+        http.request.side_effect = [_response(200, content, {'Content-Length': str(len(content))})]
+        with self.assertRaisesRegexp(CLIError, 'cannot be resumed'):
+            extract_zip_stream(iter_download(http, 'https://web1.scm/dump', {}), destination, ['*'])
 
     def test_valid_linux_create_options(self):
         some_runtime = 'TOMCAT|8.5-jre8'
@@ -0,0 +1,100 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import re
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the layout of the argument schemas changes
+ARGUMENT_SCHEMA_VERSION = 1
+ARGUMENT_SCHEMA_FILE = 'batchArgumentSchema.json'
+
+_SDK_VERSION = re.compile(r'VERSION\s*=\s*[\'"]([^\'"]+)[\'"]')
+# Modules of this command module which decide how the SDK models are turned into arguments
+_SCHEMA_SOURCES = ['_command_type.py', '_parameter_format.py', '_validators.py']
+
+_schemas = {}
+
+
+def batch_sdk_version():
+    """Read the version of the installed azure-batch package without importing it.
+    :returns: str - the version, None if it cannot be found.
+    """
+    import importlib.util
+    try:
+        spec = importlib.util.find_spec('azure.batch')
+        with open(os.path.join(os.path.dirname(spec.origin), '_version.py'), 'r') as version_file:
+            return _SDK_VERSION.search(version_file.read()).group(1)
+    except (AttributeError, ImportError, OSError, IOError):
+        return None
+
+
+def argument_schema_fingerprint():
+    """Changes whenever the generated arguments may have changed: an upgrade of the
+    CLI or azure-batch, or a change of the modules introspecting the SDK.
+    :returns: str
+    """
+    from azure.cli.core import __version__
+    parts = [str(ARGUMENT_SCHEMA_VERSION), __version__, str(batch_sdk_version())]
+    module_dir = os.path.dirname(__file__)
+    for source in _SCHEMA_SOURCES:
+        try:
+            parts.append('{}:{}'.format(source, os.stat(os.path.join(module_dir, source)).st_mtime))
+        except (OSError, IOError):
+            continue
+    return '|'.join(parts)
+
+
+def _schema_path(cli_ctx):
+    return os.path.join(cli_ctx.config.config_dir, ARGUMENT_SCHEMA_FILE)
+
+
+def _read_schemas(path, fingerprint):
+    try:
+        with open(path, 'r') as schema_file:
+            content = json.load(schema_file)
+        if content.get('fingerprint') != fingerprint:
+            raise ValueError('argument schemas are out of date')
+        return content['schemas']
+    except (OSError, IOError, ValueError, KeyError, AttributeError) as ex:
+        if os.path.exists(path):
+            logger.debug("Discarding batch argument schemas '%s': %s", path, ex)
+        return {}
+
+
+def get_argument_schema(cli_ctx, key):
+    """Get the cached argument schema of a command.
+    :param cli_ctx: The CLI context.
+    :param str key: The key of the command schema.
+    :returns: dict - the schema, None if it is not cached for the installed SDK.
+    """
+    path = _schema_path(cli_ctx)
+    if path not in _schemas:
+        _schemas[path] = _read_schemas(path, argument_schema_fingerprint())
+    return _schemas[path].get(key)
+
+
+def save_argument_schema(cli_ctx, key, schema):
+    """Add the argument schema of a command to the cache file. The file is merged with
+    the schemas saved meanwhile by other processes and replaced atomically.
+    :param cli_ctx: The CLI context.
+    :param str key: The key of the command schema.
+    :param dict schema: The JSON serializable schema.
+    """
+    from azure.cli.core.util import atomic_write
+    path = _schema_path(cli_ctx)
+    fingerprint = argument_schema_fingerprint()
+    schemas = _read_schemas(path, fingerprint)
+    schemas[key] = schema
+    _schemas[path] = schemas
+    try:
+        with atomic_write(path) as schema_file:
+            json.dump({'fingerprint': fingerprint, 'schemas': schemas}, schema_file, separators=(',', ':'))
+    except (OSError, IOError, TypeError, ValueError) as ex:
+        logger.debug("Unable to save the batch argument schemas '%s': %s", path, ex)
@@ -12,6 +12,7 @@ from knack.introspection import extract_full_summary_from_signature, extract_arg
 from azure.cli.command_modules.batch import _validators as validators
 from azure.cli.command_modules.batch import _format as transformers
 from azure.cli.command_modules.batch import _parameter_format as pformat
+from azure.cli.command_modules.batch._argument_schema import get_argument_schema, save_argument_schema
 
 from azure.cli.core import EXCLUDED_PARAMS
 from azure.cli.core.commands import CONFIRM_PARAM_NAME
@@ -174,6 +175,34 @@ def arg_name(name):
     return "--" + name.replace('_', '-')
 
 
+def _encode_options(options):
+    """Replace the validator functions of argument kwargs by their names, so
+    they can be serialized in an argument schema.
+    :param dict options: The kwargs to be used to instantiate CLICommandArgument.
+    :returns: dict
+    """
+    encoded = dict(options)
+    for key in ['type', 'validator']:
+        if key in encoded:
+            func = encoded[key]
+            if getattr(validators, func.__name__, None) is not func:
+                raise ValueError("Argument {} '{}' is not a batch validator".format(key, func.__name__))
+            encoded[key] = func.__name__
+    return encoded
+
+
+def _decode_options(options):
+    """Restore the validator functions of argument kwargs from an argument schema.
+    :param dict options: The encoded kwargs.
+    :returns: dict
+    """
+    decoded = dict(options)
+    for key in ['type', 'validator']:
+        if key in decoded:
+            decoded[key] = getattr(validators, decoded[key])
+    return decoded
+
+
 def format_options_name(operation):
     """Format the name of the request options parameter from the
     operation name and path.
@@ -318,6 +347,14 @@ class BatchArgumentTree(object):
             'dependencies': [".".join([path, arg]) for arg in dependencies]
         }
 
+    def restore_argument(self, name, details):
+        """Add pending command line argument as listed when iterating over
+        the tree, e.g. from a cached argument schema.
+        :param str name: The name of the command line argument.
+        :param dict details: The details of the argument.
+        """
+        self._arg_tree[name] = details
+
     def dequeue_argument(self, name):
         """Remove pending command line argument for modification
         :param str name: The command line argument to remove.
@@ -449,6 +486,7 @@ class AzureBatchDataPlaneCommand(object):
         self._options_attrs = []
         # The loaded options model to populate for the request
         self._options_model = None
+        self._options_model_name = None
 
         def _get_operation():
             if not self._operation_func:
@@ -457,7 +495,12 @@ class AzureBatchDataPlaneCommand(object):
             return self._operation_func
 
         def _load_arguments():
-            return self._load_transformed_arguments(_get_operation())
+            schema_key = '{}:{}'.format(operation, self._flatten)
+            schema = get_argument_schema(command_loader.cli_ctx, schema_key)
+            if not schema:
+                schema = self._build_argument_schema(_get_operation())
+                save_argument_schema(command_loader.cli_ctx, schema_key, schema)
+            return self._load_schema_arguments(schema)
 
         def _load_descriptions():
             return extract_full_summary_from_signature(_get_operation())
@@ -576,6 +619,8 @@ class AzureBatchDataPlaneCommand(object):
         """Build request options model from command line arguments.
         :param dict kwargs: The request arguments being built.
         """
+        if self._options_model is None:
+            self._options_model = _load_model(self._options_model_name)()
         kwargs[self._options_param] = self._options_model
         for param in self._options_attrs:
             if param in pformat.IGNORE_OPTIONS:
@@ -620,7 +665,9 @@ class AzureBatchDataPlaneCommand(object):
                 yield attr, details
 
     def _process_options(self):
-        """Process the request options parameter to expose as arguments."""
+        """Process the request options parameter to expose as arguments.
+        :returns: The names of the arguments and the kwargs to instantiate them.
+        """
         for param in [o for o in self._options_attrs if o not in pformat.IGNORE_OPTIONS]:
             options = {}
             options['required'] = False
@@ -633,12 +680,12 @@ class AzureBatchDataPlaneCommand(object):
                     options['help'] = f_docstring
                     options['options_list'] = [arg_name(f_param)]
                     options['validator'] = validators.validate_options
-                    yield (f_param, CLICommandArgument(f_param, **options))
+                    yield (f_param, dict(options))
             else:
                 options['default'] = getattr(self._options_model, param)
                 options['help'] = find_param_help(self._options_model, param)
                 options['options_list'] = [arg_name(param)]
-                yield (param, CLICommandArgument(param, **options))
+                yield (param, options)
 
     def _resolve_conflict(self,
                           arg, param, path, options, typestr, dependencies, conflicting):
@@ -689,8 +736,6 @@ class AzureBatchDataPlaneCommand(object):
                 options['required'] = False
                 options['arg_group'] = group_title(path)
                 options['help'] = find_param_help(param_model, param_attr)
-                options['validator'] = \
-                    lambda ns: validators.validate_required_parameter(ns, self.parser)
                 options['default'] = None  # Extract details from signature
 
                 if details['type'] in pformat.BASIC_TYPES:
@@ -730,20 +775,27 @@ class AzureBatchDataPlaneCommand(object):
                     else:
                         self._flatten_object('.'.join([path, param_attr]), attr_model)
 
-    def _load_transformed_arguments(self, handler):
-        """Load all the command line arguments from the request parameters.
+    def _build_argument_schema(self, handler):
+        """Introspect the operation and the SDK models of its parameters for the command
+        line arguments. The schema only holds JSON serializable values, so that it can be
+        cached for the installed SDK version instead of parsing the docstrings every time.
         :param func handler: The operation function.
+        :returns: dict
         """
-        from azure.cli.core.commands.parameters import file_type
-        from argcomplete.completers import FilesCompleter, DirectoriesCompleter
         self.parser = BatchArgumentTree(self.validator)
         self._load_options_model(handler)
-        args = []
+        schema = {
+            'options_model': self._options_model.__class__.__name__,
+            'options_attrs': self._options_attrs,
+            'arguments': []
+        }
         for arg in extract_args_from_signature(handler, excluded_params=EXCLUDED_PARAMS):
             arg_type = find_param_type(handler, arg[0])
             if arg[0] == self._options_param:
-                for option_arg in self._process_options():
-                    args.append(option_arg)
+                schema['arguments'].append({
+                    'kind': 'options',
+                    'name': arg[0],
+                    'options': [[n, _encode_options(o)] for n, o in self._process_options()]})
             elif arg_type.startswith("str or"):
                 docstring = find_param_help(handler, arg[0])
                 choices = []
@@ -752,24 +804,61 @@ class AzureBatchDataPlaneCommand(object):
                     choices = docstring[values_index + 25:].split(', ')
                     choices = [enum_value(c) for c in choices if enum_value(c) != "'unmapped'"]
                     docstring = docstring[0:values_index]
-                args.append(((arg[0], CLICommandArgument(arg[0],
-                                                         options_list=[arg_name(arg[0])],
-                                                         required=False,
-                                                         default=None,
-                                                         choices=choices,
-                                                         help=docstring))))
+                schema['arguments'].append({'kind': 'enum', 'name': arg[0], 'choices': choices, 'help': docstring})
             elif arg_type.startswith("~"):  # TODO: could add handling for enums
                 param_type = class_name(arg_type)
                 self.parser.set_request_param(arg[0], param_type)
                 param_model = _load_model(param_type)
                 self._flatten_object(arg[0], param_model)
+                tree = []
+                for name, details in self.parser:
+                    details = dict(details, options=_encode_options(details['options']))
+                    tree.append([name, details])
+                schema['arguments'].append({'kind': 'body', 'name': arg[0], 'model': param_type, 'tree': tree})
+            elif arg[0] not in pformat.IGNORE_PARAMETERS:
+                options = {k: v for k, v in arg[1].type.settings.items() if k != 'dest'}
+                schema['arguments'].append({'kind': 'plain', 'name': arg[0], 'options': options})
+        return_type = find_return_type(handler)
+        schema['stream_output'] = bool(return_type and return_type.startswith('Generator'))
+        schema['head_cmd'] = return_type == 'None' and handler.__name__.startswith('get')
+        return schema
+
+    def _load_schema_arguments(self, schema):
+        """Load all the command line arguments from an argument schema.
+        :param dict schema: The schema built by _build_argument_schema.
+        """
+        from azure.cli.core.commands.parameters import file_type
+        from argcomplete.completers import FilesCompleter, DirectoriesCompleter
+        self.parser = BatchArgumentTree(self.validator)
+        self._options_model = None
+        self._options_model_name = schema['options_model']
+        self._options_attrs = list(schema['options_attrs'])
+        args = []
+        for argument in schema['arguments']:
+            if argument['kind'] == 'options':
+                for param, options in argument['options']:
+                    args.append((param, CLICommandArgument(param, **_decode_options(options))))
+            elif argument['kind'] == 'enum':
+                args.append((argument['name'], CLICommandArgument(argument['name'],
+                                                                  options_list=[arg_name(argument['name'])],
+                                                                  required=False,
+                                                                  default=None,
+                                                                  choices=list(argument['choices']),
+                                                                  help=argument['help'])))
+            elif argument['kind'] == 'body':
+                self.parser.set_request_param(argument['name'], argument['model'])
+                for name, details in argument['tree']:
+                    details = dict(details, options=_decode_options(details['options']))
+                    details['options']['validator'] = \
+                        lambda ns: validators.validate_required_parameter(ns, self.parser)
+                    self.parser.restore_argument(name, details)
                 for flattened_arg in self.parser.compile_args():
                     args.append(flattened_arg)
                 param = 'json_file'
                 docstring = "A file containing the {} specification in JSON " \
                             "(formatted to match the respective REST API body). " \
                             "If this parameter is specified, all '{} Arguments'" \
-                            " are ignored.".format(arg[0].replace('_', ' '), group_title(arg[0]))
+                            " are ignored.".format(argument['name'].replace('_', ' '), group_title(argument['name']))
                 args.append((param, CLICommandArgument(param,
                                                        options_list=[arg_name(param)],
                                                        required=False,
@@ -777,10 +866,9 @@ class AzureBatchDataPlaneCommand(object):
                                                        type=file_type,
                                                        completer=FilesCompleter(),
                                                        help=docstring)))
-            elif arg[0] not in pformat.IGNORE_PARAMETERS:
-                args.append(arg)
-        return_type = find_return_type(handler)
-        if return_type and return_type.startswith('Generator'):
+            else:
+                args.append((argument['name'], CLICommandArgument(argument['name'], **argument['options'])))
+        if schema['stream_output']:
             param = 'destination'
             docstring = "The path to the destination file or directory."
             args.append((param, CLICommandArgument(param,
@@ -791,8 +879,7 @@ class AzureBatchDataPlaneCommand(object):
                                                    type=file_type,
                                                    validator=validators.validate_file_destination,
                                                    help=docstring)))
-        if return_type == 'None' and handler.__name__.startswith('get'):
-            self._head_cmd = True
+        self._head_cmd = schema['head_cmd']
         if self.confirmation:
             param = CONFIRM_PARAM_NAME
             docstring = 'Do not prompt for confirmation.'
@@ -816,6 +903,12 @@ class AzureBatchDataPlaneCommand(object):
             help='Batch service endpoint. Alternatively, set by environment variable: AZURE_BATCH_ENDPOINT')))
         return args
 
+    def _load_transformed_arguments(self, handler):
+        """Load all the command line arguments from the request parameters.
+        :param func handler: The operation function.
+        """
+        return self._load_schema_arguments(self._build_argument_schema(handler))
+
 
 class BatchCommandGroup(AzCommandGroup):
 
@@ -244,7 +244,14 @@ def task_list_table_format(result):
 def task_create_table_format(result):
     """Format task create as a table."""
     table_output = []
-    if not isinstance(result, list):
+    if 'total' in result:
+        table_row = OrderedDict()
+        table_row['Job Id'] = result['jobId']
+        table_row['Total'] = result['total']
+        table_row['Succeeded'] = result['succeeded']
+        table_row['Failed'] = result['failed']
+        table_output.append(table_row)
+    elif not isinstance(result, list):
         table_row = OrderedDict()
         table_row['Task Id'] = result['id']
         table_row['Submission Status'] = "success"
@@ -314,6 +314,14 @@ short-summary: Manage Batch tasks.
 helps['batch task create'] = """
 type: command
 short-summary: Create Batch tasks.
+long-summary: >
+    When a file of multiple tasks is given with --json-file, the tasks are read as they are submitted and
+    added concurrently in collections of up to 100 tasks. A summary of the submission is returned. Tasks
+    that already exist in the job are counted as added, so a partially failed submission can be resumed
+    by running the command again.
+examples:
+  - name: Add the tasks of a JSON lines file, one task per line, to a job.
+    text: az batch task create --job-id myjob --json-file tasks.jsonl
 """
 
 helps['batch task file'] = """
@@ -21,7 +21,7 @@ from azure.cli.command_modules.batch._validators import \
      disk_encryption_configuration_format, environment_setting_format,
      keyvault_id, metadata_item_format, resource_file_format,
      storage_account_id, validate_cert_file, validate_cert_settings,
-     validate_client_parameters, validate_json_file,
+     validate_client_parameters, validate_json_file, validate_task_json_file,
      validate_pool_resize_parameters)
 
 
@@ -138,7 +138,7 @@ def load_arguments(self, _):
         c.argument('thumbprint', help='The certificate thumbprint.', validator=validate_cert_settings)
 
     with self.argument_context('batch task create') as c:
-        c.argument('json_file', type=file_type, help='The file containing the task(s) to create in JSON(formatted to match REST API request body). When submitting multiple tasks, accepts either an array of tasks or a TaskAddCollectionParamater. If this parameter is specified, all other parameters are ignored.', validator=validate_json_file, completer=FilesCompleter())
+        c.argument('json_file', type=file_type, help='The file containing the task(s) to create in JSON(formatted to match REST API request body). When submitting multiple tasks, accepts either an array of tasks, a TaskAddCollectionParamater or one task per line. If this parameter is specified, all other parameters are ignored.', validator=validate_task_json_file, completer=FilesCompleter())
         c.argument('application_package_references', nargs='+', help='The space-separated list of IDs specifying the application packages to be installed. Space-separated application IDs with optional version in \'id[#version]\' format.', type=application_package_reference_format)
         c.argument('job_id', help='The ID of the job containing the task.')
         c.argument('task_id', help='The ID of the task.')
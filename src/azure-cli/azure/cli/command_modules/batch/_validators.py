@@ -195,6 +195,17 @@ def validate_json_file(namespace):
             raise ValueError("Invalid JSON file: {}".format(err))
 
 
+def validate_task_json_file(namespace):
+    """Validate the given task json file is accessible. The tasks are validated as they are
+    read, so that large files are not loaded at once."""
+    if namespace.json_file:
+        try:
+            with open(namespace.json_file, 'r'):
+                pass
+        except EnvironmentError:
+            raise ValueError("Cannot access JSON request file: " + namespace.json_file)
+
+
 def validate_cert_file(namespace):
     """Validate the give cert file existing"""
     try:
@@ -4,6 +4,9 @@
 # --------------------------------------------------------------------------------------------
 
 import base64
+import itertools
+import json
+import time
 from six.moves.urllib.parse import urlsplit  # pylint: disable=import-error
 from six.moves import configparser
 
@@ -19,7 +22,7 @@ from azure.mgmt.batch.operations import (ApplicationPackageOperations)
 
 from azure.batch.models import (CertificateAddParameter, PoolStopResizeOptions, PoolResizeParameter,
                                 PoolResizeOptions, JobListOptions, JobListFromJobScheduleOptions,
-                                TaskAddParameter, TaskAddCollectionParameter, TaskConstraints,
+                                TaskAddParameter, TaskConstraints,
                                 PoolUpdatePropertiesParameter, StartTask, AffinityInformation)
 
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
@@ -29,6 +32,10 @@ from azure.cli.core.util import sdk_no_wait, get_file_json, in_cloud_console
 
 logger = get_logger(__name__)
 MAX_TASKS_PER_REQUEST = 100
+MAX_CONCURRENT_TASK_REQUESTS = 8
+MAX_TASK_SUBMISSION_RETRIES = 3
+MAX_REPORTED_FAILURES = 10
+_JSON_READ_SIZE = 64 * 1024
 
 
 def transfer_doc(source_func, *additional_source_funcs):
@@ -307,28 +314,230 @@ def list_job(client, job_schedule_id=None, filter=None,  # pylint: disable=redef
     return list(client.list(job_list_options=option2))
 
 
+def _iter_json_values(json_file):
+    """Stream the values of a JSON file without loading it at once: the elements of a top level
+    array, or the concatenated values of a JSON lines file.
+    :returns: Iterator of (in_array, value) tuples.
+    """
+    decoder = json.JSONDecoder()
+    with open(json_file, 'r', encoding='utf-8-sig') as f:
+        state = {'buffer': '', 'pos': 0}
+
+        def read_more():
+            """Append the next part of the file to the unparsed buffer, False at the end of the file."""
+            chunk = f.read(max(_JSON_READ_SIZE, len(state['buffer']) - state['pos']))
+            if not chunk:
+                return False
+            state['buffer'], state['pos'] = state['buffer'][state['pos']:] + chunk, 0
+            return True
+
+        def peek():
+            """The next character that is not whitespace, None at the end of the file."""
+            while True:
+                buffer, pos = state['buffer'], state['pos']
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                state['pos'] = pos
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not read_more():
+                    return None
+
+        def decode():
+            while True:
+                try:
+                    value, end = decoder.raw_decode(state['buffer'], state['pos'])
+                    # A number at the end of the buffer may continue in the next part of the file
+                    if end < len(state['buffer']) or not read_more():
+                        state['pos'] = end
+                        return value
+                except ValueError:
+                    if not read_more():
+                        raise
+
+        if peek() != '[':
+            while peek() is not None:
+                yield False, decode()
+            return
+        state['pos'] += 1
+        if peek() == ']':
+            state['pos'] += 1
+        else:
+            while True:
+                peek()
+                yield True, decode()
+                separator = peek()
+                state['pos'] += 1
+                if separator == ']':
+                    break
+                if separator != ',':
+                    raise ValueError("Expecting ',' delimiter or ']' after an array element")
+        if peek() is not None:
+            raise ValueError("Extra data after the top level array")
+
+
+def _is_task_collection(json_obj):
+    return isinstance(json_obj, dict) and 'value' in json_obj and 'id' not in json_obj
+
+
+def _deserialize_task(json_file, json_obj):
+    task = None
+    try:
+        if isinstance(json_obj, dict):
+            task = TaskAddParameter.from_dict(json_obj)
+    except (DeserializationError, TypeError):
+        pass
+    if task is None:
+        raise ValueError("JSON file '{}' is not formatted correctly.".format(json_file))
+    return task
+
+
+def _read_json_tasks(json_file):
+    """Read the tasks of a JSON file, which holds either a task, a TaskAddCollectionParameter,
+    an array of tasks or one task per line.
+    :returns: The task if the file holds a single task, otherwise None and an iterator
+     deserializing the tasks as they are read.
+    """
+    values = _iter_json_values(json_file)
+    try:
+        first = next(values, None)
+        if first is None:
+            return None, iter([])
+        if not first[0]:
+            second = next(values, None)
+            if second is None:
+                if _is_task_collection(first[1]):
+                    return None, (_deserialize_task(json_file, t) for t in first[1]['value'] or [])
+                return _deserialize_task(json_file, first[1]), None
+            values = itertools.chain([first, second], values)
+        else:
+            values = itertools.chain([first], values)
+    except ValueError as ex:
+        raise ValueError("JSON file '{}' is not formatted correctly: {}".format(json_file, ex))
+
+    def _tasks():
+        try:
+            for in_array, json_obj in values:
+                if not in_array and _is_task_collection(json_obj):
+                    for json_task in json_obj['value'] or []:
+                        yield _deserialize_task(json_file, json_task)
+                else:
+                    yield _deserialize_task(json_file, json_obj)
+        except ValueError as ex:
+            if str(ex).startswith("JSON file"):
+                raise
+            raise ValueError("JSON file '{}' is not formatted correctly: {}".format(json_file, ex))
+    return None, _tasks()
+
+
+def _format_task_error(error):
+    """Format the error of a task the service failed to add, whose message is optional."""
+    if error is None:
+        return 'Unknown error'
+    if error.message is None or not error.message.value:
+        return error.code
+    return '{}: {}'.format(error.code, error.message.value)
+
+
+def _is_error_without_details(ex):
+    """Whether an AttributeError was raised by the SDK while it handled a BatchErrorException without error
+    details, e.g. a response without a body."""
+    from azure.batch.models import BatchErrorException
+    return isinstance(ex.__context__, BatchErrorException) and ex.__context__.error is None
+
+
+def _add_task_chunk(client, job_id, tasks):
+    """Add a chunk of tasks, retrying only the tasks whose submission state is unknown.
+    Tasks failed due to client errors are not retried. Tasks failed due to server errors
+    are already retried by the SDK.
+    :returns: The list of failures.
+    """
+    from azure.batch.custom.custom_errors import CreateTasksErrorException
+    failures = []
+    for attempt in range(MAX_TASK_SUBMISSION_RETRIES + 1):
+        try:
+            client.add_collection(job_id=job_id, value=tasks)
+            break
+        except CreateTasksErrorException as ex:
+            for result in ex.failure_tasks:
+                failures.append({'taskId': result.task_id, 'error': _format_task_error(result.error)})
+            tasks, errors = ex.pending_tasks, ex.errors
+        except AttributeError as ex:
+            if not _is_error_without_details(ex):
+                raise
+            # the state of all the tasks of the chunk is unknown
+            logger.debug("Failed to add tasks to job '%s': %s", job_id, ex)
+            errors = ['Request failed']
+        if not tasks:
+            break
+        if attempt == MAX_TASK_SUBMISSION_RETRIES:
+            reason = str(errors[0]).strip() if errors else 'Unknown error'
+            failures.extend({'taskId': t.id, 'error': reason} for t in tasks)
+            break
+        logger.info("Retrying submission of %d tasks to job '%s': %s", len(tasks), job_id, errors)
+        time.sleep(2 ** attempt)
+    return failures
+
+
+def _submit_tasks(cli_ctx, client, job_id, tasks):
+    """Submit the tasks in chunks of MAX_TASKS_PER_REQUEST through a bounded pool of
+    concurrent requests. The chunks are built as the tasks are read, so that at most
+    the tasks of the pending requests are held in memory.
+    :returns: A summary of the submission.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    summary = {'jobId': job_id, 'total': 0, 'succeeded': 0, 'failed': 0}
+    failures = []
+    chunk_sizes = {}
+    hook = cli_ctx.get_progress_controller()
+
+    def _collect(done):
+        for future in done:
+            chunk_failures = future.result()
+            failures.extend(chunk_failures)
+            summary['failed'] += len(chunk_failures)
+            summary['succeeded'] += chunk_sizes.pop(future) - len(chunk_failures)
+        submitted = summary['succeeded'] + summary['failed']
+        hook.add(message='Submitted {} of {} tasks'.format(submitted, summary['total']))
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TASK_REQUESTS) as executor:
+        pending = set()
+        try:
+            chunk = list(itertools.islice(tasks, MAX_TASKS_PER_REQUEST))
+            while chunk:
+                if len(pending) >= 2 * MAX_CONCURRENT_TASK_REQUESTS:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+                future = executor.submit(_add_task_chunk, client, job_id, chunk)
+                chunk_sizes[future] = len(chunk)
+                summary['total'] += len(chunk)
+                pending.add(future)
+                chunk = list(itertools.islice(tasks, MAX_TASKS_PER_REQUEST))
+        finally:
+            if pending:
+                _collect(wait(pending)[0])
+            hook.end()
+
+    if failures:
+        from knack.util import CLIError
+        message = "Failed to add {} of {} tasks to job '{}':\n".format(summary['failed'], summary['total'], job_id)
+        message += '\n'.join('{}: {}'.format(f['taskId'], f['error']) for f in failures[:MAX_REPORTED_FAILURES])
+        if len(failures) > MAX_REPORTED_FAILURES:
+            message += '\n... and {} more'.format(len(failures) - MAX_REPORTED_FAILURES)
+        raise CLIError(message)
+    return summary
+
+
 @transfer_doc(TaskAddParameter, TaskConstraints, AffinityInformation)
-def create_task(client,
+def create_task(cmd, client,
                 job_id, json_file=None, task_id=None, command_line=None, resource_files=None,
                 environment_settings=None, affinity_id=None, max_wall_clock_time=None,
                 retention_time=None, max_task_retry_count=None,
                 application_package_references=None):
     task = None
-    tasks = []
+    tasks = None
     if json_file:
-        json_obj = get_file_json(json_file)
-        try:
-            task = TaskAddParameter.from_dict(json_obj)
-        except (DeserializationError, TypeError):
-            try:
-                task_collection = TaskAddCollectionParameter.from_dict(json_obj)
-                tasks = task_collection.value
-            except (DeserializationError, TypeError):
-                try:
-                    for json_task in json_obj:
-                        tasks.append(TaskAddParameter.from_dict(json_task))
-                except (DeserializationError, TypeError):
-                    raise ValueError("JSON file '{}' is not formatted correctly.".format(json_file))
+        task, tasks = _read_json_tasks(json_file)
     else:
         if command_line is None or task_id is None:
             raise ValueError("Missing required arguments.\nEither --json-file, "
@@ -349,10 +558,4 @@ def create_task(client,
         client.add(job_id=job_id, task=task)
         return client.get(job_id=job_id, task_id=task.id)
 
-    submitted_tasks = []
-    for i in range(0, len(tasks), MAX_TASKS_PER_REQUEST):
-        submission = client.add_collection(
-            job_id=job_id,
-            value=tasks[i:i + MAX_TASKS_PER_REQUEST])
-        submitted_tasks.extend(submission.value)  # pylint: disable=no-member
-    return submitted_tasks
+    return _submit_tasks(cmd.cli_ctx, client, job_id, tasks)
@@ -3,17 +3,24 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import json
 import os
+import shutil
+import tempfile
 import unittest
 import datetime
 import isodate
 import mock
 
+from knack.util import CLIError
+
 from azure.batch import models, operations, BatchServiceClient
 from azure.batch.batch_auth import SharedKeyCredentials
 
 from azure.cli.command_modules.batch import _validators
 from azure.cli.command_modules.batch import _command_type
+from azure.cli.command_modules.batch import _argument_schema
+from azure.cli.command_modules.batch import custom
 
 
 class TestObj(object):  # pylint: disable=too-few-public-methods
@@ -618,3 +625,138 @@ class TestBatchLoader(unittest.TestCase):  # pylint: disable=protected-access
         option = [arg for (name, arg) in args if name == 'node_reboot_option'][0]
         self.assertIsNotNone(option.choices)
         self.assertFalse([a for a in option.choices if "'" in a])
+
+    def test_batch_argument_schema(self):
+        handlers = [(self.command_pool, operations._pool_operations.PoolOperations.add),
+                    (self.command_file, operations._file_operations.FileOperations.get_from_task),
+                    (self.command_delete, operations._pool_operations.PoolOperations.delete),
+                    (self.command_conflicts, operations._job_schedule_operations.JobScheduleOperations.add),
+                    (self.command_node, operations._compute_node_operations.ComputeNodeOperations.reboot)]
+        for command, handler in handlers:
+            expected = command._load_transformed_arguments(handler)
+            schema = json.loads(json.dumps(command._build_argument_schema(handler)))
+            loaded = command._load_schema_arguments(schema)
+            self.assertEqual([a for a, _ in loaded], [a for a, _ in expected])
+            for (name, arg), (_, expected_arg) in zip(loaded, expected):
+                for key in ['options_list', 'required', 'default', 'help', 'choices', 'nargs', 'arg_group']:
+                    self.assertEqual(arg.type.settings.get(key), expected_arg.type.settings.get(key), name)
+                self.assertEqual(callable(arg.type.settings.get('validator')),
+                                 callable(expected_arg.type.settings.get('validator')), name)
+
+        kwargs = {'if_match': None, 'if_modified_since': None, 'if_none_match': None, 'if_unmodified_since': None}
+        self.command_delete._build_options(kwargs)
+        self.assertIsInstance(kwargs['pool_delete_options'], models.PoolDeleteOptions)
+
+    def test_batch_argument_schema_cache(self):
+        import azure.batch
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        cli_ctx = mock.Mock(config=mock.Mock(config_dir=temp_dir))
+        self.assertEqual(_argument_schema.batch_sdk_version(), azure.batch.VERSION)
+
+        with mock.patch.dict(_argument_schema._schemas, clear=True):
+            self.assertIsNone(_argument_schema.get_argument_schema(cli_ctx, 'pool:3'))
+            _argument_schema.save_argument_schema(cli_ctx, 'pool:3', {'arguments': []})
+            _argument_schema._schemas.clear()
+            self.assertEqual(_argument_schema.get_argument_schema(cli_ctx, 'pool:3'), {'arguments': []})
+        with mock.patch.dict(_argument_schema._schemas, clear=True), \
+                mock.patch.object(_argument_schema, 'batch_sdk_version', return_value='0.0.1'):
+            self.assertIsNone(_argument_schema.get_argument_schema(cli_ctx, 'pool:3'))
+
+
+class TestBatchTaskCreate(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.cmd = mock.Mock()
+
+    def _write(self, content):
+        path = os.path.join(self.temp_dir, 'tasks.json')
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_batch_read_json_tasks(self):
+        tasks = [{'id': 'task{}'.format(i), 'commandLine': 'cmd /c echo {}'.format(i)} for i in range(3)]
+        with mock.patch.object(custom, '_JSON_READ_SIZE', 7):
+            for content in [json.dumps(tasks, indent=2), '\n'.join(json.dumps(t) for t in tasks),
+                            json.dumps({'value': tasks})]:
+                task, read = custom._read_json_tasks(self._write(content))
+                self.assertIsNone(task)
+                self.assertEqual([t.id for t in read], ['task0', 'task1', 'task2'])
+
+            task, read = custom._read_json_tasks(self._write(json.dumps(tasks[0])))
+            self.assertEqual(task.command_line, 'cmd /c echo 0')
+            self.assertIsNone(read)
+            task, read = custom._read_json_tasks(self._write(json.dumps(tasks[:1])))
+            self.assertEqual([t.id for t in read], ['task0'])
+            with self.assertRaises(ValueError):
+                list(custom._read_json_tasks(self._write(json.dumps(tasks)[:-1]))[1])
+            with self.assertRaises(ValueError):
+                list(custom._read_json_tasks(self._write('[1, 2]'))[1])
+
+    def test_batch_create_tasks_in_chunks(self):
+        from azure.batch.custom.custom_errors import CreateTasksErrorException
+        path = self._write('\n'.join(json.dumps({'id': 'task{}'.format(i), 'commandLine': 'cmd'})
+                                     for i in range(250)))
+        client = mock.Mock()
+        connection_error = [True]
+
+        def add_collection(job_id, value):
+            self.assertEqual(job_id, 'job1')
+            failed = [models.TaskAddResult(status='clientError', task_id=t.id,
+                                           error=models.BatchError(code='InvalidProperty',
+                                                                   message=models.ErrorMessage(value='Invalid')))
+                      for t in value if t.id == 'task7']
+            if value[0].id == 'task200' and connection_error[0]:
+                connection_error[0] = False
+                raise CreateTasksErrorException(value[10:], [], [ValueError('Connection aborted')] * 2)
+            if failed:
+                raise CreateTasksErrorException([], failed, [])
+
+        client.add_collection.side_effect = add_collection
+        with mock.patch('time.sleep'):
+            with self.assertRaisesRegex(CLIError, "Failed to add 1 of 250 tasks to job 'job1'"):
+                custom.create_task(self.cmd, client, 'job1', json_file=path)
+        self.assertEqual(sorted(len(c[1]['value']) for c in client.add_collection.call_args_list), [40, 50, 100, 100])
+
+        client.add_collection.reset_mock()
+        client.add_collection.side_effect = None
+        path = self._write(json.dumps([{'id': 'task{}'.format(i), 'commandLine': 'cmd'} for i in range(150)]))
+        summary = custom.create_task(self.cmd, client, 'job1', json_file=path)
+        self.assertEqual(summary, {'jobId': 'job1', 'total': 150, 'succeeded': 150, 'failed': 0})
+        self.assertEqual(client.add_collection.call_count, 2)
+
+    def test_batch_create_tasks_reports_errors_without_details(self):
+        from azure.batch.custom.custom_errors import CreateTasksErrorException
+        path = self._write(json.dumps([{'id': 'task{}'.format(i), 'commandLine': 'cmd'} for i in range(150)]))
+        client = mock.Mock()
+        error_without_body = [True]
+
+        def add_collection(job_id, value):  # pylint: disable=unused-argument
+            if value[0].id == 'task100' and error_without_body[0]:
+                error_without_body[0] = False
+                # what the SDK does while handling a BatchErrorException without error details
+                try:
+                    raise models.BatchErrorException(mock.Mock(), mock.Mock(status_code=400, text=''))
+                except models.BatchErrorException as ex:
+                    ex.error = None
+                    ex.error.code  # pylint: disable=pointless-statement
+            failed = [models.TaskAddResult(status='clientError', task_id=t.id,
+                                           error=models.BatchError(code='TaskInvalid', message=None))
+                      for t in value if t.id == 'task7']
+            if failed:
+                raise CreateTasksErrorException([], failed, [])
+
+        client.add_collection.side_effect = add_collection
+        with mock.patch('time.sleep'):
+            with self.assertRaisesRegex(CLIError, "Failed to add 1 of 150 tasks to job 'job1'") as cm:
+                custom.create_task(self.cmd, client, 'job1', json_file=path)
+        self.assertIn('TaskInvalid', str(cm.exception))
+        self.assertEqual(client.add_collection.call_count, 3)
+
+        client.add_collection.reset_mock()
+        client.add_collection.side_effect = AttributeError('value')
+        with self.assertRaisesRegex(AttributeError, 'value'):
+            custom.create_task(self.cmd, client, 'job1', json_file=path)
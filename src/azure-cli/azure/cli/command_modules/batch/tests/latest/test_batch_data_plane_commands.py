@@ -200,10 +200,10 @@ class BatchDataPlaneScenarioTests(BatchScenarioMixin, ScenarioTest):
 
         self.batch_cmd('batch task delete --job-id {j_id} --task-id aaa --yes')
 
-        result = self.batch_cmd('batch task create --job-id {j_id} --json-file "{ts_file}"')
-        result = result.get_output_in_json()
-        self.assertEqual(len(result), 3)
-        self.assertTrue(any([i for i in result if i['taskId'] == 'xplatTask1']))
+        self.batch_cmd('batch task create --job-id {j_id} --json-file "{ts_file}"').assert_with_checks([
+            self.check('total', 3),
+            self.check('succeeded', 3),
+            self.check('failed', 0)])
 
     @ResourceGroupPreparer()
     @BatchAccountPreparer(location='canadaeast')
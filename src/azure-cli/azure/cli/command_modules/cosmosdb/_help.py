@@ -789,6 +789,27 @@ type: command
 short-summary: Update the throughput of the Table under an Azure Cosmos DB account.
 """
 
+helps['cosmosdb throughput'] = """
+type: group
+short-summary: Manage the throughput of several databases or containers of an Azure Cosmos DB account at once.
+"""
+
+helps['cosmosdb throughput bulk-update'] = """
+type: command
+short-summary: Update the throughput of the databases or containers of an Azure Cosmos DB account matching name patterns.
+long-summary: >
+    The matching resources are listed once, then updated concurrently. Resources already at the target throughput,
+    and resources without a dedicated throughput, are skipped. A throttled request delays all the updates until the
+    service accepts requests again. Migrating between manual and autoscale throughput is not supported: use
+    --throughput for resources with a manual throughput and --max-throughput for resources with an autoscale
+    throughput. The status of each resource is returned, and resources whose update failed are reported as warnings.
+examples:
+  - name: Scale down all the SQL containers of the databases whose names start with "test".
+    text: az cosmosdb throughput bulk-update -g MyResourceGroup -a MyAccount --api sql --database-pattern "test*" --throughput 400
+  - name: Set the maximum autoscale throughput of all the MongoDB databases of an account, 16 at a time.
+    text: az cosmosdb throughput bulk-update -g MyResourceGroup -a MyAccount --api mongodb --level database --max-throughput 4000 --max-parallel 16
+"""
+
 helps['cosmosdb update'] = """
 type: command
 short-summary: Update an Azure Cosmos DB database account.
@@ -266,3 +266,13 @@ def load_arguments(self, _):
         c.argument('account_name', account_name_type, id_part=None)
         c.argument('table_name', options_list=['--name', '-n'], help="Table name")
         c.argument('throughput', type=int, help='The throughput of Table (RU/s).')
+
+    with self.argument_context('cosmosdb throughput bulk-update') as c:
+        c.argument('account_name', account_name_type, id_part=None)
+        c.argument('api', arg_type=get_enum_type(['sql', 'mongodb', 'cassandra', 'gremlin', 'table']), help='The API of the account.')
+        c.argument('throughput', type=int, help='The throughput to set (RU/s), on resources with a manual throughput.')
+        c.argument('max_throughput', type=int, help='The maximum autoscale throughput to set (RU/s), on resources with an autoscale throughput.')
+        c.argument('level', arg_type=get_enum_type(['database', 'container']), help='Update the throughput of the databases (or keyspaces), or of their containers (or collections, tables, graphs).')
+        c.argument('database_pattern', options_list=['--database-pattern', '--dp'], help='Glob pattern of the names of the databases (or keyspaces) to update, or whose containers to update.')
+        c.argument('container_pattern', options_list=['--container-pattern', '--cp'], help='Glob pattern of the names of the containers (or collections, tables, graphs) to update.')
+        c.argument('max_parallel', type=int, help='The maximum number of resources updated concurrently.')
@@ -228,6 +228,9 @@ def load_command_table(self, _):
         g.command('show', 'get_table_throughput')
         g.custom_command('update', 'cli_cosmosdb_table_throughput_update')
 
+    with self.command_group('cosmosdb throughput', is_preview=True) as g:
+        g.custom_command('bulk-update', 'cli_cosmosdb_throughput_bulk_update')
+
     # virtual network rules
     with self.command_group('cosmosdb network-rule', None, client_factory=cf_db_accounts) as g:
         g.custom_command('list', 'cli_cosmosdb_network_rule_list')
@@ -918,6 +918,180 @@ def cli_cosmosdb_table_throughput_update(client,
     return client.update_table_throughput(resource_group_name, account_name, table_name, throughput_update_resource)
 
 
+# Maximum number of resources whose throughput is updated concurrently
+MAX_CONCURRENT_THROUGHPUT_UPDATES = 8
+# Number of times a throttled request is retried
+MAX_THROTTLED_RETRIES = 5
+# Seconds to wait after a throttled request whose response has no Retry-After header
+THROTTLED_RETRY_DELAY = 2
+
+# Client attribute and operation names of the databases and containers of each API
+_THROUGHPUT_RESOURCE_OPERATIONS = {
+    'sql': ('sql_resources', 'sql_database', 'sql_container'),
+    'mongodb': ('mongo_db_resources', 'mongo_db_database', 'mongo_db_collection'),
+    'cassandra': ('cassandra_resources', 'cassandra_keyspace', 'cassandra_table'),
+    'gremlin': ('gremlin_resources', 'gremlin_database', 'gremlin_graph'),
+    'table': ('table_resources', None, 'table')
+}
+
+
+class _ThrottlingGate(object):
+    """Delays the requests of all the workers once one of them is throttled."""
+
+    def __init__(self):
+        import threading
+        self._lock = threading.Lock()
+        self._resume_time = 0
+
+    def wait(self):
+        import time
+        with self._lock:
+            delay = self._resume_time - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttled(self, delay):
+        import time
+        with self._lock:
+            self._resume_time = max(self._resume_time, time.time() + delay)
+
+
+def _call_with_throttling(gate, operation, *args):
+    from msrestazure.azure_exceptions import CloudError
+    for attempt in range(MAX_THROTTLED_RETRIES + 1):
+        gate.wait()
+        try:
+            return operation(*args)
+        except CloudError as ex:
+            if ex.status_code != 429 or attempt == MAX_THROTTLED_RETRIES:
+                raise
+            retry_after = ex.response.headers.get('Retry-After') if ex.response is not None else None
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else THROTTLED_RETRY_DELAY * 2 ** attempt
+            logger.debug('Throttled, retrying in %s seconds', delay)
+            gate.throttled(delay)
+    return None
+
+
+def _list_throughput_resources(client, resource_group_name, account_name, api, level, database_pattern,
+                               container_pattern):
+    """Lists the databases or containers of an account whose names match glob patterns."""
+    from fnmatch import fnmatchcase
+    attribute, database_type, container_type = _THROUGHPUT_RESOURCE_OPERATIONS[api]
+    operations = getattr(client, attribute)
+    if database_type is None:
+        if level == 'database':
+            raise CLIError('The Table API has no databases, use --level container.')
+        return [(operations, container_type, (t.name,))
+                for t in getattr(operations, 'list_' + container_type + 's')(resource_group_name, account_name)
+                if fnmatchcase(t.name, container_pattern)]
+
+    databases = [d.name for d in getattr(operations, 'list_' + database_type + 's')(resource_group_name, account_name)
+                 if fnmatchcase(d.name, database_pattern)]
+    if level == 'database':
+        return [(operations, database_type, (d,)) for d in databases]
+    return [(operations, container_type, (d, c.name))
+            for d in databases
+            for c in getattr(operations, 'list_' + container_type + 's')(resource_group_name, account_name, d)
+            if fnmatchcase(c.name, container_pattern)]
+
+
+def _update_resource_throughput(gate, operations, resource_type, names, resource_group_name, account_name,
+                                throughput, max_throughput):
+    """Updates the throughput of a database or container, unless it is already the target throughput."""
+    from msrestazure.azure_exceptions import CloudError
+    from azure.mgmt.cosmosdb.models import ProvisionedThroughputSettingsResource
+    result = {'name': '/'.join(names), 'resourceType': resource_type}
+    try:
+        current = _call_with_throttling(gate, getattr(operations, 'get_' + resource_type + '_throughput'),
+                                        resource_group_name, account_name, *names).resource
+    except CloudError as ex:
+        if ex.status_code != 404:
+            raise
+        result['status'] = 'skipped'
+        result['reason'] = 'The throughput is not provisioned on this resource.'
+        return result
+
+    autoscale = current.provisioned_throughput_settings
+    result['previousThroughput'] = current.throughput
+    result['previousMaxThroughput'] = autoscale.max_throughput if autoscale else None
+    if bool(autoscale) != bool(max_throughput):
+        result['status'] = 'skipped'
+        result['reason'] = 'The throughput is {}, migrating it is not supported.'.format(
+            'autoscale' if autoscale else 'manual')
+        return result
+    if (autoscale and autoscale.max_throughput == max_throughput) or \
+            (not autoscale and current.throughput == throughput):
+        result['status'] = 'unchanged'
+        return result
+
+    if max_throughput:
+        throughput_resource = ThroughputSettingsResource(
+            provisioned_throughput_settings=ProvisionedThroughputSettingsResource(max_throughput=max_throughput))
+    else:
+        throughput_resource = ThroughputSettingsResource(throughput=throughput)
+    throughput_update_resource = ThroughputSettingsUpdateParameters(resource=throughput_resource)
+    poller = _call_with_throttling(gate, getattr(operations, 'update_' + resource_type + '_throughput'),
+                                   resource_group_name, account_name, *(names + (throughput_update_resource,)))
+    poller.result()
+    result['status'] = 'updated'
+    return result
+
+
+def cli_cosmosdb_throughput_bulk_update(cmd,
+                                        resource_group_name,
+                                        account_name,
+                                        api,
+                                        throughput=None,
+                                        max_throughput=None,
+                                        level='container',
+                                        database_pattern='*',
+                                        container_pattern='*',
+                                        max_parallel=MAX_CONCURRENT_THROUGHPUT_UPDATES):
+    """
+    Update the throughput of the databases or containers of an Azure Cosmos DB account matching glob patterns.
+
+    The resources are listed once, then updated concurrently, at most max_parallel at a time. Throttled requests
+    are retried after the delay requested by the service, and delay the requests of the other updates meanwhile.
+    A resource whose update fails is reported and skipped.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from msrestazure.azure_exceptions import CloudError
+    from ._client_factory import cf_cosmosdb
+
+    if bool(throughput) == bool(max_throughput):
+        raise CLIError('Specify either --throughput or --max-throughput.')
+    if max_parallel < 1:
+        raise CLIError('--max-parallel must be at least 1.')
+
+    client = cf_cosmosdb(cmd.cli_ctx)
+    resources = _list_throughput_resources(client, resource_group_name, account_name, api, level,
+                                           database_pattern, container_pattern)
+    gate = _ThrottlingGate()
+    results = {}
+    hook = cmd.cli_ctx.get_progress_controller(det=True)
+    try:
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            futures = {executor.submit(_update_resource_throughput, gate, operations, resource_type, names,
+                                       resource_group_name, account_name, throughput, max_throughput):
+                       (resource_type, names)
+                       for operations, resource_type, names in resources}
+            for completed, future in enumerate(as_completed(futures), 1):
+                resource_type, names = futures[future]
+                try:
+                    results[names] = future.result()
+                except CloudError as ex:
+                    logger.warning("Unable to update the throughput of '%s': %s", '/'.join(names), ex)
+                    results[names] = {'name': '/'.join(names), 'resourceType': resource_type,
+                                      'status': 'failed', 'reason': str(ex)}
+                hook.add(message='Updated {} of {} resources'.format(completed, len(resources)),
+                         value=completed, total_val=len(resources))
+    finally:
+        hook.end()
+
+    # Keep the order of the listed resources, regardless of which updates completed first
+    return [results[names] for _, _, names in resources]
+
+
 def cli_cosmosdb_network_rule_list(client, resource_group_name, account_name):
     """ Lists the virtual network accounts associated with a Cosmos DB account """
     cosmos_db_account = client.get(resource_group_name, account_name)
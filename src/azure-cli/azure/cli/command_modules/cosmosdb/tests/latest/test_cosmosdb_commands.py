@@ -5,6 +5,10 @@
 
 # pylint: disable=too-many-lines
 
+import unittest
+
+import mock
+
 from azure.cli.testsdk import JMESPathCheck, ScenarioTest, ResourceGroupPreparer
 from knack.util import CLIError
 
@@ -1018,3 +1022,62 @@ class CosmosDBTests(ScenarioTest):
         cmk_output = self.cmd('az cosmosdb create -n {acc} -g {rg} --locations regionName={location} failoverPriority=0 --key-uri {key_uri}').get_output_in_json()
 
         assert cmk_output["keyVaultKeyUri"] == key_uri
+
+
+class CosmosDBThroughputBulkUpdateTest(unittest.TestCase):
+
+    @mock.patch('azure.cli.command_modules.cosmosdb._client_factory.cf_cosmosdb', autospec=True)
+    def test_cosmosdb_throughput_bulk_update(self, cf_cosmosdb):
+        from msrestazure.azure_exceptions import CloudError
+        from azure.mgmt.cosmosdb.models import ProvisionedThroughputSettingsResource
+        from azure.cli.command_modules.cosmosdb.custom import cli_cosmosdb_throughput_bulk_update
+
+        def _named(name):
+            resource = mock.Mock()
+            resource.name = name
+            return resource
+
+        def _error(status_code, headers=None):
+            return CloudError(mock.Mock(status_code=status_code, headers=headers or {}), error='error')
+
+        autoscale = ProvisionedThroughputSettingsResource(max_throughput=4000)
+        throughputs = {('prod1', 'c1'): mock.Mock(throughput=1000, provisioned_throughput_settings=None),
+                       ('prod1', 'shared'): _error(404),
+                       ('prod2', 'c1'): mock.Mock(throughput=400, provisioned_throughput_settings=None),
+                       ('prod2', 'auto'): mock.Mock(throughput=400, provisioned_throughput_settings=autoscale)}
+        throttled = [_error(429, {'Retry-After': '0'})]
+
+        def _get_throughput(resource_group_name, account_name, database_name, container_name):
+            throughput = throughputs[(database_name, container_name)]
+            if isinstance(throughput, Exception):
+                raise throughput
+            return mock.Mock(resource=throughput)
+
+        def _update_throughput(resource_group_name, account_name, database_name, container_name, parameters):
+            if throttled:
+                raise throttled.pop()
+            return mock.Mock()
+
+        operations = cf_cosmosdb.return_value.sql_resources
+        operations.list_sql_databases.return_value = [_named(n) for n in ('prod1', 'prod2', 'test1')]
+        operations.list_sql_containers.side_effect = lambda rg, account, database: {
+            'prod1': [_named('c1'), _named('shared')], 'prod2': [_named('c1'), _named('auto')]}[database]
+        operations.get_sql_container_throughput.side_effect = _get_throughput
+        operations.update_sql_container_throughput.side_effect = _update_throughput
+
+        results = cli_cosmosdb_throughput_bulk_update(mock.MagicMock(), 'rg', 'account1', 'sql', throughput=400,
+                                                      database_pattern='prod*')
+
+        self.assertEqual([(r['name'], r['status']) for r in results],
+                         [('prod1/c1', 'updated'), ('prod1/shared', 'skipped'),
+                          ('prod2/c1', 'unchanged'), ('prod2/auto', 'skipped')])
+        self.assertEqual(operations.update_sql_container_throughput.call_count, 2)
+        parameters = operations.update_sql_container_throughput.call_args[0][4]
+        self.assertEqual(parameters.resource.throughput, 400)
+        self.assertEqual(operations.list_sql_containers.call_count, 2)
+
+        with self.assertRaises(CLIError):
+            cli_cosmosdb_throughput_bulk_update(mock.MagicMock(), 'rg', 'account1', 'sql')
+        with self.assertRaises(CLIError):
+            cli_cosmosdb_throughput_bulk_update(mock.MagicMock(), 'rg', 'account1', 'table', throughput=400,
+                                                level='database')
@@ -290,11 +290,16 @@ parameters:
     short-summary: The local path where the file or folder will be downloaded to.
   - name: --thread-count
     type: int
-    short-summary: 'Parallelism of the download. Default: The number of cores in the local machine.'
+    short-summary: 'Parallelism of the download. Default: The number of cores in the local machine, or several times it when most of the files are small.'
   - name: --chunk-size
     type: int
     short-summary: Size of a chunk, in bytes.
-    long-summary: Large files are split into chunks. Files smaller than this size will always be transferred in a single thread.
+    long-summary: >
+        Large files are split into chunks. Files smaller than this size will always be transferred in a single thread.
+        Default: chosen from the sizes of the files and the throughput of the previous transfers, at most 268435456.
+  - name: --resume
+    short-summary: Resume an interrupted transfer with the same source and destination.
+    long-summary: The files recorded as transferred by the interrupted transfer are skipped, the other ones are transferred again.
   - name: --buffer-size
     type: int
     short-summary: Size of the transfer buffer, in bytes.
@@ -399,11 +404,16 @@ parameters:
     short-summary: The full path in the Data Lake Store filesystem to upload the file or folder to.
   - name: --thread-count
     type: int
-    short-summary: 'Parallelism of the upload. Default: The number of cores in the local machine.'
+    short-summary: 'Parallelism of the upload. Default: The number of cores in the local machine, or several times it when most of the files are small.'
   - name: --chunk-size
     type: int
     short-summary: Size of a chunk, in bytes.
-    long-summary: Large files are split into chunks. Files smaller than this size will always be transferred in a single thread.
+    long-summary: >
+        Large files are split into chunks. Files smaller than this size will always be transferred in a single thread.
+        Default: chosen from the sizes of the files and the throughput of the previous transfers, at most 268435456.
+  - name: --resume
+    short-summary: Resume an interrupted transfer with the same source and destination.
+    long-summary: The files recorded as transferred by the interrupted transfer are skipped, the other ones are transferred again.
   - name: --buffer-size
     type: int
     short-summary: Size of the transfer buffer, in bytes.
@@ -417,4 +427,6 @@ examples:
   - name: Upload a file or folder to a Data Lake Store account. (autogenerated)
     text: az dls fs upload --account {account} --destination-path {destination-path} --overwrite  --source-path {source-path}
     crafted: true
+  - name: Resume an interrupted upload of a folder, skipping the files which were already uploaded.
+    text: az dls fs upload --account myadls --source-path /data/logs --destination-path /logs --resume
 """
@@ -0,0 +1,274 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Planning, progress reporting and resumption of the Data Lake Store file transfers.
+
+The parallelism and chunk size of a transfer are chosen once all its files are known, from the distribution of
+their sizes and from the throughput measured during the previous transfers. The files which completed are recorded
+in a journal, so an interrupted transfer can be resumed without transferring them again.
+"""
+
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import threading
+import time
+
+from knack.log import get_logger
+
+from azure.datalake.store.transfer import ADLTransferClient
+
+from azure.cli.core.util import atomic_write
+
+logger = get_logger(__name__)
+
+TRANSFERS_DIR = 'dlsTransfers'
+THROUGHPUT_FILE = 'throughput.json'
+
+# The transfer of files smaller than this is dominated by the latency of its requests rather than by bandwidth
+SMALL_FILE_SIZE = 4 * 1024 * 1024
+# Threads per core when most of the files are small, so the latencies of their requests overlap
+SMALL_FILE_THREADS_PER_CORE = 4
+MAX_THREAD_COUNT = 64
+MIN_CHUNK_SIZE = 32 * 1024 * 1024
+MAX_CHUNK_SIZE = 256 * 1024 * 1024
+# Large files are split so that each thread gets a few chunks, keeping all the threads busy until the end
+CHUNKS_PER_THREAD = 4
+# Seconds a chunk should take at the measured throughput, which bounds the work redone when a chunk fails
+CHUNK_SECONDS = 60
+# Transfers smaller than this don't measure the throughput of a thread, but the latency of the requests
+MIN_MEASURED_BYTES = 64 * 1024 * 1024
+
+
+def plan_transfer(sizes, buffer_size, block_size, thread_count=None, chunk_size=None, throughput=None):
+    """Choose the parallelism and the chunk size of a transfer, unless they are given.
+    :param list sizes: The sizes of the files to transfer, in bytes.
+    :param int buffer_size: The size of the transfer buffer; chunks cannot be smaller.
+    :param int block_size: The size of a block; chunks are a multiple of it.
+    :param int thread_count: The parallelism requested by the user.
+    :param int chunk_size: The chunk size requested by the user.
+    :param int throughput: Bytes per second of a thread measured during previous transfers, None if unknown.
+    :returns: tuple of the thread count and the chunk size.
+    """
+    planned_threads = not thread_count
+    if planned_threads:
+        small_files = sum(1 for s in sizes if s < SMALL_FILE_SIZE)
+        thread_count = multiprocessing.cpu_count()
+        if sizes and small_files * 2 >= len(sizes):
+            thread_count *= SMALL_FILE_THREADS_PER_CORE
+
+    if not chunk_size:
+        chunk_size = MAX_CHUNK_SIZE
+        large_bytes = sum(s for s in sizes if s > MIN_CHUNK_SIZE)
+        if large_bytes:
+            chunk_size = min(chunk_size, large_bytes // (thread_count * CHUNKS_PER_THREAD))
+        if throughput:
+            chunk_size = min(chunk_size, int(throughput * CHUNK_SECONDS))
+        chunk_size = max(chunk_size, MIN_CHUNK_SIZE, buffer_size)
+        chunk_size = int(math.ceil(float(chunk_size) / block_size)) * block_size
+
+    if planned_threads:
+        chunk_count = sum(max(1, int(math.ceil(float(s) / chunk_size))) for s in sizes)
+        thread_count = max(1, min(thread_count, MAX_THREAD_COUNT, chunk_count))
+    return thread_count, chunk_size
+
+
+def _transfers_dir(cli_ctx):
+    return os.path.join(cli_ctx.config.config_dir, TRANSFERS_DIR)
+
+
+def _read_throughputs(path):
+    try:
+        with open(path, 'r') as throughput_file:
+            throughputs = json.load(throughput_file)
+        return throughputs if isinstance(throughputs, dict) else {}
+    except (OSError, IOError, ValueError):
+        return {}
+
+
+def get_thread_throughput(cli_ctx, direction):
+    """Get the bytes per second of a thread measured during the previous transfers.
+    :param str direction: 'upload' or 'download'.
+    :returns: int - the throughput, None if it was never measured.
+    """
+    return _read_throughputs(os.path.join(_transfers_dir(cli_ctx), THROUGHPUT_FILE)).get(direction)
+
+
+def record_thread_throughput(cli_ctx, direction, throughput):
+    """Average the bytes per second of a thread measured during a transfer with the previous measurements."""
+    path = os.path.join(_transfers_dir(cli_ctx), THROUGHPUT_FILE)
+    throughputs = _read_throughputs(path)
+    previous = throughputs.get(direction)
+    throughputs[direction] = int((previous + throughput) / 2 if previous else throughput)
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with atomic_write(path) as throughput_file:
+            json.dump(throughputs, throughput_file)
+    except (OSError, IOError) as ex:
+        logger.debug("Unable to save the transfer throughput '%s': %s", path, ex)
+
+
+class TransferJournal(object):
+    """
+    Append-only record of the files of a transfer which completed. It is kept until the whole transfer succeeds, so
+    an interrupted transfer can be resumed without transferring these files again.
+    """
+
+    def __init__(self, path, header):
+        self.path = path
+        self.header = header
+        self.completed = set()
+        self._lock = threading.Lock()
+        self._file = None
+
+    @classmethod
+    def for_transfer(cls, cli_ctx, direction, account_name, source_path, destination_path):
+        header = {'direction': direction, 'account': account_name,
+                  'source': source_path, 'destination': destination_path}
+        key = hashlib.sha256(json.dumps(header, sort_keys=True).encode('utf-8')).hexdigest()
+        return cls(os.path.join(_transfers_dir(cli_ctx), key + '.journal'), header)
+
+    @property
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Read the files recorded by an interrupted transfer. A line truncated by the interruption is ignored."""
+        self.completed = set()
+        try:
+            with open(self.path, 'r') as journal_file:
+                next(journal_file, None)
+                for line in journal_file:
+                    try:
+                        src, dst = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.completed.add((src, dst))
+        except (OSError, IOError):
+            pass
+        return self.completed
+
+    def is_completed(self, src, dst):
+        return (str(src), str(dst)) in self.completed
+
+    def record(self, src, dst):
+        entry = (str(src), str(dst))
+        with self._lock:
+            if self._file is None:
+                if not os.path.isdir(os.path.dirname(self.path)):
+                    os.makedirs(os.path.dirname(self.path))
+                is_new = not os.path.exists(self.path)
+                self._file = open(self.path, 'a')
+                if is_new:
+                    self._file.write(json.dumps(self.header) + '\n')
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+            self.completed.add(entry)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class TransferProgress(object):
+    """Progress callback of a transfer, which also reports the bytes and files transferred per second."""
+
+    def __init__(self, cli_ctx, callback=None):
+        self._hook = None if callback else cli_ctx.get_progress_controller(det=True)
+        self._callback = callback
+        self._lock = threading.Lock()
+        self.files = 0
+        self.total_files = 0
+        self.bytes = 0
+        self.start_time = time.time()
+
+    def start(self, total_files):
+        self.total_files = total_files
+        self.start_time = time.time()
+
+    def file_completed(self):
+        with self._lock:
+            self.files += 1
+
+    @property
+    def elapsed(self):
+        return max(time.time() - self.start_time, 0.001)
+
+    def message(self):
+        return '{}/{} files, {:.1f} MiB/s, {:.1f} files/s'.format(
+            self.files, self.total_files, self.bytes / self.elapsed / 1024 / 1024, self.files / self.elapsed)
+
+    def __call__(self, current, total):
+        self.bytes = current
+        if self._callback:
+            self._callback(current, total)
+        elif total:
+            self._hook.add(message=self.message(), value=current, total_val=total)
+
+    def end(self):
+        if self._hook:
+            self._hook.end()
+
+
+class PlannedTransferClient(ADLTransferClient):
+    """
+    Transfer client which plans the transfer once all its files are submitted, skips the files recorded as completed
+    by the journal of an interrupted transfer, and records the completed files in the journal.
+    """
+
+    def __init__(self, adlfs, journal, progress, **kwargs):
+        super(PlannedTransferClient, self).__init__(adlfs, progress_callback=progress, **kwargs)
+        self._journal = journal
+        self._progress = progress
+        self._submitted = []
+        self.skipped_files = 0
+
+    def submit(self, src, dst, length):
+        if self._journal.is_completed(src, dst):
+            self.skipped_files += 1
+        else:
+            self._submitted.append((src, dst, length))
+
+    def plan(self, thread_count=None, chunk_size=None, throughput=None):
+        """Choose the parallelism and chunk size, then split the submitted files into chunks."""
+        self._nthreads, self._chunksize = plan_transfer([length for _, _, length in self._submitted],
+                                                        self._buffersize, self._blocksize,
+                                                        thread_count, chunk_size, throughput)
+        logger.info('Transferring %d files with %d threads and chunks of %d bytes',
+                    len(self._submitted), self._nthreads, self._chunksize)
+        # the large files start first, so the small ones fill the threads which become idle at the end
+        for src, dst, length in sorted(self._submitted, key=lambda f: f[2], reverse=True):
+            super(PlannedTransferClient, self).submit(src, dst, length)
+        self._progress.start(len(self._submitted))
+        self._submitted = []
+
+    @property
+    def thread_count(self):
+        return self._nthreads
+
+    @property
+    def total_bytes(self):
+        return self._transfer_total_bytes
+
+    def _update(self, future):
+        if future in self._cfutures:
+            parent = self._chunks[self._cfutures[future]]['parent']
+        else:
+            parent = self._ffutures.get(future)
+        super(PlannedTransferClient, self)._update(future)
+        if parent and self._fstates[parent] == 'finished':
+            self._journal.record(*parent)
+            self._progress.file_completed()
@@ -27,17 +27,6 @@ from azure.cli.core.profiles import ResourceType
 logger = get_logger(__name__)
 
 
-def get_update_progress(cli_ctx):
-
-    def _update_progress(current, total):
-        hook = cli_ctx.get_progress_controller(det=True)
-        if total:
-            hook.add(message='Alive', value=current, total_val=total)
-            if total == current:
-                hook.end()
-    return _update_progress
-
-
 # region account
 def list_adls_account(client, resource_group_name=None):
     account_list = client.list_by_resource_group(resource_group_name=resource_group_name) \
@@ -176,18 +165,9 @@ def append_adls_item(cmd, account_name, path, content):
 
 
 def upload_to_adls(cmd, account_name, source_path, destination_path, chunk_size, buffer_size, block_size,
-                   thread_count=None, overwrite=False, progress_callback=None):
-    client = cf_dls_filesystem(cmd.cli_ctx, account_name)
-    ADLUploader(
-        client,
-        destination_path,
-        source_path,
-        thread_count,
-        chunksize=chunk_size,
-        buffersize=buffer_size,
-        blocksize=block_size,
-        overwrite=overwrite,
-        progress_callback=progress_callback or get_update_progress(cmd.cli_ctx))
+                   thread_count=None, overwrite=False, resume=False, progress_callback=None):
+    _transfer_adls(cmd.cli_ctx, ADLUploader, account_name, source_path, destination_path, chunk_size, buffer_size,
+                   block_size, thread_count, overwrite, resume, progress_callback)
 
 
 def remove_adls_item(cmd, account_name, path, recurse=False):
@@ -195,18 +175,62 @@ def remove_adls_item(cmd, account_name, path, recurse=False):
 
 
 def download_from_adls(cmd, account_name, source_path, destination_path, chunk_size, buffer_size, block_size,
-                       thread_count=None, overwrite=False, progress_callback=None):
-    client = cf_dls_filesystem(cmd.cli_ctx, account_name)
-    ADLDownloader(
-        client,
-        source_path,
-        destination_path,
-        thread_count,
-        chunksize=chunk_size,
-        buffersize=buffer_size,
-        blocksize=block_size,
-        overwrite=overwrite,
-        progress_callback=progress_callback or get_update_progress(cmd.cli_ctx))
+                       thread_count=None, overwrite=False, resume=False, progress_callback=None):
+    _transfer_adls(cmd.cli_ctx, ADLDownloader, account_name, source_path, destination_path, chunk_size, buffer_size,
+                   block_size, thread_count, overwrite, resume, progress_callback)
+
+
+def _transfer_adls(cli_ctx, transfer_type, account_name, source_path, destination_path, chunk_size, buffer_size,
+                   block_size, thread_count, overwrite, resume, progress_callback):
+    from azure.datalake.store.exceptions import DatalakeIncompleteTransferException
+    from azure.datalake.store.multithread import get_chunk, put_chunk, merge_chunks
+    from azure.cli.command_modules.dls._transfer import (
+        TransferJournal, TransferProgress, PlannedTransferClient, get_thread_throughput, record_thread_throughput,
+        MIN_MEASURED_BYTES, MAX_CHUNK_SIZE)
+
+    client = cf_dls_filesystem(cli_ctx, account_name)
+    if transfer_type is ADLUploader:
+        direction, rpath, lpath = 'upload', destination_path, source_path
+        transfer_kwargs = {'transfer': put_chunk, 'merge': merge_chunks}
+    else:
+        direction, rpath, lpath = 'download', source_path, destination_path
+        transfer_kwargs = {'transfer': get_chunk, 'chunked': False}
+
+    journal = TransferJournal.for_transfer(cli_ctx, direction, account_name, source_path, destination_path)
+    if resume and journal.exists:
+        logger.warning('Resuming the transfer, skipping %d files already transferred.', len(journal.load()))
+        # the remaining files were written, at least partially, by the interrupted transfer
+        overwrite = True
+    else:
+        journal.remove()
+
+    progress = TransferProgress(cli_ctx, progress_callback)
+    transfer_client = PlannedTransferClient(client, journal, progress, nthreads=thread_count,
+                                            chunksize=chunk_size or MAX_CHUNK_SIZE, buffersize=buffer_size,
+                                            blocksize=block_size, **transfer_kwargs)
+    transfer = transfer_type(client, rpath, lpath, client=transfer_client, run=False, overwrite=overwrite)
+    # merging and renaming the transferred files depend on the overwrite option of the transfer
+    transfer_client._parent = transfer  # pylint: disable=protected-access
+    throughput = get_thread_throughput(cli_ctx, direction)
+    transfer_client.plan(thread_count, chunk_size, throughput)
+
+    try:
+        transfer.run()
+    except (DatalakeIncompleteTransferException, KeyboardInterrupt):
+        if journal.completed:
+            logger.warning("The transfer is incomplete. Run the command again with '--resume' to transfer only "
+                           "the files which did not complete.")
+        raise
+    finally:
+        progress.end()
+        journal.close()
+    journal.remove()
+
+    if progress.bytes >= MIN_MEASURED_BYTES:
+        record_thread_throughput(cli_ctx, direction, progress.bytes / progress.elapsed / transfer_client.thread_count)
+    logger.warning('Transferred %d files (%d bytes) in %.1f seconds: %.1f MiB/s, %.1f files/s.',
+                   progress.files, progress.bytes, progress.elapsed,
+                   progress.bytes / progress.elapsed / 1024 / 1024, progress.files / progress.elapsed)
 
 
 def test_adls_item(cmd, account_name, path):
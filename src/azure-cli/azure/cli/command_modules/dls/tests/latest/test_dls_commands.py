@@ -8,8 +8,12 @@ from __future__ import print_function
 
 import datetime
 import os
+import tempfile
 import time
+import unittest
 from shutil import rmtree
+
+import mock
 from msrestazure.azure_exceptions import CloudError
 
 from azure.cli.testsdk import ScenarioTest, ResourceGroupPreparer, LiveScenarioTest
@@ -17,6 +21,12 @@ from azure_devtools.scenario_tests import AllowLargeResponse
 
 from knack.util import CLIError
 
+from azure.datalake.store.exceptions import DatalakeIncompleteTransferException
+from azure.cli.command_modules.dls._transfer import (plan_transfer, TransferJournal, TransferProgress,
+                                                     PlannedTransferClient, MAX_CHUNK_SIZE)
+
+_MB = 1024 * 1024
+
 
 class DataLakeStoreFileAccessScenarioTest(ScenarioTest):
 
@@ -444,3 +454,62 @@ class DataLakeStoreAccountScenarioTest(ScenarioTest):
             self.check('type(@)', 'array'),
             self.check('length(@)', 0),
         ])
+
+
+class DataLakeStoreTransferPlanTest(unittest.TestCase):
+
+    @mock.patch('multiprocessing.cpu_count', return_value=4)
+    def test_dls_plan_transfer(self, _):
+        # mostly small files: more threads so the latencies of their requests overlap
+        self.assertEqual(plan_transfer([_MB] * 1000, 4 * _MB, 4 * _MB), (16, MAX_CHUNK_SIZE))
+        self.assertEqual(plan_transfer([_MB] * 3, 4 * _MB, 4 * _MB), (3, MAX_CHUNK_SIZE))
+        # large files: chunks small enough to give each thread a few of them
+        self.assertEqual(plan_transfer([1024 * _MB] * 2, 4 * _MB, 4 * _MB), (4, 128 * _MB))
+        self.assertEqual(plan_transfer([100 * 1024 * _MB], 4 * _MB, 4 * _MB), (4, MAX_CHUNK_SIZE))
+        # a chunk shouldn't take more than a minute at the measured throughput
+        self.assertEqual(plan_transfer([100 * 1024 * _MB], 4 * _MB, 4 * _MB, throughput=_MB), (4, 60 * _MB))
+        # the values given by the user are kept
+        self.assertEqual(plan_transfer([_MB] * 1000, 4 * _MB, 4 * _MB, thread_count=2, chunk_size=8 * _MB),
+                         (2, 8 * _MB))
+
+    def test_dls_resume_transfer(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(rmtree, temp_dir, ignore_errors=True)
+        cli_ctx = mock.MagicMock()
+        cli_ctx.config.config_dir = temp_dir
+        transferred = []
+        failing = ['file3']
+
+        def _transfer(adlfs, src, dst, offset, size, buffersize, blocksize, shutdown_event=None):
+            transferred.append(src)
+            if src in failing:
+                return 0, IOError('connection reset')
+            return size, None
+
+        def _run_transfer(resume):
+            journal = TransferJournal.for_transfer(cli_ctx, 'upload', 'myadls', 'local', '/remote')
+            if resume:
+                journal.load()
+            progress = TransferProgress(cli_ctx, callback=mock.Mock())
+            client = PlannedTransferClient(None, journal, progress, transfer=_transfer, chunked=False,
+                                           buffersize=4 * _MB, blocksize=4 * _MB)
+            for i in range(5):
+                client.submit('file{}'.format(i), '/remote/file{}'.format(i), (i + 1) * _MB)
+            client.plan(thread_count=2)
+            try:
+                client.run()
+            finally:
+                journal.close()
+            return journal, progress
+
+        with self.assertRaises(DatalakeIncompleteTransferException):
+            _run_transfer(resume=False)
+        # the large files are transferred first
+        self.assertEqual(transferred[0], 'file4')
+
+        del transferred[:]
+        del failing[:]
+        journal, progress = _run_transfer(resume=True)
+        self.assertEqual(transferred, ['file3'])
+        self.assertEqual((progress.files, progress.bytes), (1, 4 * _MB))
+        self.assertEqual(len(journal.load()), 5)
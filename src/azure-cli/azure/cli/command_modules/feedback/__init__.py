@@ -20,11 +20,21 @@ class FeedbackCommandsLoader(AzCommandsLoader):
         with self.command_group('', custom_feedback) as g:
             g.command('feedback', 'handle_feedback')
 
+        with self.command_group('command-log', custom_feedback) as g:
+            g.command('list', 'list_command_logs')
+            g.command('show', 'show_command_log')
+
         return self.command_table
 
     def load_arguments(self, command):
         with self.argument_context('feedback') as c:
             c.ignore('_subscription')  # hide global subscription param
 
+        with self.argument_context('command-log') as c:
+            c.ignore('_subscription')
+
+        with self.argument_context('command-log show') as c:
+            c.argument('log_name', options_list=['--name', '-n'], help="Name of the logged command, as shown by 'az command-log list'.")
+
 
 COMMAND_LOADER_CLS = FeedbackCommandsLoader
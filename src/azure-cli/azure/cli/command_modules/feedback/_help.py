@@ -11,3 +11,25 @@ helps['feedback'] = """
 type: command
 short-summary: Send feedback to the Azure CLI Team!
 """
+
+helps['command-log'] = """
+type: group
+short-summary: Inspect the log of recently run commands.
+long-summary: The records of the recent commands are kept in a bounded log in the 'commands' folder of the Azure CLI configuration directory. Disable it with 'az configure'.
+"""
+
+helps['command-log list'] = """
+type: command
+short-summary: List the logged commands, oldest first.
+examples:
+  - name: List the commands which failed.
+    text: az command-log list --query "[?status=='FAILURE']"
+"""
+
+helps['command-log show'] = """
+type: command
+short-summary: Show the log records of one command.
+examples:
+  - name: Show the log of the last command.
+    text: az command-log show -n $(az command-log list --query "[-1].name" -o tsv)
+"""
@@ -23,7 +23,7 @@ from knack.util import CLIError
 
 from azure.cli.core.extension._resolve import resolve_project_url_from_index, NoExtensionCandidatesError
 from azure.cli.core.util import get_az_version_string, open_page_in_browser, can_launch_browser, in_cloud_console
-from azure.cli.core.azlogging import _UNKNOWN_COMMAND, _CMD_LOG_LINE_PREFIX
+from azure.cli.core.azlogging import _UNKNOWN_COMMAND, _CMD_LOG_LINE_PREFIX, read_command_log_entry
 from azure.cli.core.commands.constants import SURVEY_PROMPT
 
 _ONE_MIN_IN_SECS = 60
@@ -112,7 +112,11 @@ class CommandLogFile(object):
     _LogRecordType = namedtuple("LogRecord", ["p_id", "date_time", "level", "logger", "log_msg"])
     UNKNOWN_CMD = "Unknown"
 
-    def __init__(self, log_file_path, time_now=None):
+    def __init__(self, log_file_path, time_now=None, log_entry=None):
+        """
+        :param log_file_path: the command log file, or the segment of the command log holding log_entry.
+        :param log_entry: the azure.cli.core.azlogging.CommandLogEntry of the command, if it is in the command log.
+        """
 
         if (time_now is not None) and (not isinstance(time_now, datetime.datetime)):
             raise TypeError("Expected type {} for time_now, instead received {}.".format(datetime.datetime, type(time_now)))  # pylint: disable=line-too-long
@@ -122,6 +126,7 @@ class CommandLogFile(object):
 
         self._command_name = None
         self._log_file_path = log_file_path
+        self._log_entry = log_entry
 
         if time_now is None:
             self._time_now = datetime.datetime.now()
@@ -135,6 +140,12 @@ class CommandLogFile(object):
     def metadata_tup(self):
         return self._metadata
 
+    @property
+    def log_name(self):
+        if self._log_entry:
+            return self._log_entry.name
+        return os.path.splitext(os.path.basename(self._log_file_path))[0]
+
     @property
     def command_data_dict(self):
         if not self._data:
@@ -212,8 +223,7 @@ class CommandLogFile(object):
         time_now = datetime.datetime.now() if not self._time_now else self._time_now
 
         try:
-            _, file_name = os.path.split(self._log_file_path)
-            poss_date, poss_time, poss_command, poss_pid, _ = file_name.split(".")
+            poss_date, poss_time, poss_command, poss_pid = self.log_name.split(".")
             date_time_stamp = datetime.datetime.strptime("{}-{}".format(poss_date, poss_time), "%Y-%m-%d-%H-%M-%S")
             command = "az " + poss_command.replace("_", " ") if poss_command != _UNKNOWN_COMMAND else self.UNKNOWN_CMD  # pylint: disable=line-too-long
         except ValueError as e:
@@ -227,34 +237,41 @@ class CommandLogFile(object):
 
         return _LogMetadataType(cmd=command, seconds_ago=total_seconds, file_path=self._log_file_path, p_id=int(poss_pid))  # pylint: disable=line-too-long
 
-    def _get_command_data_from_metadata(self):  # pylint: disable=too-many-statements
-        def _get_log_record_list(log_fp, p_id):
-            """
-             Get list of records / messages in the log file
-            :param log_fp: log file object
-            :param p_id: process id of command
-            :return:
-            """
-            prev_record = None
-            log_record_list = []
-            for line in log_fp:
-                # attempt to extract log data
-                log_record = CommandLogFile._get_info_from_log_line(line, p_id)
-
-                if log_record:  # if new record parsed, add old record to the list
-                    if prev_record:
-                        log_record_list.append(prev_record)
-                    prev_record = log_record
-                elif prev_record:  # otherwise this is a continuation of a log record, add to prev record
-                    new_log_msg = prev_record.log_msg + line
-                    prev_record = CommandLogFile._LogRecordType(p_id=prev_record.p_id, date_time=prev_record.date_time,
-                                                                # pylint: disable=line-too-long
-                                                                level=prev_record.level, logger=prev_record.logger,
-                                                                log_msg=new_log_msg)
-            if prev_record:
-                log_record_list.append(prev_record)
-            return log_record_list
+    def get_log_records(self):
+        """
+        Get list of records / messages in the log of the command
+        :return: list of LogRecord
+        """
+        if not self.metadata_tup:
+            return []
 
+        p_id = self.metadata_tup.p_id
+        prev_record = None
+        log_record_list = []
+        for line in self._read_log_lines():
+            # attempt to extract log data
+            log_record = CommandLogFile._get_info_from_log_line(line, p_id)
+
+            if log_record:  # if new record parsed, add old record to the list
+                if prev_record:
+                    log_record_list.append(prev_record)
+                prev_record = log_record
+            elif prev_record:  # otherwise this is a continuation of a log record, add to prev record
+                new_log_msg = prev_record.log_msg + line
+                prev_record = CommandLogFile._LogRecordType(p_id=prev_record.p_id, date_time=prev_record.date_time,
+                                                            level=prev_record.level, logger=prev_record.logger,
+                                                            log_msg=new_log_msg)
+        if prev_record:
+            log_record_list.append(prev_record)
+        return log_record_list
+
+    def _read_log_lines(self):
+        if self._log_entry:
+            return read_command_log_entry(self._log_entry)
+        with open(self._log_file_path, 'r') as log_fp:
+            return log_fp.readlines()
+
+    def _get_command_data_from_metadata(self):  # pylint: disable=too-many-statements
         if not self.metadata_tup:
             return {}
 
@@ -262,11 +279,9 @@ class CommandLogFile(object):
         _EXT_VERS_PREFIX = "extension version:"
 
         file_name = self.metadata_tup.file_path
-        p_id = self.metadata_tup.p_id
 
         try:
-            with open(file_name, 'r') as log_fp:
-                log_record_list = _get_log_record_list(log_fp, p_id)
+            log_record_list = self.get_log_records()
         except IOError:
             logger.debug("Failed to open command log file %s", file_name)
             return {}
@@ -643,20 +658,18 @@ def _get_az_version_summary():
 
 
 def _get_command_log_files(cli_ctx, time_now=None):
-    command_logs_dir = cli_ctx.logging.get_command_log_dir()
-    files = os.listdir(command_logs_dir)
-    files = (file_name for file_name in files if file_name.endswith(".log"))
-    files = sorted(files)
     command_log_files = []
-    for file_name in files:
-        file_path = os.path.join(command_logs_dir, file_name)
-        cmd_log_file = CommandLogFile(file_path, time_now)
+    for entry in cli_ctx.logging.get_command_log().entries():
+        if os.path.isfile(entry.segment_path):
+            command_log_files.append(CommandLogFile(entry.segment_path, time_now, log_entry=entry))
 
+    valid_log_files = []
+    for cmd_log_file in command_log_files:
         if cmd_log_file.metadata_tup:
-            command_log_files.append(cmd_log_file)
+            valid_log_files.append(cmd_log_file)
         else:
-            logger.debug("%s is an invalid command log file.", file_path)
-    return command_log_files
+            logger.debug("%s is an invalid command log.", cmd_log_file.log_name)
+    return valid_log_files
 
 
 def _display_recent_commands(cmd):
@@ -764,3 +777,23 @@ def handle_feedback(cmd):
         raise CLIError('This command is interactive, however no tty is available.')
     except (EOFError, KeyboardInterrupt):
         print()
+
+
+def list_command_logs(cmd):
+    result = []
+    for log_file in _get_command_log_files(cmd.cli_ctx):
+        result.append({
+            'name': log_file.log_name,
+            'command': log_file.get_command_name_str(),
+            'status': log_file.get_command_status(),
+            'secondsAgo': int(log_file.metadata_tup.seconds_ago)
+        })
+    return result
+
+
+def show_command_log(cmd, log_name):
+    for log_file in _get_command_log_files(cmd.cli_ctx):
+        if log_file.log_name == log_name:
+            return [{'time': record.date_time, 'level': record.level, 'logger': record.logger,
+                     'message': record.log_msg.rstrip('\n')} for record in log_file.get_log_records()]
+    raise CLIError("Command log '{}' not found. Use 'az command-log list' to see the logged commands.".format(log_name))
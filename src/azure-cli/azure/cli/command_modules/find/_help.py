@@ -10,6 +10,10 @@ from knack.help_files import helps  # pylint: disable=unused-import
 helps['find'] = """
 type: command
 short-summary: I'm an AI robot, my advice is based on our Azure documentation as well as the usage patterns of Azure CLI and Azure ARM users. Using me improves Azure products and documentation.
+long-summary: >
+    By default the search runs offline against the commands, summaries and examples of this installation. The local
+    index is kept in the configuration directory and rebuilt when commands or extensions change. Use --source to
+    search the online examples service instead or as well.
 examples:
   - name: Give me any Azure CLI group and I’ll show the most popular commands within the group.
     text: |
@@ -20,4 +24,7 @@ examples:
   - name: You can also enter a search term, and I'll try to help find the best commands.
     text: |
         az find "arm template"
+  - name: Also ask the online examples service and merge its answers with the local ones.
+    text: |
+        az find "arm template" --source all
 """
@@ -3,7 +3,12 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+from azure.cli.core.commands.parameters import get_enum_type
+
 
 def load_arguments(self, _):
     with self.argument_context('find') as c:
         c.positional('cli_term', help='An Azure CLI command or group for which you need an example.')
+        c.argument('source', arg_type=get_enum_type(['local', 'remote', 'all']),
+                   help='Where to look for examples: the commands and help installed locally, the online examples '
+                        'service, or both merged.')
@@ -28,37 +28,61 @@ EXTENSION_NAME = 'find'
 
 Example = namedtuple("Example", "title snippet")
 
+_FIND_INDEX_FILE_NAME = 'findIndex.json'
+_FIND_INDEX_VERSION = 1
+_MAX_LOCAL_RESULTS = 5
+_MAX_FUZZY_TERMS = 5
+_FIELD_WEIGHTS = {'command': 3.0, 'summary': 2.0, 'examples': 1.0, 'long-summary': 0.5}
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+_STOP_WORDS = {'az', 'an', 'the', 'to', 'of', 'in', 'for', 'and', 'or', 'with', 'on', 'by', 'from', 'is', 'my',
+               'how', 'do', 'can', 'it', 'as', 'at', 'be'}
 
-def process_query(cli_term):
+
+def process_query(cmd, cli_term, source='local'):
     if not cli_term:
         logger.error('Please provide a search term e.g. az find "vm"')
     else:
         print(random.choice(WAIT_MESSAGE), file=sys.stderr)
-        response = call_aladdin_service(cli_term)
+        answers = []
+        has_pruned_answer = False
+        remote_failed = False
+        if source in ('local', 'all'):
+            answers.extend(search_local_index(cmd.cli_ctx, cli_term))
 
-        if response.status_code != 200:
-            logger.error('[?] Unexpected Error: [HTTP %s]: Content: %s', response.status_code, response.content)
-        else:
-            if (platform.system() == 'Windows' and should_enable_styling()):
-                colorama.init(convert=True)
-            has_pruned_answer = False
-            answer_list = json.loads(response.content)
-            if not answer_list:
-                print("\nSorry I am not able to help with [" + cli_term + "]."
-                      "\nTry typing the beginning of a command e.g. " + style_message('az vm') + ".", file=sys.stderr)
+        if source in ('remote', 'all'):
+            response = call_aladdin_service(cli_term)
+            if response.status_code != 200:
+                remote_failed = True
+                logger.error('[?] Unexpected Error: [HTTP %s]: Content: %s', response.status_code, response.content)
             else:
-                if answer_list[0]['source'] == 'pruned':
+                answer_list = json.loads(response.content)
+                if answer_list and answer_list[0]['source'] == 'pruned':
                     has_pruned_answer = True
                     answer_list.pop(0)
-                print("\nHere are the most common ways to use [" + cli_term + "]: \n", file=sys.stderr)
-
+                local_snippets = {answer.snippet for answer in answers}
                 for answer in answer_list:
                     cleaned_answer = clean_from_http_answer(answer)
-                    print(style_message(cleaned_answer.title))
-                    print(cleaned_answer.snippet + '\n')
-                if has_pruned_answer:
-                    print(style_message("More commands and examples are available in the latest version of the CLI. "
-                                        "Please update for the best experience.\n"))
+                    if cleaned_answer.snippet not in local_snippets:
+                        answers.append(cleaned_answer)
+
+        if (platform.system() == 'Windows' and should_enable_styling()):
+            colorama.init(convert=True)
+        if not answers:
+            if not remote_failed:
+                print("\nSorry I am not able to help with [" + cli_term + "]."
+                      "\nTry typing the beginning of a command e.g. " + style_message('az vm') + ".", file=sys.stderr)
+                if source == 'local':
+                    print("You can also search the online examples with " +
+                          style_message('az find "{}" --source remote'.format(cli_term)) + ".", file=sys.stderr)
+        else:
+            print("\nHere are the most common ways to use [" + cli_term + "]: \n", file=sys.stderr)
+
+            for answer in answers:
+                print(style_message(answer.title))
+                print(answer.snippet + '\n')
+            if has_pruned_answer:
+                print(style_message("More commands and examples are available in the latest version of the CLI. "
+                                    "Please update for the best experience.\n"))
     print(SURVEY_PROMPT)
 
 
@@ -130,3 +154,134 @@ def clean_from_http_answer(http_answer):
     current_snippet = current_snippet.replace('```', '').replace(current_title, '').strip()
     current_snippet = re.sub(r'\[.*\]', '', current_snippet).strip()
     return Example(current_title, current_snippet)
+
+
+def search_local_index(cli_ctx, cli_term):
+    """ Search the commands and help of this installation, see CommandSearchIndex. """
+    return CommandSearchIndex.load(cli_ctx).search(cli_term)
+
+
+def _tokenize(text):
+    return [t for t in _TOKEN_PATTERN.findall((text or '').lower()) if len(t) > 1 and t not in _STOP_WORDS]
+
+
+class CommandSearchIndex(object):
+    """ Inverted index over the command names, summaries and examples of the loaded command table.
+
+    The index is cached in the configuration directory and rebuilt when the set of commands or their help text
+    changes, e.g. after an upgrade or when an extension is added or removed.
+    """
+
+    def __init__(self, documents, postings):
+        self.documents = documents
+        self.postings = postings
+        self._vocabulary = None
+
+    @classmethod
+    def load(cls, cli_ctx):
+        import os
+        from azure.cli.core._environment import get_config_dir
+
+        path = os.path.join(get_config_dir(), _FIND_INDEX_FILE_NAME)
+        # the command table is truncated to the running command, the loader map still has every command
+        commands = sorted(cli_ctx.invocation.commands_loader.cmd_to_loader_map)
+        fingerprint = cls._fingerprint(commands)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == _FIND_INDEX_VERSION and data.get('fingerprint') == fingerprint:
+                return cls(data['documents'], data['postings'])
+        except (OSError, IOError, ValueError) as ex:
+            logger.debug("Rebuilding the local search index '%s': %s", path, ex)
+
+        index = cls.build(commands)
+        try:
+            from azure.cli.core.util import atomic_write
+            with atomic_write(path) as f:
+                json.dump({'version': _FIND_INDEX_VERSION, 'fingerprint': fingerprint,
+                           'documents': index.documents, 'postings': index.postings}, f)
+        except (OSError, IOError) as ex:
+            logger.debug("Unable to save the local search index '%s': %s", path, ex)
+        return index
+
+    @staticmethod
+    def _fingerprint(commands):
+        import hashlib
+        from knack.help_files import helps
+        digest = hashlib.sha256()
+        for name in commands:
+            digest.update(name.encode('utf-8'))
+            digest.update((helps.get(name) or '').encode('utf-8'))
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, commands):
+        from knack.help_files import _load_help_file
+
+        documents, postings = [], {}
+        for doc_id, name in enumerate(commands):
+            try:
+                data = _load_help_file(name)
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.debug("Unable to read the help of '%s': %s", name, ex)
+                data = None
+            data = data if isinstance(data, dict) else {}
+            summary = data.get('short-summary') or ''
+            examples = [[e.get('name', ''), e.get('text', '').strip()] for e in data.get('examples') or []
+                        if isinstance(e, dict) and e.get('text')]
+            documents.append({'command': name, 'summary': summary.strip(), 'examples': examples})
+
+            weights = {}
+            fields = [(name, _FIELD_WEIGHTS['command']), (summary, _FIELD_WEIGHTS['summary']),
+                      (data.get('long-summary'), _FIELD_WEIGHTS['long-summary'])]
+            fields.extend((title, _FIELD_WEIGHTS['examples']) for title, _ in examples)
+            for text, weight in fields:
+                for token in _tokenize(text):
+                    weights[token] = weights.get(token, 0) + weight
+            for token, weight in weights.items():
+                postings.setdefault(token, []).append([doc_id, weight])
+        return cls(documents, postings)
+
+    def _expand(self, token):
+        """ Index terms a query token stands for, with the weight of the match. """
+        import difflib
+        if token in self.postings:
+            return [(token, 1.0)]
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        if len(token) >= 3:
+            prefixed = [t for t in self._vocabulary if t.startswith(token)][:_MAX_FUZZY_TERMS]
+            if prefixed:
+                return [(t, 0.5) for t in prefixed]
+        return [(t, 0.5) for t in difflib.get_close_matches(token, self._vocabulary, n=_MAX_FUZZY_TERMS, cutoff=0.8)]
+
+    def search(self, cli_term, top=_MAX_LOCAL_RESULTS):
+        """ Rank the commands for a search term and return an Example for each of the best ones. """
+        import math
+        term = cli_term.strip().lower()
+        if term.startswith('az '):
+            term = term[3:].strip()
+
+        scores = {}
+        for token in set(_tokenize(term)):
+            for index_term, weight in self._expand(token):
+                matches = self.postings[index_term]
+                idf = math.log(1 + len(self.documents) / float(len(matches)))
+                for doc_id, term_weight in matches:
+                    scores[doc_id] = scores.get(doc_id, 0) + weight * term_weight * idf
+        for doc_id in list(scores):
+            # a command or group typed as is ranks its own commands first
+            command = self.documents[doc_id]['command']
+            if command == term or command.startswith(term + ' '):
+                scores[doc_id] += 100 if command == term else 50
+
+        ranked = sorted(scores, key=lambda d: (-scores[d], self.documents[d]['command']))[:top]
+        answers = []
+        for doc_id in ranked:
+            document = self.documents[doc_id]
+            if document['examples']:
+                title, snippet = document['examples'][0]
+                answers.append(Example(title or document['summary'], snippet))
+            else:
+                answers.append(Example(document['summary'] or document['command'], 'az ' + document['command']))
+        return answers
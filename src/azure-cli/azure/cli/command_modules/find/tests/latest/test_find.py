@@ -4,13 +4,43 @@
 # --------------------------------------------------------------------------------------------
 
 import json
+import shutil
+import tempfile
 import unittest
 import mock
 import requests
 
-from azure.cli.command_modules.find.custom import (Example, call_aladdin_service,
+from azure.cli.command_modules.find.custom import (Example, call_aladdin_service, CommandSearchIndex,
                                                    get_generated_examples, clean_from_http_answer)
 
+TEST_HELPS = {
+    'network vnet': """
+type: group
+short-summary: Manage Azure Virtual Networks.
+""",
+    'network vnet create': """
+type: command
+short-summary: Create a virtual network.
+examples:
+  - name: Create a virtual network.
+    text: az network vnet create -g MyResourceGroup -n MyVnet
+""",
+    'storage account create': """
+type: command
+short-summary: Create a storage account.
+examples:
+  - name: Create a storage account with locally redundant storage.
+    text: az storage account create -n mystorageaccount -g MyResourceGroup --sku Standard_LRS
+""",
+    'aks create': """
+type: command
+short-summary: Create a new managed Kubernetes cluster.
+examples:
+  - name: Create a Kubernetes cluster with an existing SSH public key.
+    text: az aks create -g MyResourceGroup -n MyManagedCluster --ssh-key-value /path/to/publickey
+"""
+}
+
 
 def create_valid_http_response():
     mock_response = requests.Response()
@@ -78,5 +108,50 @@ class FindCustomCommandTest(unittest.TestCase):
             self.assertEqual(0, len(examples))
 
 
+class CommandSearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir, ignore_errors=True)
+        for target, kwargs in [('knack.help_files.helps', {'new': TEST_HELPS}),
+                               ('azure.cli.core._environment.get_config_dir', {'return_value': self.config_dir})]:
+            patcher = mock.patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.index = CommandSearchIndex.build(sorted(TEST_HELPS) + ['storage account list'])
+
+    def test_search_ranks_matching_commands(self):
+        answers = self.index.search('create virtual network')
+        self.assertEqual(answers[0], Example('Create a virtual network.',
+                                             'az network vnet create -g MyResourceGroup -n MyVnet'))
+
+    def test_search_matches_group_and_typos(self):
+        answers = self.index.search('az storage')
+        self.assertEqual(len(answers), 2)
+        self.assertTrue(all(a.snippet.startswith('az storage account') for a in answers))
+        # a command without help is still found by its name
+        self.assertIn(Example('storage account list', 'az storage account list'), answers)
+
+        answers = self.index.search('kubernets cluster')
+        self.assertTrue(answers[0].snippet.startswith('az aks create'))
+
+    def test_search_without_match(self):
+        self.assertEqual(self.index.search('zzzz'), [])
+
+    def test_index_is_cached_until_commands_change(self):
+        cli_ctx = mock.MagicMock()
+        cli_ctx.invocation.commands_loader.cmd_to_loader_map = dict.fromkeys(TEST_HELPS)
+        with mock.patch.object(CommandSearchIndex, 'build', wraps=CommandSearchIndex.build) as build:
+            CommandSearchIndex.load(cli_ctx)
+            index = CommandSearchIndex.load(cli_ctx)
+            self.assertEqual(build.call_count, 1)
+            self.assertEqual(index.documents, CommandSearchIndex.build(sorted(TEST_HELPS)).documents)
+
+            cli_ctx.invocation.commands_loader.cmd_to_loader_map['storage account list'] = None
+            build.reset_mock()
+            CommandSearchIndex.load(cli_ctx)
+            self.assertEqual(build.call_count, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
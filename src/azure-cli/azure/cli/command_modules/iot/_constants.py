@@ -8,3 +8,5 @@ certificate_help = """For a detailed explanation of CA certificates in Azure IoT
 # AAD application Id
 CLIENT_ID = '822c8694-ad95-4735-9c55-256f7db2f9b4'
 PNP_ENDPOINT = 'https://provider.azureiotrepository.com'
+IOT_HUB_RESOURCE_TYPE = 'Microsoft.Devices/IotHubs'
+IOT_CENTRAL_RESOURCE_TYPE = 'Microsoft.IoTCentral/IoTApps'
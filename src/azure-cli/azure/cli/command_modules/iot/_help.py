@@ -472,6 +472,18 @@ examples:
         az iot hub list --resource-group MyGroup
 """
 
+helps['iot hub resolve-ids'] = """
+type: command
+short-summary: Resolve the resource IDs of IoT hubs by name.
+long-summary: >
+    The hubs of the subscription are listed once for all the names. The IDs are cached, so the commands given
+    the same hub names without their resource group don't list the hubs again.
+examples:
+  - name: Show the details of many IoT hubs.
+    text: >
+        az iot hub show --ids $(az iot hub resolve-ids --names MyIotHub1 MyIotHub2 --query [].id -o tsv)
+"""
+
 helps['iot hub list-skus'] = """
 type: command
 short-summary: List available pricing tiers.
@@ -173,6 +173,10 @@ def load_arguments(self, _):  # pylint: disable=too-many-statements
         with self.argument_context('iot hub {}'.format(subgroup)) as c:
             c.argument('hub_name', options_list=['--hub-name'])
 
+    with self.argument_context('iot hub resolve-ids') as c:
+        c.argument('hub_names', options_list=['--names'], nargs='+',
+                   help='Space-separated names of the IoT hubs.')
+
     with self.argument_context('iot hub route') as c:
         c.argument('route_name', options_list=['--route-name', '--name', '-n'], help='Name of the Route.')
         c.argument('endpoint_name', options_list=['--endpoint-name', '--endpoint', '--en'],
@@ -100,6 +100,7 @@ def load_command_table(self, _):  # pylint: disable=too-many-statements
     with self.command_group('iot hub', client_factory=iot_hub_service_factory) as g:
         g.custom_command('create', 'iot_hub_create')
         g.custom_command('list', 'iot_hub_list')
+        g.custom_command('resolve-ids', 'iot_hub_resolve_ids')
         g.custom_command('show-connection-string', 'iot_hub_show_connection_string')
         g.custom_show_command('show', 'iot_hub_get')
         g.generic_update_command('update', getter_name='iot_hub_get', setter_name='iot_hub_update',
@@ -8,7 +8,9 @@ from __future__ import print_function
 from enum import Enum
 from knack.log import get_logger
 from knack.util import CLIError
+from msrestazure.tools import parse_resource_id
 from azure.cli.core.commands import LongRunningOperation
+from azure.cli.core.commands.resource_ids import resolve_resource_id, resolve_resource_ids, invalidate_resource_id
 
 from azure.mgmt.iothub.models import (IotHubSku,
                                       AccessRights,
@@ -46,7 +48,7 @@ from azure.mgmt.iotcentral.models import (AppSkuInfo,
 from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.iot_hub_device_client import IotHubDeviceClient
 from azure.cli.command_modules.iot.sas_token_auth import SasTokenAuthentication
 from azure.cli.command_modules.iot.shared import EndpointType, EncodingFormat, RenewKeyType
-from ._constants import PNP_ENDPOINT
+from ._constants import PNP_ENDPOINT, IOT_HUB_RESOURCE_TYPE, IOT_CENTRAL_RESOURCE_TYPE
 from ._client_factory import resource_service_factory, get_pnp_client
 from ._utils import open_certificate, get_auth_header, generateKey
 
@@ -430,6 +432,7 @@ def iot_hub_create(cmd, client, hub_name, resource_group_name, location=None,
                                         sku=sku,
                                         properties=properties)
 
+    invalidate_resource_id(client.iot_hub_resource.config.subscription_id, IOT_HUB_RESOURCE_TYPE, hub_name)
     return client.iot_hub_resource.create_or_update(resource_group_name, hub_name, hub_description)
 
 
@@ -452,6 +455,16 @@ def iot_hub_get(cmd, client, hub_name, resource_group_name=None):
     return client.iot_hub_resource.get(resource_group_name, hub_name)
 
 
+def iot_hub_resolve_ids(client, hub_names):
+    subscription_id = client.iot_hub_resource.config.subscription_id
+    hub_ids = resolve_resource_ids(subscription_id, IOT_HUB_RESOURCE_TYPE, hub_names, lambda: iot_hub_list(client))
+    missing = [name for name, hub_id in hub_ids.items() if hub_id is None]
+    if missing:
+        logger.warning("No IoT Hub found with name %s in current subscription.", ', '.join(missing))
+    return [{'name': name, 'resourceGroup': parse_resource_id(hub_id)['resource_group'], 'id': hub_id}
+            for name, hub_id in hub_ids.items() if hub_id is not None]
+
+
 def iot_hub_list(client, resource_group_name=None):
     if resource_group_name is None:
         return client.iot_hub_resource.list_by_subscription()
@@ -518,6 +531,7 @@ def iot_hub_update(client, hub_name, parameters, resource_group_name=None):
 
 def iot_hub_delete(client, hub_name, resource_group_name=None):
     resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
+    invalidate_resource_id(client.iot_hub_resource.config.subscription_id, IOT_HUB_RESOURCE_TYPE, hub_name)
     return client.iot_hub_resource.delete(resource_group_name, hub_name)
 
 
@@ -530,21 +544,21 @@ def iot_hub_show_connection_string(client, hub_name=None, resource_group_name=No
             raise CLIError("No IoT Hub found.")
 
         def conn_str_getter(h):
-            return _get_hub_connection_string(client, h.name, h.additional_properties['resourcegroup'], policy_name, key_type, show_all)
+            return _get_hub_connection_string(client, h.name, h.additional_properties['resourcegroup'], policy_name, key_type, show_all, hub=h)
         return [{'name': h.name, 'connectionString': conn_str_getter(h)} for h in hubs]
     resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
     conn_str = _get_hub_connection_string(client, hub_name, resource_group_name, policy_name, key_type, show_all)
     return {'connectionString': conn_str if show_all else conn_str[0]}
 
 
-def _get_hub_connection_string(client, hub_name, resource_group_name, policy_name, key_type, show_all):
+def _get_hub_connection_string(client, hub_name, resource_group_name, policy_name, key_type, show_all, hub=None):
     policies = []
     if show_all:
         policies.extend(iot_hub_policy_list(client, hub_name, resource_group_name))
     else:
         policies.append(iot_hub_policy_get(client, hub_name, policy_name, resource_group_name))
     # Intermediate fix to support domains beyond azure-devices.netproperty
-    hub = _get_iot_hub_by_name(client, hub_name)
+    hub = hub or client.iot_hub_resource.get(resource_group_name, hub_name)
     hostname = hub.properties.host_name
     conn_str_template = 'HostName={};SharedAccessKeyName={};SharedAccessKey={}'
     return [conn_str_template.format(hostname,
@@ -988,14 +1002,24 @@ def _get_device_client(client, resource_group_name, hub_name, device_id):
 
 
 def _get_iot_hub_by_name(client, hub_name):
-    all_hubs = iot_hub_list(client)
-    if all_hubs is None:
-        raise CLIError("No IoT Hub found in current subscription.")
+    from msrest.exceptions import HttpOperationError
+    resource_group_name = _get_iot_hub_resource_group(client, hub_name)
     try:
-        target_hub = next(x for x in all_hubs if hub_name.lower() == x.name.lower())
-    except StopIteration:
+        return client.iot_hub_resource.get(resource_group_name, hub_name)
+    except HttpOperationError as ex:
+        if ex.response is None or ex.response.status_code != 404:
+            raise
+    # The hub was deleted or moved since its ID was cached
+    invalidate_resource_id(client.iot_hub_resource.config.subscription_id, IOT_HUB_RESOURCE_TYPE, hub_name)
+    return client.iot_hub_resource.get(_get_iot_hub_resource_group(client, hub_name), hub_name)
+
+
+def _get_iot_hub_resource_group(client, hub_name):
+    hub_id = resolve_resource_id(client.iot_hub_resource.config.subscription_id, IOT_HUB_RESOURCE_TYPE, hub_name,
+                                 lambda: iot_hub_list(client))
+    if hub_id is None:
         raise CLIError("No IoT Hub found with name {} in current subscription.".format(hub_name))
-    return target_hub
+    return parse_resource_id(hub_id)['resource_group']
 
 
 def _ensure_location(cli_ctx, resource_group_name, location):
@@ -1012,7 +1036,7 @@ def _ensure_resource_group_existence(cli_ctx, resource_group_name):
 
 def _ensure_resource_group_name(client, resource_group_name, hub_name):
     if resource_group_name is None:
-        return _get_iot_hub_by_name(client, hub_name).additional_properties['resourcegroup']
+        return _get_iot_hub_resource_group(client, hub_name)
     return resource_group_name
 
 
@@ -1117,6 +1141,7 @@ def iot_central_app_create(
               sku=appSku,
               template=template)
 
+    invalidate_resource_id(client.config.subscription_id, IOT_CENTRAL_RESOURCE_TYPE, app_name)
     createResult = client.apps.create_or_update(
         resource_group_name, app_name, app)
     return createResult
@@ -1129,6 +1154,7 @@ def iot_central_app_get(client, app_name, resource_group_name=None):
 
 
 def iot_central_app_delete(client, app_name, resource_group_name):
+    invalidate_resource_id(client.config.subscription_id, IOT_CENTRAL_RESOURCE_TYPE, app_name)
     return client.apps.delete(resource_group_name, app_name)
 
 
@@ -1168,14 +1194,9 @@ def _get_iot_central_app_by_name(client, app_name):
     :param object client: IoTCentralClient
     :param str app_name: App name to search for
     """
-    all_apps = iot_central_app_list(client)
-    if all_apps is None:
-        raise CLIError(
-            "No IoT Central application found in current subscription.")
-    try:
-        target_app = next(
-            x for x in all_apps if app_name.lower() == x.name.lower())
-    except StopIteration:
+    app_id = resolve_resource_id(client.config.subscription_id, IOT_CENTRAL_RESOURCE_TYPE, app_name,
+                                 lambda: iot_central_app_list(client))
+    if app_id is None:
         raise CLIError(
             "No IoT Central application found with name {} in current subscription.".format(app_name))
-    return target_app
+    return client.apps.get(parse_resource_id(app_id)['resource_group'], app_name)
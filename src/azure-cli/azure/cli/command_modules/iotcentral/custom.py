@@ -5,10 +5,14 @@
 
 from knack.log import get_logger
 from knack.util import CLIError
+from msrestazure.tools import parse_resource_id
 
 from azure.mgmt.iotcentral.models import (AppSkuInfo,
                                           App)
 
+from azure.cli.core.commands.resource_ids import resolve_resource_id, invalidate_resource_id
+from azure.cli.command_modules.iot._constants import IOT_CENTRAL_RESOURCE_TYPE
+
 from ._client_factory import resource_service_factory
 
 logger = get_logger(__name__)
@@ -29,6 +33,7 @@ def iotcentral_app_create(
               sku=appSku,
               template=template)
 
+    invalidate_resource_id(client.config.subscription_id, IOT_CENTRAL_RESOURCE_TYPE, app_name)
     createResult = client.apps.create_or_update(
         resource_group_name, app_name, app)
     return createResult
@@ -41,6 +46,7 @@ def iotcentral_app_get(client, app_name, resource_group_name=None):
 
 
 def iotcentral_app_delete(client, app_name, resource_group_name):
+    invalidate_resource_id(client.config.subscription_id, IOT_CENTRAL_RESOURCE_TYPE, app_name)
     return client.apps.delete(resource_group_name, app_name)
 
 
@@ -80,14 +86,9 @@ def _get_iotcentral_app_by_name(client, app_name):
     :param object client: IoTCentralClient
     :param str app_name: App name to search for
     """
-    all_apps = iotcentral_app_list(client)
-    if all_apps is None:
-        raise CLIError(
-            "No IoT Central application found in current subscription.")
-    try:
-        target_app = next(
-            x for x in all_apps if app_name.lower() == x.name.lower())
-    except StopIteration:
+    app_id = resolve_resource_id(client.config.subscription_id, IOT_CENTRAL_RESOURCE_TYPE, app_name,
+                                 lambda: iotcentral_app_list(client))
+    if app_id is None:
         raise CLIError(
             "No IoT Central application found with name {} in current subscription.".format(app_name))
-    return target_app
+    return client.apps.get(parse_resource_id(app_id)['resource_group'], app_name)
@@ -12,6 +12,31 @@ type: group
 short-summary: Manage KeyVault keys, secrets, and certificates.
 """
 
+helps['keyvault backup-all'] = """
+type: command
+short-summary: Back up all keys, secrets and certificates of a vault into a single archive.
+long-summary: >
+    Objects are enumerated page by page and backed up in parallel. The archive is a zip file with one blob per
+    object and a manifest.json listing them. Until the archive is complete the blobs are kept in a '<file>.parts'
+    directory next to it; running the same command again after an interruption resumes from there.
+examples:
+  - name: Back up every key, secret and certificate of a vault.
+    text: az keyvault backup-all --vault-name MyKeyVault -f mykeyvault.zip
+  - name: Back up only the secrets of a vault, 16 at a time.
+    text: az keyvault backup-all --vault-name MyKeyVault -f secrets.zip --types secret --max-connections 16
+"""
+
+helps['keyvault restore-all'] = """
+type: command
+short-summary: Restore all objects of an archive created by `az keyvault backup-all` into a vault.
+long-summary: >
+    Objects are restored in parallel. Restored objects are recorded in a '<file>.restore.jsonl' journal next to the
+    archive, so running the same command again after an interruption skips them.
+examples:
+  - name: Restore a vault backup into another vault.
+    text: az keyvault restore-all --vault-name MyOtherKeyVault -f mykeyvault.zip
+"""
+
 helps['keyvault certificate'] = """
 type: group
 short-summary: Manage certificates.
@@ -250,6 +250,24 @@ def load_arguments(self, _):
 
     # endregion
 
+    # region vault backup
+    for scope in ['backup-all', 'restore-all']:
+        with self.argument_context('keyvault ' + scope) as c:
+            c.argument('vault_base_url', vault_name_type, type=get_vault_base_url_type(self.cli_ctx), id_part=None)
+            c.argument('max_connections', type=int, help='Maximum number of objects transferred in parallel.')
+
+    with self.argument_context('keyvault backup-all') as c:
+        c.argument('file_path', options_list=['--file', '-f'], type=file_type, completer=FilesCompleter(),
+                   help='Local archive (zip) in which to store the backups and their manifest.')
+        c.argument('object_types', options_list=['--types'], nargs='+',
+                   arg_type=get_enum_type(['key', 'secret', 'certificate']),
+                   help='Space-separated list of object types to back up. Default: all of them.')
+
+    with self.argument_context('keyvault restore-all') as c:
+        c.argument('file_path', options_list=['--file', '-f'], type=file_type, completer=FilesCompleter(),
+                   help="Local archive created by 'az keyvault backup-all'.")
+    # endregion
+
     # region KeyVault Storage Account
     with self.argument_context('keyvault storage', arg_group='Id') as c:
         c.argument('storage_account_name', options_list=['--name', '-n'], help='Name to identify the storage account in the vault.', id_part='child_name_1', completer=get_keyvault_name_completion_list('storage_account'))
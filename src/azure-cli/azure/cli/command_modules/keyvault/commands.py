@@ -104,6 +104,10 @@ def load_command_table(self, _):
         g.command('list', 'list_by_vault', transform=gen_dict_to_list_transform(key='value'))
 
     # Data Plane Commands
+    with self.command_group('keyvault', kv_data_sdk, is_preview=True) as g:
+        g.keyvault_custom('backup-all', 'backup_vault')
+        g.keyvault_custom('restore-all', 'restore_vault')
+
     with self.command_group('keyvault key', kv_data_sdk) as g:
         g.keyvault_command('list', 'get_keys',
                            transform=multi_transformers(
@@ -24,6 +24,7 @@ from cryptography.exceptions import UnsupportedAlgorithm
 
 from azure.cli.core import telemetry
 from azure.cli.core.profiles import ResourceType
+from azure.cli.core.util import atomic_write
 
 from ._validators import _construct_vnet, secret_text_encoding_values
 
@@ -1267,6 +1268,183 @@ def restore_storage_account(client, vault_base_url, file_path):
 # endregion
 
 
+# region vault backup
+_VAULT_BACKUP_MANIFEST = 'manifest.json'
+_VAULT_BACKUP_JOURNAL = 'journal.jsonl'
+_VAULT_OBJECT_TYPES = {
+    # object type: (list operation, backup operation, restore operation, folder in the archive)
+    'key': ('get_keys', 'backup_key', 'restore_key', 'keys'),
+    'secret': ('get_secrets', 'backup_secret', 'restore_secret', 'secrets'),
+    'certificate': ('get_certificates', 'backup_certificate', 'restore_certificate', 'certificates')
+}
+
+
+def _read_journal(journal_path):
+    """ Return the entries recorded so far; a truncated last line from an interrupted run is ignored. """
+    entries = []
+    try:
+        with open(journal_path, 'r') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    pass
+    except (OSError, IOError):
+        pass
+    return entries
+
+
+def _run_bounded(func, items, max_connections, describe):
+    """ Apply `func` to every item from the (lazily paged) iterable with at most `max_connections`
+    calls in flight, so enumeration and transfer overlap. `describe` maps an item to its
+    (object type, name). Returns the items that failed. """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    failed = []
+
+    def _collect(done):
+        for future in done:
+            object_type, name = pending.pop(future)
+            try:
+                future.result()
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning("Failed to process %s '%s': %s", object_type, name, ex)
+                failed.append({'type': object_type, 'name': name, 'error': str(ex)})
+
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_connections) as executor:
+        for item in items:
+            if len(pending) >= max_connections * 2:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                _collect(done)
+            pending[executor.submit(func, item)] = describe(item)
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            _collect(done)
+    return failed
+
+
+def backup_vault(client, vault_base_url, file_path, object_types=None, max_connections=8):
+    import shutil
+    import threading
+    import zipfile
+    from knack.util import ensure_dir
+
+    object_types = object_types or list(_VAULT_OBJECT_TYPES)
+    if 'certificate' in object_types and not hasattr(client, 'backup_certificate'):
+        logger.warning('Certificate backup is not supported by the current API version, skipping certificates.')
+        object_types = [t for t in object_types if t != 'certificate']
+
+    # blobs are staged next to the archive together with a journal, which is what a rerun resumes from. The journal
+    # starts with the vault and the object types it was written for, so a backup of something else starts over.
+    staging_dir = file_path + '.parts'
+    journal_path = os.path.join(staging_dir, _VAULT_BACKUP_JOURNAL)
+    header = {'vault': vault_base_url, 'types': sorted(object_types)}
+    journal = _read_journal(journal_path)
+    if journal and journal[0] != header:
+        logger.warning("Ignoring the interrupted backup in '%s' of another vault or other object types.", staging_dir)
+        shutil.rmtree(staging_dir)
+        journal = []
+    ensure_dir(staging_dir)
+    if not journal:
+        with open(journal_path, 'w') as journal_file:
+            journal_file.write(json.dumps(header) + '\n')
+    completed = {(e['type'], e['name']): e for e in journal[1:]
+                 if os.path.isfile(os.path.join(staging_dir, e['file']))}
+    if completed:
+        logger.warning("Resuming backup of '%s', %d objects were already backed up.", vault_base_url, len(completed))
+    lock = threading.Lock()
+
+    def _list_objects():
+        for object_type in object_types:
+            list_op = getattr(client, _VAULT_OBJECT_TYPES[object_type][0])
+            for item in list_op(vault_base_url):
+                if getattr(item, 'managed', None):
+                    continue  # keys and secrets backing a certificate are part of the certificate backup
+                name = (getattr(item, 'kid', None) or item.id).rstrip('/').split('/')[-1]
+                if (object_type, name) not in completed:
+                    yield object_type, name
+
+    def _backup(item):
+        object_type, name = item
+        _, backup_op, _, folder = _VAULT_OBJECT_TYPES[object_type]
+        blob = getattr(client, backup_op)(vault_base_url, name).value
+        entry = {'type': object_type, 'name': name, 'file': '{}/{}.blob'.format(folder, name)}
+        ensure_dir(os.path.join(staging_dir, folder))
+        with open(os.path.join(staging_dir, entry['file']), 'wb') as output:
+            output.write(blob)
+        with lock:
+            with open(journal_path, 'a') as journal:
+                journal.write(json.dumps(entry) + '\n')
+            completed[(object_type, name)] = entry
+        logger.info("Backed up %s '%s'", object_type, name)
+
+    failed = _run_bounded(_backup, _list_objects(), max_connections, describe=lambda item: item)
+    if failed:
+        raise CLIError("Failed to back up {} objects, see the warnings above. Run the command again to resume; "
+                       "{} objects are kept in '{}'.".format(len(failed), len(completed), staging_dir))
+
+    items = sorted(completed.values(), key=lambda e: (e['type'], e['name']))
+    manifest = {
+        'vault': vault_base_url,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'items': items
+    }
+    with atomic_write(file_path, 'wb') as archive_file:
+        with zipfile.ZipFile(archive_file, 'w', zipfile.ZIP_STORED) as archive:
+            for entry in items:
+                archive.write(os.path.join(staging_dir, entry['file']), entry['file'])
+            archive.writestr(_VAULT_BACKUP_MANIFEST, json.dumps(manifest, indent=2))
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    return {'file': file_path, 'count': {t: len([i for i in items if i['type'] == t]) for t in object_types}}
+
+
+def restore_vault(client, vault_base_url, file_path, max_connections=8):
+    import threading
+    import zipfile
+
+    # the journal starts with the vault it was written for, so a restore into another vault starts over
+    journal_path = file_path + '.restore.jsonl'
+    journal = _read_journal(journal_path)
+    restored = set()
+    if journal and journal[0].get('vault') == vault_base_url:
+        restored = {(e['type'], e['name']) for e in journal[1:]}
+    elif journal:
+        logger.warning("Ignoring the interrupted restore of '%s' into another vault.", file_path)
+        os.remove(journal_path)
+    if restored:
+        logger.warning("Resuming restore into '%s', %d objects were already restored.", vault_base_url, len(restored))
+    lock = threading.Lock()
+
+    def _restore(item):
+        entry, blob = item
+        getattr(client, _VAULT_OBJECT_TYPES[entry['type']][2])(vault_base_url, blob)
+        with lock:
+            is_new = not os.path.isfile(journal_path)
+            with open(journal_path, 'a') as journal_file:
+                if is_new:
+                    journal_file.write(json.dumps({'vault': vault_base_url}) + '\n')
+                journal_file.write(json.dumps({'type': entry['type'], 'name': entry['name']}) + '\n')
+        logger.info("Restored %s '%s'", entry['type'], entry['name'])
+
+    with zipfile.ZipFile(file_path, 'r') as archive:
+        try:
+            manifest = json.loads(archive.read(_VAULT_BACKUP_MANIFEST).decode('utf-8'))
+        except KeyError:
+            raise CLIError("'{}' is not a vault backup archive: {} is missing.".format(
+                file_path, _VAULT_BACKUP_MANIFEST))
+        # blobs are read as the pool drains, so only the objects in flight are held in memory
+        failed = _run_bounded(_restore, ((e, archive.read(e['file'])) for e in manifest['items']
+                                         if (e['type'], e['name']) not in restored), max_connections,
+                              describe=lambda item: (item[0]['type'], item[0]['name']))
+    if failed:
+        raise CLIError("Failed to restore {} objects, see the warnings above. Run the command again to resume."
+                       .format(len(failed)))
+    if os.path.isfile(journal_path):
+        os.remove(journal_path)
+    return {'file': file_path, 'restored': len(manifest['items'])}
+# endregion
+
+
 # region private_endpoint
 def _update_private_endpoint_connection_status(cmd, client, resource_group_name, vault_name,
                                                private_endpoint_connection_name, is_approved=True, description=None,
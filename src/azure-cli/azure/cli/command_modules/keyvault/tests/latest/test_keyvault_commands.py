@@ -55,6 +55,128 @@ class DateTimeParseTest(unittest.TestCase):
         self.assertEqual(_asn1_to_iso8601("20170424163720Z"), expected)
 
 
+class _FakeVaultClient(object):
+    """ In-memory stand-in for the data plane client used by the bulk backup/restore commands. """
+
+    def __init__(self, objects=None, fail_once=None):
+        from collections import namedtuple
+        self._item = namedtuple('Item', ['id', 'managed'])
+        self._blob = namedtuple('Blob', ['value'])
+        self.objects = objects or {}
+        self.fail_once = set(fail_once or [])
+        self.calls = []
+
+    def _list(self, object_type, folder):
+        return [self._item('https://vault.vault.azure.net/{}/{}'.format(folder, name), managed)
+                for (t, name), managed in sorted(self.objects.items()) if t == object_type]
+
+    def _backup(self, object_type, name):
+        self.calls.append(('backup', object_type, name))
+        if (object_type, name) in self.fail_once:
+            self.fail_once.remove((object_type, name))
+            raise ValueError('throttled')
+        return self._blob('{}:{}'.format(object_type, name).encode())
+
+    def _restore(self, data):
+        object_type, name = data.decode().split(':')
+        self.calls.append(('restore', object_type, name))
+        if (object_type, name) in self.fail_once:
+            self.fail_once.remove((object_type, name))
+            raise ValueError('throttled')
+        self.objects[(object_type, name)] = False
+
+    def get_keys(self, vault_base_url):
+        return self._list('key', 'keys')
+
+    def get_secrets(self, vault_base_url):
+        return self._list('secret', 'secrets')
+
+    def get_certificates(self, vault_base_url):
+        return self._list('certificate', 'certificates')
+
+    def backup_key(self, vault_base_url, name):
+        return self._backup('key', name)
+
+    def backup_secret(self, vault_base_url, name):
+        return self._backup('secret', name)
+
+    def backup_certificate(self, vault_base_url, name):
+        return self._backup('certificate', name)
+
+    def restore_key(self, vault_base_url, data):
+        return self._restore(data)
+
+    def restore_secret(self, vault_base_url, data):
+        return self._restore(data)
+
+    def restore_certificate(self, vault_base_url, data):
+        return self._restore(data)
+
+
+class KeyVaultBulkBackupTest(unittest.TestCase):
+
+    def test_keyvault_backup_restore_all_resumes(self):
+        import shutil
+        import tempfile
+        import zipfile
+        from azure.cli.command_modules.keyvault.custom import backup_vault, restore_vault
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        archive = os.path.join(temp_dir, 'vault.zip')
+        objects = {('secret', 's{}'.format(i)): False for i in range(30)}
+        objects.update({('key', 'k1'): False, ('certificate', 'c1'): False,
+                        ('key', 'c1'): True, ('secret', 'c1'): True})  # backing objects of certificate c1
+        source = _FakeVaultClient(objects, fail_once=[('secret', 's7')])
+
+        with self.assertRaises(CLIError):
+            backup_vault(source, 'https://vault.vault.azure.net', archive, max_connections=4)
+        self.assertFalse(os.path.exists(archive))
+        self.assertEqual(len(source.calls), 32)
+
+        # the rerun only backs up what failed
+        result = backup_vault(source, 'https://vault.vault.azure.net', archive, max_connections=4)
+        self.assertEqual(source.calls[32:], [('backup', 'secret', 's7')])
+        self.assertEqual(result['count'], {'key': 1, 'secret': 30, 'certificate': 1})
+        self.assertFalse(os.path.exists(archive + '.parts'))
+        with zipfile.ZipFile(archive) as z:
+            manifest = json.loads(z.read('manifest.json').decode())
+            self.assertEqual(len(manifest['items']), 32)
+            self.assertEqual(z.read('keys/k1.blob'), b'key:k1')
+
+        target = _FakeVaultClient(fail_once=[('certificate', 'c1')])
+        with self.assertRaises(CLIError):
+            restore_vault(target, 'https://other.vault.azure.net', archive, max_connections=4)
+        self.assertEqual(len(target.objects), 31)
+        result = restore_vault(target, 'https://other.vault.azure.net', archive, max_connections=4)
+        self.assertEqual(target.calls[-1], ('restore', 'certificate', 'c1'))
+        self.assertEqual(len(target.calls), 33)
+        self.assertEqual(set(target.objects), {k for k, managed in objects.items() if not managed})
+        self.assertFalse(os.path.exists(archive + '.restore.jsonl'))
+
+        # an interrupted restore isn't resumed into another vault
+        with self.assertRaises(CLIError):
+            restore_vault(_FakeVaultClient(fail_once=[('key', 'k1')]), 'https://other.vault.azure.net', archive)
+        third = _FakeVaultClient()
+        restore_vault(third, 'https://third.vault.azure.net', archive)
+        self.assertEqual(len(third.objects), 32)
+
+        # an interrupted backup isn't resumed into the archive of another vault or of other object types
+        with self.assertRaises(CLIError):
+            backup_vault(_FakeVaultClient({('secret', 'a1'): False, ('secret', 'a2'): False},
+                                          fail_once=[('secret', 'a2')]), 'https://a.vault.azure.net', archive)
+        result = backup_vault(_FakeVaultClient({('secret', 'b1'): False}), 'https://b.vault.azure.net', archive)
+        self.assertEqual(result['count'], {'key': 0, 'secret': 1, 'certificate': 0})
+        with zipfile.ZipFile(archive) as z:
+            self.assertEqual([i['name'] for i in json.loads(z.read('manifest.json').decode())['items']], ['b1'])
+
+        with self.assertRaises(CLIError):
+            backup_vault(_FakeVaultClient({('secret', 'a1'): False, ('key', 'a2'): False},
+                                          fail_once=[('key', 'a2')]), 'https://a.vault.azure.net', archive)
+        result = backup_vault(_FakeVaultClient({('secret', 'a1'): False, ('key', 'a2'): False}),
+                              'https://a.vault.azure.net', archive, object_types=['key'])
+        self.assertEqual(result['count'], {'key': 1})
+
+
 class KeyVaultPrivateLinkResourceScenarioTest(ScenarioTest):
     @ResourceGroupPreparer(name_prefix='cli_test_keyvault_plr')
     def test_keyvault_private_link_resource(self, resource_group):
@@ -2206,10 +2206,17 @@ examples:
 helps['network dns zone import'] = """
 type: command
 short-summary: Create a DNS zone using a DNS zone file.
+long-summary: >
+    The existing record sets of the zone are compared with the zone file and only the record sets that differ are
+    written, several at a time. Set `import_max_connections` in the `dns` section of the configuration (or
+    AZURE_DNS_IMPORT_MAX_CONNECTIONS) to change how many record sets are written in parallel.
 examples:
   - name: Import a local zone file into a DNS zone resource.
     text: >
         az network dns zone import -g MyResourceGroup -n MyZone -f /path/to/zone/file
+  - name: Show the record sets that importing a zone file would create or update.
+    text: >
+        az network dns zone import -g MyResourceGroup -n MyZone -f /path/to/zone/file --dry-run
 """
 
 helps['network dns zone list'] = """
@@ -544,6 +544,7 @@ def load_arguments(self, _):
 
     with self.argument_context('network dns zone import') as c:
         c.argument('file_name', options_list=['--file-name', '-f'], type=file_type, completer=FilesCompleter(), help='Path to the DNS zone file to import')
+        c.argument('dry_run', action='store_true', help='Show the record sets that would be created or updated without changing the zone.')
 
     with self.argument_context('network dns zone export') as c:
         c.argument('file_name', options_list=['--file-name', '-f'], type=file_type, completer=FilesCompleter(), help='Path to the DNS zone file to save')
@@ -4,7 +4,7 @@
 # --------------------------------------------------------------------------------------------
 from __future__ import print_function
 
-from collections import Counter, OrderedDict
+from collections import Counter
 
 from msrestazure.azure_exceptions import CloudError
 from msrestazure.tools import parse_resource_id, is_valid_resource_id, resource_id
@@ -21,12 +21,14 @@ from azure.cli.core.util import CLIError, sdk_no_wait, find_child_item, find_chi
 from azure.cli.command_modules.network._client_factory import network_client_factory
 
 from azure.cli.command_modules.network.zone_file.parse_zone_file import parse_zone_file
-from azure.cli.command_modules.network.zone_file.make_zone_file import make_zone_file
 from azure.cli.core.profiles import ResourceType, supported_api_version
 
 
 logger = get_logger(__name__)
 
+_DNS_IMPORT_MAX_CONNECTIONS = 10
+_DNS_IMPORT_MAX_RETRIES = 5
+
 
 # region Utility methods
 def _log_pprint_template(template):
@@ -1569,81 +1571,136 @@ def _type_to_property_name(key):
     return type_dict[key.lower()]
 
 
+def _record_set_to_zone_records(record_set):
+    """ Convert a DNS record set into the zone file records understood by make_zone_file. """
+    record_type = record_set.type.rsplit('/', 1)[1].lower()
+    record_data = getattr(record_set, _type_to_property_name(record_type), None)
+
+    # ignore empty record sets
+    if not record_data:
+        return record_type, []
+
+    if not isinstance(record_data, list):
+        record_data = [record_data]
+
+    records = []
+    for record in record_data:
+
+        record_obj = {'ttl': record_set.ttl}
+
+        if record_type == 'aaaa':
+            record_obj.update({'ip': record.ipv6_address})
+        elif record_type == 'a':
+            record_obj.update({'ip': record.ipv4_address})
+        elif record_type == 'caa':
+            record_obj.update({'val': record.value, 'tag': record.tag, 'flags': record.flags})
+        elif record_type == 'cname':
+            record_obj.update({'alias': record.cname.rstrip('.') + '.'})
+        elif record_type == 'mx':
+            record_obj.update({'preference': record.preference, 'host': record.exchange})
+        elif record_type == 'ns':
+            record_obj.update({'host': record.nsdname})
+        elif record_type == 'ptr':
+            record_obj.update({'host': record.ptrdname})
+        elif record_type == 'soa':
+            record_obj.update({
+                'mname': record.host.rstrip('.') + '.',
+                'rname': record.email.rstrip('.') + '.',
+                'serial': int(record.serial_number), 'refresh': record.refresh_time,
+                'retry': record.retry_time, 'expire': record.expire_time,
+                'minimum': record.minimum_ttl
+            })
+        elif record_type == 'srv':
+            record_obj.update({'priority': record.priority, 'weight': record.weight,
+                               'port': record.port, 'target': record.target})
+        elif record_type == 'txt':
+            record_obj.update({'txt': ''.join(record.value)})
+
+        records.append(record_obj)
+    return record_type, records
+
+
+class _ZoneFileWriter(object):
+    """ Write the exported zone file to stdout and, optionally, a file as record sets are paged in. """
+
+    def __init__(self, streams, zone_name, resource_group_name, timestamp):
+        self.streams = streams
+        self.zone_name = zone_name.rstrip('.')
+        self.resource_group_name = resource_group_name
+        self.timestamp = timestamp
+        self._pending = []
+        self._header_written = False
+        self._last_name = None
+
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+
+    def add(self, record_set_name, record_type, records):
+        if self._header_written:
+            self._write_records(record_set_name, record_type, records)
+        elif record_type == 'soa':
+            # the header carries the zone's default TTL and the SOA must be the first record, so whatever
+            # is paged in before the root SOA is held back until it arrives
+            self.write_header(records[0]['minimum'])
+            self._write_records(record_set_name, record_type, records)
+            self._flush_pending()
+        else:
+            self._pending.append((record_set_name, record_type, records))
+
+    def write_header(self, ttl):
+        from azure.cli.command_modules.network.zone_file.make_zone_file import write_zone_file_header
+        write_zone_file_header(self, zone_name=self.zone_name, resource_group=self.resource_group_name,
+                               datetime=self.timestamp, ttl=ttl, origin=self.zone_name + '.')
+        self._header_written = True
+
+    def _flush_pending(self):
+        pending, self._pending = self._pending, []
+        for item in pending:
+            self._write_records(*item)
+
+    def close(self):
+        if not self._header_written:
+            self.write_header(3600)
+            self._flush_pending()
+        self.write('\n')
+
+    def _write_records(self, record_set_name, record_type, records):
+        from azure.cli.command_modules.network.zone_file.make_zone_file import write_zone_file_records
+        write_zone_file_records(self, self.zone_name, record_set_name, {record_type: records},
+                                print_name=record_set_name != self._last_name)
+        self._last_name = record_set_name
+
+
 def export_zone(cmd, resource_group_name, zone_name, file_name=None):
     from time import localtime, strftime
+    import sys
 
     client = get_mgmt_service_client(cmd.cli_ctx, ResourceType.MGMT_NETWORK_DNS)
     record_sets = client.record_sets.list_by_dns_zone(resource_group_name, zone_name)
 
-    zone_obj = OrderedDict({
-        '$origin': zone_name.rstrip('.') + '.',
-        'resource-group': resource_group_name,
-        'zone-name': zone_name.rstrip('.'),
-        'datetime': strftime('%a, %d %b %Y %X %z', localtime())
-    })
-
-    for record_set in record_sets:
-        record_type = record_set.type.rsplit('/', 1)[1].lower()
-        record_set_name = record_set.name
-        record_data = getattr(record_set, _type_to_property_name(record_type), None)
-
-        # ignore empty record sets
-        if not record_data:
-            continue
-
-        if not isinstance(record_data, list):
-            record_data = [record_data]
-
-        if record_set_name not in zone_obj:
-            zone_obj[record_set_name] = OrderedDict()
-
-        for record in record_data:
-
-            record_obj = {'ttl': record_set.ttl}
-
-            if record_type not in zone_obj[record_set_name]:
-                zone_obj[record_set_name][record_type] = []
-
-            if record_type == 'aaaa':
-                record_obj.update({'ip': record.ipv6_address})
-            elif record_type == 'a':
-                record_obj.update({'ip': record.ipv4_address})
-            elif record_type == 'caa':
-                record_obj.update({'val': record.value, 'tag': record.tag, 'flags': record.flags})
-            elif record_type == 'cname':
-                record_obj.update({'alias': record.cname.rstrip('.') + '.'})
-            elif record_type == 'mx':
-                record_obj.update({'preference': record.preference, 'host': record.exchange})
-            elif record_type == 'ns':
-                record_obj.update({'host': record.nsdname})
-            elif record_type == 'ptr':
-                record_obj.update({'host': record.ptrdname})
-            elif record_type == 'soa':
-                record_obj.update({
-                    'mname': record.host.rstrip('.') + '.',
-                    'rname': record.email.rstrip('.') + '.',
-                    'serial': int(record.serial_number), 'refresh': record.refresh_time,
-                    'retry': record.retry_time, 'expire': record.expire_time,
-                    'minimum': record.minimum_ttl
-                })
-                zone_obj['$ttl'] = record.minimum_ttl
-            elif record_type == 'srv':
-                record_obj.update({'priority': record.priority, 'weight': record.weight,
-                                   'port': record.port, 'target': record.target})
-            elif record_type == 'txt':
-                record_obj.update({'txt': ''.join(record.value)})
-
-            zone_obj[record_set_name][record_type].append(record_obj)
-
-    zone_file_content = make_zone_file(zone_obj)
-    print(zone_file_content)
+    export_file = None
     if file_name:
         try:
-            with open(file_name, 'w') as f:
-                f.write(zone_file_content)
+            export_file = open(file_name, 'w')
         except IOError:
             raise CLIError('Unable to export to file: {}'.format(file_name))
 
+    streams = [sys.stdout] + ([export_file] if export_file else [])
+    writer = _ZoneFileWriter(streams, zone_name, resource_group_name,
+                             strftime('%a, %d %b %Y %X %z', localtime()))
+    try:
+        for record_set in record_sets:
+            record_type, records = _record_set_to_zone_records(record_set)
+            if records:
+                writer.add(record_set.name, record_type, records)
+        writer.close()
+    except IOError:
+        raise CLIError('Unable to export to file: {}'.format(file_name))
+    finally:
+        if export_file:
+            export_file.close()
+
 
 # pylint: disable=too-many-return-statements, inconsistent-return-statements
 def _build_record(cmd, data):
@@ -1683,8 +1740,9 @@ def _build_record(cmd, data):
                        .format(record_type, data['name'], ke))
 
 
-# pylint: disable=too-many-statements
-def import_zone(cmd, resource_group_name, zone_name, file_name):
+# pylint: disable=too-many-statements, too-many-locals, too-many-branches
+def import_zone(cmd, resource_group_name, zone_name, file_name, dry_run=False):
+    from concurrent.futures import ThreadPoolExecutor, as_completed
     from azure.cli.core.util import read_file_content
     import sys
     logger.warning("In the future, zone name will be case insensitive.")
@@ -1731,22 +1789,24 @@ def import_zone(cmd, resource_group_name, zone_name, file_name):
                 _add_record(record_set, record, record_set_type,
                             is_list=record_set_type.lower() not in ['soa', 'cname'])
 
-    total_records = 0
-    for key, rs in record_sets.items():
-        rs_name, rs_type = key.lower().rsplit('.', 1)
-        rs_name = rs_name[:-(len(origin) + 1)] if rs_name != origin else '@'
-        try:
-            record_count = len(getattr(rs, _type_to_property_name(rs_type)))
-        except TypeError:
-            record_count = 1
-        total_records += record_count
-    cum_records = 0
-
     client = get_mgmt_service_client(cmd.cli_ctx, ResourceType.MGMT_NETWORK_DNS)
-    print('== BEGINNING ZONE IMPORT: {} ==\n'.format(zone_name), file=sys.stderr)
+    if not dry_run:
+        print('== BEGINNING ZONE IMPORT: {} ==\n'.format(zone_name), file=sys.stderr)
+        Zone = cmd.get_models('Zone', resource_type=ResourceType.MGMT_NETWORK_DNS)
+        client.zones.create_or_update(resource_group_name, zone_name, Zone(location='global'))
 
-    Zone = cmd.get_models('Zone', resource_type=ResourceType.MGMT_NETWORK_DNS)
-    client.zones.create_or_update(resource_group_name, zone_name, Zone(location='global'))
+    # list the zone once so unchanged record sets (and the root SOA/NS) need no further requests
+    existing = {}
+    try:
+        for record_set in client.record_sets.list_by_dns_zone(resource_group_name, zone_name):
+            existing[(record_set.name.lower(), record_set.type.rsplit('/', 1)[1].lower())] = record_set
+    except CloudError as ex:
+        if not dry_run or ex.status_code != 404:
+            raise
+
+    changes = []
+    total_records = 0
+    unchanged_records = 0
     for key, rs in record_sets.items():
 
         rs_name, rs_type = key.lower().rsplit('.', 1)
@@ -1758,27 +1818,83 @@ def import_zone(cmd, resource_group_name, zone_name, file_name):
             record_count = len(getattr(rs, _type_to_property_name(rs_type)))
         except TypeError:
             record_count = 1
-        if rs_name == '@' and rs_type == 'soa':
-            root_soa = client.record_sets.get(resource_group_name, zone_name, '@', 'SOA')
-            rs.soa_record.host = root_soa.soa_record.host
-            rs_name = '@'
-        elif rs_name == '@' and rs_type == 'ns':
-            root_ns = client.record_sets.get(resource_group_name, zone_name, '@', 'NS')
-            root_ns.ttl = rs.ttl
-            rs = root_ns
+        total_records += record_count
+
+        current = existing.get((rs_name.lower(), rs_type))
+        if rs_name == '@' and rs_type == 'soa' and current:
+            rs.soa_record.host = current.soa_record.host
+        elif rs_name == '@' and rs_type == 'ns' and current:
+            # the root name servers are assigned by Azure DNS, only their TTL can be imported
+            if current.ttl == rs.ttl:
+                unchanged_records += record_count
+                continue
+            current.ttl = rs.ttl
+            rs = current
             rs_type = rs.type.rsplit('/', 1)[1]
-        try:
-            client.record_sets.create_or_update(
-                resource_group_name, zone_name, rs_name, rs_type, rs)
-            cum_records += record_count
-            print("({}/{}) Imported {} records of type '{}' and name '{}'"
-                  .format(cum_records, total_records, record_count, rs_type, rs_name), file=sys.stderr)
-        except CloudError as ex:
-            logger.error(ex)
+
+        if current and _dns_record_set_signature(current, rs_type) == _dns_record_set_signature(rs, rs_type):
+            unchanged_records += record_count
+            continue
+        changes.append({'name': rs_name, 'type': rs_type, 'action': 'update' if current else 'create',
+                        'records': record_count, 'record_set': rs})
+
+    if dry_run:
+        for change in changes:
+            del change['record_set']
+        return changes
+
+    max_workers = cmd.cli_ctx.config.getint('dns', 'import_max_connections',
+                                            fallback=_DNS_IMPORT_MAX_CONNECTIONS)
+    cum_records = unchanged_records
+    if unchanged_records:
+        print('({}/{}) Skipped {} records that are already up to date'
+              .format(cum_records, total_records, unchanged_records), file=sys.stderr)
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        futures = {executor.submit(_dns_call_with_retry, client.record_sets.create_or_update, resource_group_name,
+                                   zone_name, change['name'], change['type'], change['record_set']): change
+                   for change in changes}
+        for future in as_completed(futures):
+            change = futures[future]
+            try:
+                future.result()
+                cum_records += change['records']
+                print("({}/{}) Imported {} records of type '{}' and name '{}'"
+                      .format(cum_records, total_records, change['records'], change['type'], change['name']),
+                      file=sys.stderr)
+            except CloudError as ex:
+                logger.error(ex)
     print("\n== {}/{} RECORDS IMPORTED SUCCESSFULLY: '{}' =="
           .format(cum_records, total_records, zone_name), file=sys.stderr)
 
 
+def _dns_record_set_signature(record_set, record_type):
+    """ Comparable form of the TTL and records of a record set, ignoring record order and read-only fields. """
+    import json
+    records = getattr(record_set, _type_to_property_name(record_type), None) or []
+    if not isinstance(records, list):
+        records = [records]
+    return record_set.ttl, sorted(json.dumps(record.serialize(), sort_keys=True) for record in records)
+
+
+def _dns_call_with_retry(func, *args, **kwargs):
+    """ Call a DNS operation, backing off and retrying when the request is throttled. """
+    import time
+    for attempt in range(_DNS_IMPORT_MAX_RETRIES + 1):
+        try:
+            return func(*args, **kwargs)
+        except CloudError as ex:
+            if ex.status_code != 429 or attempt == _DNS_IMPORT_MAX_RETRIES:
+                raise
+            delay = 2 ** attempt
+            headers = getattr(ex.response, 'headers', None) or {}
+            try:
+                delay = int(headers.get('Retry-After', delay))
+            except (TypeError, ValueError):
+                pass
+            logger.debug("Throttled by Azure DNS, retrying in %s seconds", delay)
+            time.sleep(delay)
+
+
 def add_dns_aaaa_record(cmd, resource_group_name, zone_name, record_set_name, ipv6_address,
                         ttl=None, if_none_match=None):
     AaaaRecord = cmd.get_models('AaaaRecord', resource_type=ResourceType.MGMT_NETWORK_DNS)
@@ -6,6 +6,8 @@
 import os
 import unittest
 
+import mock
+
 from azure.cli.testsdk import ScenarioTest, ResourceGroupPreparer
 
 from azure.cli.command_modules.network.zone_file import parse_zone_file
@@ -15,6 +17,13 @@ TEST_DIR = os.path.abspath(os.path.join(os.path.abspath(__file__), '..'))
 
 class DnsZoneImportTest(ScenarioTest):
 
+    def setUp(self):
+        super(DnsZoneImportTest, self).setUp()
+        # write the record sets one at a time, the recording patches are not thread safe
+        patcher = mock.patch.dict(os.environ, {'AZURE_DNS_IMPORT_MAX_CONNECTIONS': '1'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def _match_record(self, record_set, name, type):
         matches = [x for x in record_set if x['name'] == name and x['type'] == type]
         self.assertEqual(len(matches), 1)
@@ -705,5 +714,105 @@ class DnsParseZoneFiles(unittest.TestCase):
                 self._get_zone_object('{}.txt'.format(f), 'example.com')
 
 
+def _get_dns_test_cmd():
+    from azure.cli.core.mock import DummyCli
+    from azure.cli.core import AzCommandsLoader
+    from azure.cli.core.commands import AzCliCommand
+    from azure.cli.core.profiles import ResourceType
+    cli_ctx = DummyCli()
+    loader = AzCommandsLoader(cli_ctx, resource_type=ResourceType.MGMT_NETWORK_DNS)
+    cmd = AzCliCommand(loader, 'test', None)
+    cmd.command_kwargs = {'resource_type': ResourceType.MGMT_NETWORK_DNS}
+    cmd.cli_ctx = cli_ctx
+    return cmd
+
+
+class DnsZoneImportExportMockedTest(unittest.TestCase):
+
+    ZONE_FILE = """$ORIGIN example.com.
+$TTL 3600
+@ 3600 IN SOA ns1-01.azure-dns.com. hostmaster.example.com. (1 3600 300 2419200 300)
+@ 172800 IN NS ns1-01.azure-dns.com.
+www 3600 IN A 1.2.3.4
+www 3600 IN A 1.2.3.5
+mail 3600 IN A 10.0.0.1
+ftp 600 IN CNAME www.example.com.
+"""
+
+    def setUp(self):
+        import tempfile
+        self.cmd = _get_dns_test_cmd()
+        self.temp_dir = tempfile.mkdtemp()
+        self.zone_file = os.path.join(self.temp_dir, 'zone.txt')
+        with open(self.zone_file, 'w') as f:
+            f.write(self.ZONE_FILE)
+        self.client = mock.MagicMock()
+        patcher = mock.patch('azure.cli.command_modules.network.custom.get_mgmt_service_client',
+                             return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _record_set(self, name, record_type, ttl, **records):
+        RecordSet = self.cmd.get_models('RecordSet')
+        record_set = RecordSet(ttl=ttl, **records)
+        record_set.name = name
+        record_set.type = 'Microsoft.Network/dnszones/' + record_type
+        return record_set
+
+    def _existing_zone(self):
+        ARecord, NsRecord, SoaRecord = self.cmd.get_models('ARecord', 'NsRecord', 'SoaRecord')
+        return [
+            self._record_set('@', 'SOA', 3600, soa_record=SoaRecord(
+                host='ns1-01.azure-dns.com.', email='hostmaster.example.com.', serial_number=1, refresh_time=3600,
+                retry_time=300, expire_time=2419200, minimum_ttl=300)),
+            self._record_set('@', 'NS', 172800, ns_records=[NsRecord(nsdname='ns1-01.azure-dns.com.')]),
+            # same records in a different order, so nothing needs to be written
+            self._record_set('www', 'A', 3600, arecords=[ARecord(ipv4_address='1.2.3.5'),
+                                                         ARecord(ipv4_address='1.2.3.4')]),
+            self._record_set('mail', 'A', 3600, arecords=[ARecord(ipv4_address='10.0.0.2')]),
+        ]
+
+    def test_dns_zone_import_writes_only_changes(self):
+        from azure.cli.command_modules.network.custom import import_zone
+        self.client.record_sets.list_by_dns_zone.return_value = self._existing_zone()
+
+        import_zone(self.cmd, 'rg1', 'example.com', self.zone_file)
+
+        self.client.record_sets.get.assert_not_called()
+        written = sorted((c[0][2], c[0][3]) for c in self.client.record_sets.create_or_update.call_args_list)
+        self.assertEqual(written, [('ftp', 'cname'), ('mail', 'a')])
+
+    def test_dns_zone_import_dry_run(self):
+        from azure.cli.command_modules.network.custom import import_zone
+        self.client.record_sets.list_by_dns_zone.return_value = self._existing_zone()
+
+        changes = import_zone(self.cmd, 'rg1', 'example.com', self.zone_file, dry_run=True)
+
+        self.client.zones.create_or_update.assert_not_called()
+        self.client.record_sets.create_or_update.assert_not_called()
+        self.assertEqual(sorted((c['name'], c['type'], c['action']) for c in changes),
+                         [('ftp', 'cname', 'create'), ('mail', 'a', 'update')])
+
+    def test_dns_zone_export_streams_record_sets(self):
+        from azure.cli.command_modules.network.custom import export_zone
+        # the root SOA is not the first record set returned, the header must still carry its TTL
+        record_sets = self._existing_zone()
+        self.client.record_sets.list_by_dns_zone.return_value = iter(record_sets[2:] + record_sets[:2])
+        export_file = os.path.join(self.temp_dir, 'export.txt')
+
+        with mock.patch('sys.stdout'):
+            export_zone(self.cmd, 'rg1', 'example.com', export_file)
+
+        with open(export_file) as f:
+            zone_obj = parse_zone_file(f.read(), 'example.com')
+        self.assertEqual(zone_obj['example.com.']['soa']['minimum'], 300)
+        self.assertEqual(sorted(r['ip'] for r in zone_obj['www.example.com.']['a']), ['1.2.3.4', '1.2.3.5'])
+        self.assertEqual([r['ip'] for r in zone_obj['mail.example.com.']['a']], ['10.0.0.2'])
+
+
 if __name__ == '__main__':
     unittest.main()
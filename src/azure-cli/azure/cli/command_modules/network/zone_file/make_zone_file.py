@@ -27,6 +27,16 @@
 from __future__ import print_function
 
 
+HEADER = """
+; Exported zone file from Azure DNS\n\
+;      Zone name: {zone_name}\n\
+;      Resource Group Name: {resource_group}\n\
+;      Date and time (UTC): {datetime}\n\n\
+$TTL {ttl}\n\
+$ORIGIN {origin}\n\
+    """
+
+
 def make_zone_file(json_obj):
     """
     Generate the DNS zonefile, given a json-encoded description of the
@@ -49,57 +59,72 @@ def make_zone_file(json_obj):
         "uri":     [ uri records ]
     }
     """
-    import azure.cli.command_modules.network.zone_file.record_processors as record_processors
     from six import StringIO
 
     zone_file = StringIO()
 
-    HEADER = """
-; Exported zone file from Azure DNS\n\
-;      Zone name: {zone_name}\n\
-;      Resource Group Name: {resource_group}\n\
-;      Date and time (UTC): {datetime}\n\n\
-$TTL {ttl}\n\
-$ORIGIN {origin}\n\
-    """
     zone_name = json_obj.pop('zone-name')
-    print(HEADER.format(
+    write_zone_file_header(
+        zone_file,
         zone_name=zone_name,
         resource_group=json_obj.pop('resource-group'),
         datetime=json_obj.pop('datetime'),
         ttl=json_obj.pop('$ttl'),
         origin=json_obj.pop('$origin')
-    ), file=zone_file)
+    )
 
     for record_set_name in json_obj.keys():
 
         record_set = json_obj[record_set_name]
-        if record_set_name.endswith(zone_name):
-            record_set_name = record_set_name[:-(len(zone_name) + 1)]
         if isinstance(record_set, str):
             # These are handled above so we can skip them
             continue
 
-        first_line = True
-        record_set_keys = list(record_set.keys())
-        if 'soa' in record_set_keys:
-            record_set_keys.remove('soa')
-            record_set_keys = ['soa'] + record_set_keys
+        write_zone_file_records(zone_file, zone_name, record_set_name, record_set)
 
-        for record_type in record_set_keys:
+    result = zone_file.getvalue()
+    zone_file.close()
 
-            record = record_set[record_type]
-            if not isinstance(record, list):
-                record = [record]
+    return result
 
-            for entry in record:
-                method = 'process_{}'.format(record_type.strip('$'))
-                getattr(record_processors, method)(zone_file, entry, record_set_name, first_line)
-                first_line = False
 
-            print('', file=zone_file)
+def write_zone_file_header(io, zone_name, resource_group, datetime, ttl, origin):
+    """
+    Write the zone file header ($TTL and $ORIGIN directives) to @io
+    """
+    print(HEADER.format(
+        zone_name=zone_name,
+        resource_group=resource_group,
+        datetime=datetime,
+        ttl=ttl,
+        origin=origin
+    ), file=io)
 
-    result = zone_file.getvalue()
-    zone_file.close()
 
-    return result
+def write_zone_file_records(io, zone_name, record_set_name, record_set, print_name=True):
+    """
+    Write all the records of a single owner name (@record_set, keyed by record type) to @io
+    """
+    import azure.cli.command_modules.network.zone_file.record_processors as record_processors
+
+    if record_set_name.endswith(zone_name):
+        record_set_name = record_set_name[:-(len(zone_name) + 1)]
+
+    first_line = print_name
+    record_set_keys = list(record_set.keys())
+    if 'soa' in record_set_keys:
+        record_set_keys.remove('soa')
+        record_set_keys = ['soa'] + record_set_keys
+
+    for record_type in record_set_keys:
+
+        record = record_set[record_type]
+        if not isinstance(record, list):
+            record = [record]
+
+        for entry in record:
+            method = 'process_{}'.format(record_type.strip('$'))
+            getattr(record_processors, method)(io, entry, record_set_name, first_line)
+            first_line = False
+
+        print('', file=io)
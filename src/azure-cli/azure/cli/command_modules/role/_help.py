@@ -580,7 +580,9 @@ examples:
 helps['role assignment list'] = """
 type: command
 short-summary: List role assignments.
-long-summary: By default, only assignments scoped to subscription will be displayed. To view assignments scoped by resource or group, use `--all`.
+long-summary: >
+    By default, only assignments scoped to subscription will be displayed. To view assignments scoped by resource or group, use `--all`.
+    Role definition and principal names are cached locally for `[role] name_cache_ttl` minutes (default 60, 0 disables the cache).
 """
 
 helps['role assignment list-changelogs'] = """
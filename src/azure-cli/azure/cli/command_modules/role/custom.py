@@ -12,6 +12,7 @@ import re
 import os
 import uuid
 import itertools
+from concurrent.futures import ThreadPoolExecutor
 from dateutil.relativedelta import relativedelta
 import dateutil.parser
 
@@ -161,6 +162,55 @@ def _create_role_assignment(cli_ctx, role, assignee, resource_group_name=None, s
                                          assignee_principal_type)
 
 
+_ROLE_NAME_CACHE_FILE = 'roleNameCache.json'
+_DEFAULT_ROLE_NAME_CACHE_TTL = 60  # minutes
+_ROLE_DEFINITION_NAMES = 'roleDefinitions'
+_PRINCIPAL_NAMES = 'principals'
+
+
+class _RoleNameCache(object):
+    """
+    Role definition and principal display names resolved by `role assignment list`, kept on disk for
+    `[role] name_cache_ttl` minutes (default 60, 0 disables it) so repeated listings skip the lookups.
+    """
+
+    def __init__(self, cli_ctx):
+        from azure.cli.core._environment import get_config_dir
+        from azure.cli.core._session import Session
+        self.ttl = cli_ctx.config.getint('role', 'name_cache_ttl', fallback=_DEFAULT_ROLE_NAME_CACHE_TTL)
+        self._session = Session()
+        if self.ttl > 0:
+            self._session.load(os.path.join(get_config_dir(), _ROLE_NAME_CACHE_FILE))
+        self._dirty = False
+
+    def get_many(self, kind, keys):
+        import time
+        entries = self._session.get(kind, {})
+        now = time.time()
+        result = {}
+        for key in keys:
+            entry = entries.get((key or '').lower())
+            if entry and now - entry[1] < self.ttl * 60:
+                result[key] = entry[0]
+        return result
+
+    def update(self, kind, names):
+        import time
+        if self.ttl <= 0:
+            return
+        now = time.time()
+        entries = self._session.data.setdefault(kind, {})
+        # drop expired entries while we are rewriting the file anyway
+        for key in [k for k, v in entries.items() if now - v[1] >= self.ttl * 60]:
+            del entries[key]
+        entries.update({key.lower(): [name, now] for key, name in names.items() if name})
+        self._dirty = True
+
+    def save(self):
+        if self._dirty:
+            self._session.save_with_retry()
+
+
 def list_role_assignments(cmd, assignee=None, role=None, resource_group_name=None,
                           scope=None, include_inherited=False,
                           show_all=False, include_groups=False, include_classic_administrators=False):
@@ -181,13 +231,17 @@ def list_role_assignments(cmd, assignee=None, role=None, resource_group_name=Non
         scope = _build_role_scope(resource_group_name, scope,
                                   definitions_client.config.subscription_id)
 
-    assignments = _search_role_assignments(cmd.cli_ctx, assignments_client, definitions_client,
-                                           scope, assignee, role,
+    # the assignment listing and the classic administrators are independent, so fetch them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assignments_task = executor.submit(_search_role_assignments, cmd.cli_ctx, assignments_client,
+                                           definitions_client, scope, assignee, role,
                                            include_inherited, include_groups)
-
-    results = todict(assignments) if assignments else []
-    if include_classic_administrators:
-        results += _backfill_assignments_for_co_admins(cmd.cli_ctx, factory, assignee)
+        co_admins_task = executor.submit(_backfill_assignments_for_co_admins, cmd.cli_ctx, factory,
+                                         assignee) if include_classic_administrators else None
+        assignments = assignments_task.result()
+        results = todict(assignments) if assignments else []
+        if co_admins_task:
+            results += co_admins_task.result()
 
     if not results:
         return []
@@ -195,35 +249,61 @@ def list_role_assignments(cmd, assignee=None, role=None, resource_group_name=Non
     # 1. fill in logic names to get things understandable.
     # (it's possible that associated roles and principals were deleted, and we just do nothing.)
     # 2. fill in role names
-    role_defs = list(definitions_client.list(
-        scope=scope or ('/subscriptions/' + definitions_client.config.subscription_id)))
     worker = MultiAPIAdaptor(cmd.cli_ctx)
-    role_dics = {i.id: worker.get_role_property(i, 'role_name') for i in role_defs}
+    name_cache = _RoleNameCache(cmd.cli_ctx)
+    role_def_ids = set(worker.get_role_property(i, 'roleDefinitionId')
+                       for i in results if not i.get('roleDefinitionName'))
+    principal_ids = set(worker.get_role_property(i, 'principalId')
+                        for i in results if worker.get_role_property(i, 'principalId'))
+    role_dics = name_cache.get_many(_ROLE_DEFINITION_NAMES, role_def_ids)
+    principal_dics = name_cache.get_many(_PRINCIPAL_NAMES, principal_ids)
+
+    def _list_role_definition_names():
+        role_defs = definitions_client.list(
+            scope=scope or ('/subscriptions/' + definitions_client.config.subscription_id))
+        return {i.id: worker.get_role_property(i, 'role_name') for i in role_defs}
+
+    def _list_principal_names(object_ids):
+        return {i.object_id: _get_displayable_name(i) for i in _get_object_stubs(graph_client, object_ids)}
+
+    # resolve whatever the cache could not answer, role definitions and principals concurrently
+    principals_resolved = True
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        definitions_task = executor.submit(_list_role_definition_names) \
+            if role_def_ids - set(role_dics) else None
+        principals_task = executor.submit(_list_principal_names, principal_ids - set(principal_dics)) \
+            if principal_ids - set(principal_dics) else None
+        if definitions_task:
+            fetched = definitions_task.result()
+            role_dics.update(fetched)
+            name_cache.update(_ROLE_DEFINITION_NAMES, fetched)
+        if principals_task:
+            try:
+                fetched = principals_task.result()
+                principal_dics.update(fetched)
+                name_cache.update(_PRINCIPAL_NAMES, fetched)
+            except (CloudError, GraphErrorException) as ex:
+                # failure on resolving principal due to graph permission should not fail the whole thing
+                logger.info("Failed to resolve graph object information per error '%s'", ex)
+                principals_resolved = False
+    name_cache.save()
+
+    role_dics = {k.lower(): v for k, v in role_dics.items()}
     for i in results:
         if not i.get('roleDefinitionName'):
-            if role_dics.get(worker.get_role_property(i, 'roleDefinitionId')):
-                worker.set_role_property(i, 'roleDefinitionName',
-                                         role_dics[worker.get_role_property(i, 'roleDefinitionId')])
+            role_name = role_dics.get((worker.get_role_property(i, 'roleDefinitionId') or '').lower())
+            if role_name:
+                worker.set_role_property(i, 'roleDefinitionName', role_name)
             else:
                 i['roleDefinitionName'] = None  # the role definition might have been deleted
 
     # fill in principal names
-    principal_ids = set(worker.get_role_property(i, 'principalId')
-                        for i in results if worker.get_role_property(i, 'principalId'))
-
-    if principal_ids:
-        try:
-            principals = _get_object_stubs(graph_client, principal_ids)
-            principal_dics = {i.object_id: _get_displayable_name(i) for i in principals}
-
-            for i in [r for r in results if not r.get('principalName')]:
-                i['principalName'] = ''
-                if principal_dics.get(worker.get_role_property(i, 'principalId')):
-                    worker.set_role_property(i, 'principalName',
-                                             principal_dics[worker.get_role_property(i, 'principalId')])
-        except (CloudError, GraphErrorException) as ex:
-            # failure on resolving principal due to graph permission should not fail the whole thing
-            logger.info("Failed to resolve graph object information per error '%s'", ex)
+    if principal_ids and principals_resolved:
+        for i in [r for r in results if not r.get('principalName')]:
+            i['principalName'] = ''
+            if principal_dics.get(worker.get_role_property(i, 'principalId')):
+                worker.set_role_property(i, 'principalName',
+                                         principal_dics[worker.get_role_property(i, 'principalId')])
 
     for r in results:
         if not r.get('additionalProperties'):  # remove the useless "additionalProperties"
@@ -473,11 +553,11 @@ def _search_role_assignments(cli_ctx, assignments_client, definitions_client,
 
     worker = MultiAPIAdaptor(cli_ctx)
     if assignments:
-        assignments = [a for a in assignments if (
-            not scope or
-            include_inherited and re.match(worker.get_role_property(a, 'scope'), scope, re.I) or
-            worker.get_role_property(a, 'scope').lower() == scope.lower()
-        )]
+        if scope:
+            # compare path segments against the scope and its parents, instead of a regex per assignment
+            matching_scopes = _get_parent_scopes(scope) if include_inherited else {_normalize_scope(scope)}
+            assignments = [a for a in assignments
+                           if _normalize_scope(worker.get_role_property(a, 'scope')) in matching_scopes]
 
         if role:
             role_id = _resolve_role_id(role, scope, definitions_client)
@@ -489,6 +569,16 @@ def _search_role_assignments(cli_ctx, assignments_client, definitions_client,
     return assignments
 
 
+def _normalize_scope(scope):
+    return '/' + '/'.join(p for p in scope.lower().split('/') if p)
+
+
+def _get_parent_scopes(scope):
+    """ Return the normalized scope along with every scope above it, up to the root scope '/'. """
+    parts = [p for p in scope.lower().split('/') if p]
+    return {'/' + '/'.join(parts[:i]) for i in range(len(parts) + 1)}
+
+
 def _build_role_scope(resource_group_name, scope, subscription_id):
     subscription_scope = '/subscriptions/' + subscription_id
     if scope:
@@ -1710,14 +1800,23 @@ def _is_guid(guid):
         return False
 
 
+_MAX_GRAPH_LOOKUP_THREADS = 5
+
+
 def _get_object_stubs(graph_client, assignees):
     from azure.graphrbac.models import GetObjectsParameters
-    result = []
     assignees = list(assignees)  # callers could pass in a set
-    for i in range(0, len(assignees), 1000):
-        params = GetObjectsParameters(include_directory_object_references=True, object_ids=assignees[i:i + 1000])
-        result += list(graph_client.objects.get_objects_by_object_ids(params))
-    return result
+
+    def _get_chunk(start):
+        params = GetObjectsParameters(include_directory_object_references=True,
+                                      object_ids=assignees[start:start + 1000])
+        return list(graph_client.objects.get_objects_by_object_ids(params))
+
+    chunks = range(0, len(assignees), 1000)
+    if len(chunks) <= 1:
+        return [o for start in chunks for o in _get_chunk(start)]
+    with ThreadPoolExecutor(max_workers=min(len(chunks), _MAX_GRAPH_LOOKUP_THREADS)) as executor:
+        return [o for objects in executor.map(_get_chunk, chunks) for o in objects]
 
 
 def _get_owner_url(cli_ctx, owner_object_id):
@@ -397,15 +397,69 @@ class TestRoleMocked(unittest.TestCase):
         _get_object_stubs(graph_client, assignees)
 
         # assert
-        # we get called with right args
+        # we get called with right args; chunks are fetched concurrently so the call order may vary
         self.assertEqual(graph_client.objects.get_objects_by_object_ids.call_count, 3)
         object_groups = []
         for i in range(0, 2001, 1000):
             object_groups.append([i for i in range(i, min(i + 1000, 2001))])
 
-        for call, group in zip(graph_client.objects.get_objects_by_object_ids.call_args_list, object_groups):
-            args, _ = call
-            self.assertEqual(args[0].object_ids, group)
+        called_groups = sorted((args[0].object_ids for args, _ in
+                                graph_client.objects.get_objects_by_object_ids.call_args_list), key=lambda g: g[0])
+        self.assertEqual(called_groups, object_groups)
+
+    @mock.patch('azure.cli.command_modules.role.custom._graph_client_factory', autospec=True)
+    @mock.patch('azure.cli.command_modules.role.custom._auth_client_factory', autospec=True)
+    def test_role_assignment_list_inherited_with_name_cache(self, auth_client_mock, graph_client_mock):
+        import shutil
+        from azure.cli.core.profiles import get_sdk, ResourceType
+        from azure.cli.command_modules.role.custom import list_role_assignments
+        RoleAssignment = get_sdk(DummyCli(), ResourceType.MGMT_AUTHORIZATION, 'RoleAssignment', mod='models',
+                                 operation_group='role_assignments')
+        reader_id = self.default_scope + '/providers/Microsoft.Authorization/roleDefinitions/reader'
+        rg_scope = self.default_scope + '/resourceGroups/rg'
+
+        def _assignment(scope, principal_id):
+            return RoleAssignment(scope=scope, role_definition_id=reader_id, principal_id=principal_id)
+
+        def _named(attr, value, name_attr, name):
+            result = mock.MagicMock()
+            setattr(result, attr, value)
+            setattr(result, name_attr, name)
+            return result
+
+        factory = auth_client_mock.return_value
+        factory.role_definitions.config.subscription_id = self.subscription_id
+        factory.role_assignments.list_for_scope.return_value = [
+            _assignment('/', 'p1'),
+            _assignment(self.default_scope, 'p2'),
+            _assignment(rg_scope.upper() + '/', 'p1'),
+            _assignment(self.default_scope + '/resourceGroups/rg2', 'p3'),  # a sibling, not a parent
+            _assignment(rg_scope + '/providers/Microsoft.Web/sites/app', 'p3'),  # a child
+        ]
+        factory.role_definitions.list.return_value = [_named('id', reader_id, 'role_name', 'Reader')]
+        graph_client = graph_client_mock.return_value
+        graph_client.objects.get_objects_by_object_ids.return_value = [
+            _named('object_id', 'p1', 'user_principal_name', 'john@contoso.com'),
+            _named('object_id', 'p2', 'user_principal_name', 'jane@contoso.com')
+        ]
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir)
+
+        cmd = mock.MagicMock()
+        cmd.cli_ctx = DummyCli()
+        with mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': config_dir}):
+            result = list_role_assignments(cmd, scope=rg_scope, include_inherited=True)
+            self.assertEqual([r['scope'] for r in result], ['/', self.default_scope, rg_scope.upper() + '/'])
+            self.assertEqual([r['principalName'] for r in result],
+                             ['john@contoso.com', 'jane@contoso.com', 'john@contoso.com'])
+            self.assertTrue(all(r['roleDefinitionName'] == 'Reader' for r in result))
+
+            # names are served from the local cache the second time
+            result = list_role_assignments(cmd, scope=rg_scope)
+            self.assertEqual([r['principalName'] for r in result], ['john@contoso.com'])
+            self.assertEqual([r['roleDefinitionName'] for r in result], ['Reader'])
+            factory.role_definitions.list.assert_called_once()
+            graph_client.objects.get_objects_by_object_ids.assert_called_once()
 
 
 class FakedError(object):  # pylint: disable=too-few-public-methods
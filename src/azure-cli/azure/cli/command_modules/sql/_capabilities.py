@@ -0,0 +1,118 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+'''
+Cache of the location capabilities.
+
+The capabilities of a location are a document of several megabytes describing every edition,
+family and service objective available there. Resolving the sku of each database, elastic pool or
+managed instance created by a script would fetch it again, so the capabilities are kept on disk
+per cloud, subscription, location and capability group for CAPABILITY_CACHE_TTL seconds.
+'''
+
+import json
+import os
+import re
+import time
+
+from knack.log import get_logger
+
+from azure.cli.core.util import atomic_write
+
+logger = get_logger(__name__)
+
+CAPABILITY_CACHE_TTL = 6 * 3600
+CAPABILITY_CACHE_DIR = 'sqlCapabilities'
+
+# Location capabilities loaded by this process, by cache file path
+_capabilities = {}
+# Cache file paths of the capabilities fetched from the service by this process
+_fetched = set()
+# Indexes of the capability lists, by id of the list. The list is kept with its index so its id isn't reused.
+_indexes = {}
+
+
+def _cache_path(cli_ctx, subscription_id, location, group):
+    name = '_'.join(str(p) for p in (cli_ctx.cloud.name, subscription_id, location, group or 'all'))
+    return os.path.join(cli_ctx.config.config_dir, CAPABILITY_CACHE_DIR,
+                        re.sub(r'[^A-Za-z0-9_.-]', '', name).lower() + '.json')
+
+
+def _read_cached(path):
+    from azure.mgmt.sql.models import LocationCapabilities
+    try:
+        with open(path, 'r') as cache_file:
+            content = json.load(cache_file)
+        if content['time'] + CAPABILITY_CACHE_TTL < time.time():
+            return None
+        return LocationCapabilities.deserialize(content['capabilities'])
+    except (OSError, IOError, ValueError, KeyError, TypeError) as ex:
+        if os.path.exists(path):
+            logger.debug("Discarding the location capabilities '%s': %s", path, ex)
+        return None
+
+
+def _write_cached(path, capabilities):
+    content = {'time': time.time(), 'capabilities': capabilities.serialize(keep_readonly=True)}
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with atomic_write(path) as cache_file:
+            json.dump(content, cache_file, separators=(',', ':'))
+    except (OSError, IOError, TypeError, ValueError) as ex:
+        logger.debug("Unable to save the location capabilities '%s': %s", path, ex)
+
+
+def get_location_capabilities(cli_ctx, client, location, group):
+    '''
+    Gets the capabilities of a location, from the cache if they were fetched less than
+    CAPABILITY_CACHE_TTL seconds ago.
+
+    The returned capabilities are shared by the callers in this process and must not be modified.
+    '''
+
+    path = _cache_path(cli_ctx, client.config.subscription_id, location, group)
+    capabilities = _capabilities.get(path) or _read_cached(path)
+    if capabilities is None:
+        capabilities = client.list_by_location(location, group)
+        _fetched.add(path)
+        _write_cached(path, capabilities)
+    _capabilities[path] = capabilities
+    return capabilities
+
+
+def invalidate_location_capabilities(cli_ctx, client, location, group):
+    '''
+    Removes the capabilities of a location from the cache, unless they were fetched by this process.
+
+    Returns True if cached capabilities were removed, so fetching them again may give a different result.
+    '''
+
+    path = _cache_path(cli_ctx, client.config.subscription_id, location, group)
+    if path in _fetched:
+        return False
+    removed = _capabilities.pop(path, None) is not None
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+            removed = True
+        except (OSError, IOError) as ex:
+            logger.debug("Unable to remove the location capabilities '%s': %s", path, ex)
+    return removed
+
+
+def index_capabilities(capabilities, key):
+    '''
+    Indexes a list of capabilities by the value of key(capability), keeping the first capability
+    of each value. The index of a list is built once.
+    '''
+
+    entry = _indexes.get((id(capabilities), key))
+    if entry is None or entry[0] is not capabilities:
+        index = {}
+        for capability in capabilities:
+            index.setdefault(key(capability), capability)
+        entry = _indexes[(id(capabilities), key)] = (capabilities, index)
+    return entry[1]
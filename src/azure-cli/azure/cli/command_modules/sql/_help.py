@@ -132,10 +132,15 @@ examples:
 helps['sql db list'] = """
 type: command
 short-summary: List databases a server or elastic pool.
+long-summary: >
+    If no server is specified, lists the databases of all the servers in the resource group, or in the
+    subscription if no resource group is specified. The servers are queried concurrently.
 examples:
   - name: List databases a server or elastic pool. (autogenerated)
     text: az sql db list --resource-group MyResourceGroup --server myserver
     crafted: true
+  - name: List the databases of all the servers in the subscription, with their usages.
+    text: az sql db list --include-usages
 """
 
 helps['sql db list-editions'] = """
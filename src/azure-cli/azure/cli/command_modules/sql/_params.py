@@ -574,10 +574,21 @@ def load_arguments(self, _):
         c.ignore('expand')
 
     with self.argument_context('sql db list') as c:
+        c.argument('server_name',
+                   arg_type=server_param_type,
+                   help='Name of the Azure SQL server. If not specified, lists the databases of all the servers '
+                   'in the resource group, or in the subscription if no resource group is specified.')
+
         c.argument('elastic_pool_name',
                    options_list=['--elastic-pool'],
                    help='If specified, lists only the databases in this elastic pool')
 
+        c.argument('include_usages',
+                   options_list=['--include-usages'],
+                   action='store_true',
+                   help='If specified, includes the usages of each database, which takes one more request '
+                   'per database.')
+
     with self.argument_context('sql db list-editions') as c:
         c.argument('show_details',
                    options_list=['--show-details', '-d'],
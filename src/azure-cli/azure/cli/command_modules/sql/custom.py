@@ -4,7 +4,9 @@
 # --------------------------------------------------------------------------------------------
 
 # pylint: disable=C0302
+from copy import deepcopy
 from enum import Enum
+from functools import wraps
 
 from azure.cli.core.util import (
     CLIError,
@@ -43,8 +45,15 @@ from azure.mgmt.sql.models import (
 
 from knack.log import get_logger
 
+from ._capabilities import (
+    get_location_capabilities,
+    index_capabilities,
+    invalidate_location_capabilities,
+)
+
 from ._util import (
     get_sql_capabilities_operations,
+    get_sql_database_usages_operations,
     get_sql_servers_operations,
     get_sql_managed_instances_operations,
     get_sql_restorable_dropped_database_managed_backup_short_term_retention_policies_operations,
@@ -100,14 +109,48 @@ def _get_managed_instance_location(cli_ctx, managed_instance_name, resource_grou
 def _get_location_capability(cli_ctx, location, group):
     '''
     Gets the location capability for a location and verifies that it is available.
+
+    The location capability is cached, so it must not be modified.
     '''
 
     capabilities_client = get_sql_capabilities_operations(cli_ctx, None)
-    location_capability = capabilities_client.list_by_location(location, group)
+    location_capability = get_location_capabilities(cli_ctx, capabilities_client, location, group)
     _assert_capability_available(location_capability)
     return location_capability
 
 
+def _refresh_location_capability_on_error(group):
+    '''
+    Decorates a function finding a sku from the cached capabilities of a location, so that it
+    is retried with freshly fetched capabilities when the sku cannot be found, in case the
+    cached ones are out of date.
+    '''
+
+    def _decorator(find_sku_func):
+        @wraps(find_sku_func)
+        def _find_sku(cli_ctx, location, *args, **kwargs):
+            try:
+                return find_sku_func(cli_ctx, location, *args, **kwargs)
+            except CLIError:
+                capabilities_client = get_sql_capabilities_operations(cli_ctx, None)
+                if not invalidate_location_capabilities(cli_ctx, capabilities_client, location, group):
+                    raise
+                logger.debug('Retrying %s with the current capabilities of %s', find_sku_func.__name__, location)
+                return find_sku_func(cli_ctx, location, *args, **kwargs)
+        return _find_sku
+    return _decorator
+
+
+def _capability_name(capability):
+    return capability.name
+
+
+def _service_level_objective_key(slo):
+    return (slo.sku.family,
+            int(slo.sku.capacity) if slo.sku.capacity is not None else None,
+            _is_serverless_slo(slo.sku.name))
+
+
 def _any_sku_values_specified(sku):
     '''
     Returns True if the sku object has any properties that are specified
@@ -230,16 +273,16 @@ def _find_edition_capability(sku, supported_editions):
 
     if sku.tier:
         # Find requested edition capability
-        try:
-            return next(e for e in supported_editions if e.name == sku.tier)
-        except StopIteration:
+        edition = index_capabilities(supported_editions, _capability_name).get(sku.tier)
+        if edition is None:
             candidate_editions = [e.name for e in supported_editions]
             raise CLIError('Could not find tier ''{}''. Supported tiers are: {}'.format(
                 sku.tier, candidate_editions
             ))
-    else:
-        # Find default edition capability
-        return _get_default_capability(supported_editions)
+        return edition
+
+    # Find default edition capability
+    return _get_default_capability(supported_editions)
 
 
 def _find_family_capability(sku, supported_families):
@@ -253,16 +296,16 @@ def _find_family_capability(sku, supported_families):
 
     if sku.family:
         # Find requested family capability
-        try:
-            return next(f for f in supported_families if f.name == sku.family)
-        except StopIteration:
+        family = index_capabilities(supported_families, _capability_name).get(sku.family)
+        if family is None:
             candidate_families = [e.name for e in supported_families]
             raise CLIError('Could not find family ''{}''. Supported families are: {}'.format(
                 sku.family, candidate_families
             ))
-    else:
-        # Find default family capability
-        return _get_default_capability(supported_families)
+        return family
+
+    # Find default family capability
+    return _get_default_capability(supported_families)
 
 
 def _find_performance_level_capability(sku, supported_service_level_objectives, allow_reset_family, compute_model=None):
@@ -279,15 +322,14 @@ def _find_performance_level_capability(sku, supported_service_level_objectives,
                  sku, supported_service_level_objectives, allow_reset_family, compute_model)
 
     if sku.capacity:
-        try:
-            # Find requested service objective based on capacity & family.
-            # Note that for non-vcore editions, family is None.
-            return next(slo for slo in supported_service_level_objectives
-                        if ((slo.sku.family == sku.family) or
-                            (slo.sku.family is None and allow_reset_family)) and
-                        int(slo.sku.capacity) == int(sku.capacity) and
-                        _compute_model_matches(slo.sku.name, compute_model))
-        except StopIteration:
+        # Find requested service objective based on capacity & family.
+        # Note that for non-vcore editions, family is None.
+        slos = index_capabilities(supported_service_level_objectives, _service_level_objective_key)
+        serverless = compute_model == ComputeModelType.serverless
+        slo = slos.get((sku.family, int(sku.capacity), serverless))
+        if slo is None and allow_reset_family:
+            slo = slos.get((None, int(sku.capacity), serverless))
+        if slo is None:
             if allow_reset_family:
                 raise CLIError(
                     "Could not find sku in tier '{tier}' with capacity {capacity}."
@@ -307,12 +349,13 @@ def _find_performance_level_capability(sku, supported_service_level_objectives,
                     skus=[(slo.sku.family, slo.sku.capacity)
                           for slo in supported_service_level_objectives]
                 ))
-    elif sku.family:
+        return slo
+    if sku.family:
         # Error - cannot find based on family alone.
         raise CLIError('If --family is specified, --capacity must also be specified.')
-    else:
-        # Find default service objective
-        return _get_default_capability(supported_service_level_objectives)
+
+    # Find default service objective
+    return _get_default_capability(supported_service_level_objectives)
 
 
 def _db_elastic_pool_update_sku(
@@ -661,6 +704,7 @@ class DatabaseIdentity():  # pylint: disable=too-few-public-methods
             quote(self.database_name))
 
 
+@_refresh_location_capability_on_error(CapabilityGroup.supported_editions)
 def _find_db_sku_from_capabilities(cli_ctx, location, sku, allow_reset_family=False, compute_model=None):
     '''
     Given a requested sku which may have some properties filled in
@@ -1033,6 +1077,7 @@ class DatabaseCapabilitiesAdditionalDetails(Enum):  # pylint: disable=too-few-pu
 
 
 def db_list_capabilities(
+        cmd,
         client,
         location,
         edition=None,
@@ -1049,8 +1094,9 @@ def db_list_capabilities(
     if not show_details:
         show_details = []
 
-    # Get capabilities tree from server
-    capabilities = client.list_by_location(location, CapabilityGroup.supported_editions)
+    # Get capabilities tree, copied from the cache since it is filtered in place
+    capabilities = deepcopy(get_location_capabilities(
+        cmd.cli_ctx, client, location, CapabilityGroup.supported_editions))
 
     # Get subtree related to databases
     editions = _get_default_server_version(capabilities).supported_editions
@@ -1211,24 +1257,103 @@ def _pad_sas_key(
     return storage_key
 
 
+# Maximum number of servers whose databases are listed concurrently
+MAX_CONCURRENT_SERVER_REQUESTS = 8
+
+
 def db_list(
+        cmd,
         client,
-        server_name,
-        resource_group_name,
-        elastic_pool_name=None):
+        server_name=None,
+        resource_group_name=None,
+        elastic_pool_name=None,
+        include_usages=False):
     '''
-    Lists databases in a server or elastic pool.
+    Lists databases in a server or elastic pool, or in all the servers of
+    the subscription or resource group.
     '''
 
+    if not server_name:
+        if elastic_pool_name:
+            raise CLIError('--server must be specified with --elastic-pool.')
+
+        # List all databases in all servers
+        return _db_list_in_servers(cmd.cli_ctx, client, resource_group_name, include_usages)
+
+    if not resource_group_name:
+        raise CLIError('--resource-group must be specified with --server.')
+
     if elastic_pool_name:
         # List all databases in the elastic pool
-        return client.list_by_elastic_pool(
+        databases = client.list_by_elastic_pool(
             server_name=server_name,
             resource_group_name=resource_group_name,
             elastic_pool_name=elastic_pool_name)
-
+    else:
         # List all databases in the server
-    return client.list_by_server(resource_group_name=resource_group_name, server_name=server_name)
+        databases = client.list_by_server(resource_group_name=resource_group_name, server_name=server_name)
+
+    if include_usages:
+        databases = _db_add_usages(cmd.cli_ctx, resource_group_name, server_name, list(databases))
+    return databases
+
+
+def _db_add_usages(cli_ctx, resource_group_name, server_name, databases):
+    '''
+    Adds the usages of each database to the database.
+    '''
+
+    usages_client = get_sql_database_usages_operations(cli_ctx, None)
+    for db in databases:
+        db.usages = list(usages_client.list_by_database(
+            resource_group_name=resource_group_name,
+            server_name=server_name,
+            database_name=db.name))
+    return databases
+
+
+def _db_list_in_servers(cli_ctx, client, resource_group_name, include_usages):
+    '''
+    Lists the databases of all the servers of the subscription or resource group.
+
+    The servers are listed concurrently, at most MAX_CONCURRENT_SERVER_REQUESTS at
+    a time. A server whose databases cannot be listed is reported and skipped.
+    '''
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from msrestazure.azure_exceptions import CloudError
+    from msrestazure.tools import parse_resource_id
+
+    servers_client = get_sql_servers_operations(cli_ctx, None)
+    if resource_group_name:
+        servers = list(servers_client.list_by_resource_group(resource_group_name=resource_group_name))
+    else:
+        servers = list(servers_client.list())
+
+    def _list_server_databases(server):
+        server_resource_group = parse_resource_id(server.id)['resource_group']
+        databases = list(client.list_by_server(resource_group_name=server_resource_group, server_name=server.name))
+        if include_usages:
+            _db_add_usages(cli_ctx, server_resource_group, server.name, databases)
+        return databases
+
+    hook = cli_ctx.get_progress_controller(det=True)
+    databases = {}
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SERVER_REQUESTS) as executor:
+            futures = {executor.submit(_list_server_databases, server): server for server in servers}
+            for completed, future in enumerate(as_completed(futures), 1):
+                server = futures[future]
+                try:
+                    databases[server.id] = future.result()
+                except CloudError as ex:
+                    logger.warning("Unable to list the databases of server '%s': %s", server.name, ex)
+                hook.add(message='Listed the databases of {} of {} servers'.format(completed, len(servers)),
+                         value=completed, total_val=len(servers))
+    finally:
+        hook.end()
+
+    # Keep the order of the servers, regardless of which ones completed first
+    return [db for server in servers for db in databases.get(server.id, [])]
 
 
 def db_update(
@@ -1340,7 +1465,7 @@ def db_update(
 
 def _find_storage_account_resource_group(cli_ctx, name):
     '''
-    Finds a storage account's resource group by querying ARM resource cache.
+    Finds a storage account's resource group from the IDs of the storage accounts of the subscription.
 
     Why do we have to do this: so we know the resource group in order to later query the storage API
     to determine the account's keys and endpoint. Why isn't this just a command line parameter:
@@ -1348,31 +1473,46 @@ def _find_storage_account_resource_group(cli_ctx, name):
     resource group just to update some unrelated property, which is annoying and makes no sense to
     the customer.
     '''
-    from azure.cli.core.profiles import ResourceType
-    from azure.cli.core.commands.client_factory import get_mgmt_service_client
+    from azure.cli.core.commands.resource_ids import resolve_resource_id_by_type
 
     storage_type = 'Microsoft.Storage/storageAccounts'
     classic_storage_type = 'Microsoft.ClassicStorage/storageAccounts'
 
-    query = "name eq '{}' and (resourceType eq '{}' or resourceType eq '{}')".format(
-        name, storage_type, classic_storage_type)
+    # The storage accounts of the subscription are listed once and their IDs cached, so updating
+    # the policies of many databases doesn't query ARM for the same account every time.
+    storage_id = resolve_resource_id_by_type(cli_ctx, storage_type, name)
 
-    client = get_mgmt_service_client(cli_ctx, ResourceType.MGMT_RESOURCE_RESOURCES)
-    resources = list(client.resources.list(filter=query))
-
-    if not resources:
+    if not storage_id:
+        if resolve_resource_id_by_type(cli_ctx, classic_storage_type, name):
+            raise CLIError("The storage account with name '{}' is a classic storage account which is"
+                           " not supported by this command. Use a non-classic storage account or"
+                           " specify storage endpoint and key instead.".format(name))
         raise CLIError("No storage account with name '{}' was found.".format(name))
 
-    if len(resources) > 1:
-        raise CLIError("Multiple storage accounts with name '{}' were found.".format(name))
+    # Split the uri and return just the resource group
+    return storage_id.split('/')[4]
 
-    if resources[0].type == classic_storage_type:
-        raise CLIError("The storage account with name '{}' is a classic storage account which is"
-                       " not supported by this command. Use a non-classic storage account or"
-                       " specify storage endpoint and key instead.".format(name))
 
-    # Split the uri and return just the resource group
-    return resources[0].id.split('/')[4]
+def _call_with_storage_account_resource_group(cli_ctx, storage_account, resource_group_name, operation):
+    '''
+    Calls a storage account operation with the account's resource group, as found by
+    _find_storage_account_resource_group.
+
+    If the account isn't found, it may have been deleted or moved since its ID was cached, so its
+    resource group is found again and the operation retried once.
+    '''
+    from msrestazure.azure_exceptions import CloudError
+    from azure.cli.core.commands.client_factory import get_subscription_id
+    from azure.cli.core.commands.resource_ids import invalidate_resource_id
+
+    try:
+        return operation(resource_group_name=resource_group_name, account_name=storage_account)
+    except CloudError as ex:
+        if ex.status_code != 404:
+            raise
+    invalidate_resource_id(get_subscription_id(cli_ctx), 'Microsoft.Storage/storageAccounts', storage_account)
+    return operation(resource_group_name=_find_storage_account_resource_group(cli_ctx, storage_account),
+                     account_name=storage_account)
 
 
 def _get_storage_account_name(storage_endpoint):
@@ -1398,9 +1538,8 @@ def _get_storage_endpoint(
 
     # Get storage account
     client = get_mgmt_service_client(cli_ctx, StorageManagementClient)
-    account = client.storage_accounts.get_properties(
-        resource_group_name=resource_group_name,
-        account_name=storage_account)
+    account = _call_with_storage_account_resource_group(
+        cli_ctx, storage_account, resource_group_name, client.storage_accounts.get_properties)
 
     # Get endpoint
     # pylint: disable=no-member
@@ -1425,9 +1564,8 @@ def _get_storage_key(
 
     # Get storage keys
     client = get_mgmt_service_client(cli_ctx, StorageManagementClient)
-    keys = client.storage_accounts.list_keys(
-        resource_group_name=resource_group_name,
-        account_name=storage_account)
+    keys = _call_with_storage_account_resource_group(
+        cli_ctx, storage_account, resource_group_name, client.storage_accounts.list_keys)
 
     # Choose storage key
     index = 1 if use_secondary_key else 0
@@ -1769,6 +1907,7 @@ def dw_resume(
 ###############################################
 
 
+@_refresh_location_capability_on_error(CapabilityGroup.supported_elastic_pool_editions)
 def _find_elastic_pool_sku_from_capabilities(cli_ctx, location, sku, allow_reset_family=False, compute_model=None):
     '''
     Given a requested sku which may have some properties filled in
@@ -1902,6 +2041,7 @@ class ElasticPoolCapabilitiesAdditionalDetails(Enum):  # pylint: disable=too-few
 
 
 def elastic_pool_list_capabilities(
+        cmd,
         client,
         location,
         edition=None,
@@ -1919,8 +2059,9 @@ def elastic_pool_list_capabilities(
     if dtu:
         dtu = int(dtu)
 
-    # Get capabilities tree from server
-    capabilities = client.list_by_location(location, CapabilityGroup.supported_elastic_pool_editions)
+    # Get capabilities tree, copied from the cache since it is filtered in place
+    capabilities = deepcopy(get_location_capabilities(
+        cmd.cli_ctx, client, location, CapabilityGroup.supported_elastic_pool_editions))
 
     # Get subtree related to elastic pools
     editions = _get_default_server_version(capabilities).supported_elastic_pool_editions
@@ -2019,6 +2160,7 @@ def instance_pool_create(
                        parameters=kwargs)
 
 
+@_refresh_location_capability_on_error(CapabilityGroup.supported_managed_instance_versions)
 def _find_instance_pool_sku_from_capabilities(cli_ctx, location, sku):
     '''
     Validate if the sku family and edition input by user are permissible in the region using
@@ -2371,6 +2513,7 @@ def encryption_protector_update(
 ###############################################
 
 
+@_refresh_location_capability_on_error(CapabilityGroup.supported_managed_instance_versions)
 def _find_managed_instance_sku_from_capabilities(
         cli_ctx,
         location,
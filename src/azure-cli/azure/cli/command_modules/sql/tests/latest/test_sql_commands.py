@@ -5,6 +5,11 @@
 
 import time
 import os
+import shutil
+import tempfile
+import unittest
+
+import mock
 
 from azure_devtools.scenario_tests import AllowLargeResponse, live_only
 
@@ -25,10 +30,14 @@ from azure.cli.testsdk import (
 from azure.cli.testsdk.preparers import (
     AbstractPreparer,
     SingleValueReplacer)
+from azure.cli.command_modules.sql import _capabilities
 from azure.cli.command_modules.sql.custom import (
     ClientAuthenticationType,
     ClientType,
-    ComputeModelType)
+    ComputeModelType,
+    _find_performance_level_capability,
+    db_list)
+from azure.mgmt.sql.models import CapabilityGroup, LocationCapabilities, Sku
 from datetime import datetime, timedelta
 from time import sleep
 
@@ -4427,3 +4436,118 @@ class SqlServerMinimalTlsVersionScenarioTest(ScenarioTest):
                      JMESPathCheck('name', server_name_1),
                      JMESPathCheck('resourceGroup', resource_group),
                      JMESPathCheck('minimalTlsVersion', tls1_1)])
+
+
+class SqlLocationCapabilityCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        self.cli_ctx = mock.MagicMock()
+        self.cli_ctx.config.config_dir = temp_dir
+        self.cli_ctx.cloud.name = 'AzureCloud'
+        self.client = mock.MagicMock()
+        self.client.config.subscription_id = '00000000-0000-0000-0000-000000000000'
+        self.client.list_by_location.side_effect = lambda location, group: LocationCapabilities.deserialize({
+            'name': location,
+            'status': 'Available',
+            'supportedServerVersions': [{'name': '12.0', 'status': 'Default', 'supportedEditions': [{
+                'name': 'GeneralPurpose',
+                'status': 'Default',
+                'supportedServiceLevelObjectives': [
+                    {'name': 'GP_Gen5_2', 'status': 'Default',
+                     'sku': {'name': 'GP_Gen5', 'tier': 'GeneralPurpose', 'family': 'Gen5', 'capacity': 2}},
+                    {'name': 'GP_S_Gen5_2', 'status': 'Available',
+                     'sku': {'name': 'GP_S_Gen5', 'tier': 'GeneralPurpose', 'family': 'Gen5', 'capacity': 2}}]}]}]})
+        for state in (_capabilities._capabilities, _capabilities._fetched):  # pylint: disable=protected-access
+            self.addCleanup(state.clear)
+
+    def _get_capabilities(self):
+        return _capabilities.get_location_capabilities(
+            self.cli_ctx, self.client, 'westus', CapabilityGroup.supported_editions)
+
+    def test_sql_location_capabilities_are_cached(self):
+        capabilities = self._get_capabilities()
+        self.assertIs(self._get_capabilities(), capabilities)
+
+        # the next commands read the capabilities from the disk
+        _capabilities._capabilities.clear()  # pylint: disable=protected-access
+        _capabilities._fetched.clear()  # pylint: disable=protected-access
+        slos = self._get_capabilities().supported_server_versions[0].supported_editions[0] \
+            .supported_service_level_objectives
+        self.assertEqual(self.client.list_by_location.call_count, 1)
+
+        sku = Sku(name=None, family='Gen5', capacity=2)
+        self.assertEqual(_find_performance_level_capability(sku, slos, False).name, 'GP_Gen5_2')
+        self.assertEqual(_find_performance_level_capability(sku, slos, False, ComputeModelType.serverless).name,
+                         'GP_S_Gen5_2')
+        with self.assertRaises(CLIError):
+            _find_performance_level_capability(Sku(name=None, family='Gen4', capacity=2), slos, False)
+
+    def test_sql_location_capabilities_fetched_by_another_command_are_invalidated(self):
+        self._get_capabilities()
+        self.assertFalse(_capabilities.invalidate_location_capabilities(
+            self.cli_ctx, self.client, 'westus', CapabilityGroup.supported_editions))
+
+        _capabilities._fetched.clear()  # pylint: disable=protected-access
+        self.assertTrue(_capabilities.invalidate_location_capabilities(
+            self.cli_ctx, self.client, 'westus', CapabilityGroup.supported_editions))
+        self._get_capabilities()
+        self.assertEqual(self.client.list_by_location.call_count, 2)
+
+
+class SqlDbListAllServersTest(unittest.TestCase):
+
+    @mock.patch('azure.cli.command_modules.sql.custom.get_sql_servers_operations', autospec=True)
+    def test_sql_db_list_all_servers(self, get_servers_client):
+        from msrestazure.azure_exceptions import CloudError
+
+        def _server(name):
+            server = mock.Mock(id='/subscriptions/sub1/resourceGroups/rg-{0}/providers/Microsoft.Sql/servers/{0}'
+                               .format(name))
+            server.name = name
+            return server
+
+        def _list_by_server(resource_group_name, server_name):
+            if server_name == 'forbidden':
+                raise CloudError(mock.Mock(), error='AuthorizationFailed')
+            if server_name == 'slow':
+                time.sleep(0.1)
+            return ['{}/{}/db{}'.format(resource_group_name, server_name, i) for i in range(2)]
+
+        get_servers_client.return_value.list.return_value = [_server(n) for n in ('slow', 'forbidden', 'fast')]
+        client = mock.Mock()
+        client.list_by_server.side_effect = _list_by_server
+        cmd = mock.MagicMock()
+
+        with mock.patch('azure.cli.command_modules.sql.custom.logger') as logger:
+            databases = db_list(cmd, client)
+        self.assertEqual(databases, ['rg-slow/slow/db0', 'rg-slow/slow/db1', 'rg-fast/fast/db0', 'rg-fast/fast/db1'])
+        self.assertEqual(logger.warning.call_args[0][1], 'forbidden')
+
+        with self.assertRaises(CLIError):
+            db_list(cmd, client, elastic_pool_name='pool1')
+        with self.assertRaises(CLIError):
+            db_list(cmd, client, server_name='fast')
+
+
+class SqlStorageAccountResourceGroupTest(unittest.TestCase):
+
+    @mock.patch('azure.cli.command_modules.sql.custom._find_storage_account_resource_group', autospec=True,
+                return_value='rg2')
+    @mock.patch('azure.cli.core.commands.client_factory.get_subscription_id', autospec=True, return_value='sub1')
+    def test_sql_stale_storage_account_resource_group_is_found_again(self, _, find_resource_group):
+        from msrestazure.azure_exceptions import CloudError
+        from azure.cli.command_modules.sql.custom import _call_with_storage_account_resource_group
+
+        def _get_properties(resource_group_name, account_name):
+            if resource_group_name != 'rg2':
+                raise CloudError(mock.Mock(status_code=404), error='ResourceNotFound')
+            return account_name
+
+        operation = mock.Mock(side_effect=_get_properties)
+        with mock.patch('azure.cli.core.commands.resource_ids.invalidate_resource_id', autospec=True) as invalidate:
+            self.assertEqual(_call_with_storage_account_resource_group(mock.Mock(), 'account1', 'rg1', operation),
+                             'account1')
+        invalidate.assert_called_once_with('sub1', 'Microsoft.Storage/storageAccounts', 'account1')
+        self.assertEqual(operation.call_count, 2)
@@ -23,6 +23,7 @@ from knack.log import get_logger
 from knack.util import CLIError
 
 storage_account_key_options = {'primary': 'key1', 'secondary': 'key2'}
+STORAGE_ACCOUNT_RESOURCE_TYPE = 'Microsoft.Storage/storageAccounts'
 logger = get_logger(__name__)
 
 
@@ -32,25 +33,39 @@ logger = get_logger(__name__)
 # pylint: disable=inconsistent-return-statements,too-many-lines
 def _query_account_key(cli_ctx, account_name):
     """Query the storage account key. This is used when the customer doesn't offer account key but name."""
+    from msrestazure.azure_exceptions import CloudError
+    from azure.cli.core.commands.resource_ids import invalidate_resource_id
     rg, scf = _query_account_rg(cli_ctx, account_name)
     t_storage_account_keys = get_sdk(
         cli_ctx, ResourceType.MGMT_STORAGE, 'models.storage_account_keys#StorageAccountKeys')
 
     scf.config.enable_http_logger = False
     logger.debug('Disable HTTP logging to avoid having storage keys in debug logs')
+    try:
+        keys = scf.storage_accounts.list_keys(rg, account_name)
+    except CloudError as ex:
+        if ex.status_code != 404:
+            raise
+        # The account was deleted or moved since its ID was cached
+        invalidate_resource_id(scf.config.subscription_id, STORAGE_ACCOUNT_RESOURCE_TYPE, account_name)
+        rg, scf = _query_account_rg(cli_ctx, account_name)
+        keys = scf.storage_accounts.list_keys(rg, account_name)
     if t_storage_account_keys:
-        return scf.storage_accounts.list_keys(rg, account_name).key1
+        return keys.key1
     # of type: models.storage_account_list_keys_result#StorageAccountListKeysResult
-    return scf.storage_accounts.list_keys(rg, account_name).keys[0].value  # pylint: disable=no-member
+    return keys.keys[0].value  # pylint: disable=no-member
 
 
 def _query_account_rg(cli_ctx, account_name):
     """Query the storage account's resource group, which the mgmt sdk requires."""
+    from azure.cli.core.commands.resource_ids import resolve_resource_id
     scf = storage_client_factory(cli_ctx)
-    acc = next((x for x in scf.storage_accounts.list() if x.name == account_name), None)
-    if acc:
+    # the storage accounts of the subscription are listed once and their IDs cached for the next commands
+    account_id = resolve_resource_id(scf.config.subscription_id, STORAGE_ACCOUNT_RESOURCE_TYPE, account_name,
+                                     scf.storage_accounts.list)
+    if account_id:
         from msrestazure.tools import parse_resource_id
-        return parse_resource_id(acc.id)['resource_group'], scf
+        return parse_resource_id(account_id)['resource_group'], scf
     raise ValueError("Storage account '{}' not found.".format(account_name))
 
 
@@ -114,9 +114,21 @@ def create_storage_account(cmd, resource_group_name, account_name, sku=None, loc
             publish_internet_endpoints=str2bool(publish_internet_endpoints)
         )
 
+    # an account with the same name may have been deleted from another resource group
+    from azure.cli.core.commands.resource_ids import invalidate_resource_id
+    from azure.cli.command_modules.storage._validators import STORAGE_ACCOUNT_RESOURCE_TYPE
+    invalidate_resource_id(scf.config.subscription_id, STORAGE_ACCOUNT_RESOURCE_TYPE, account_name)
     return scf.storage_accounts.create(resource_group_name, account_name, params)
 
 
+def delete_storage_account(client, resource_group_name, account_name):
+    # the ID of the account is cached by the commands which accept an account name without its resource group
+    from azure.cli.core.commands.resource_ids import invalidate_resource_id
+    from azure.cli.command_modules.storage._validators import STORAGE_ACCOUNT_RESOURCE_TYPE
+    invalidate_resource_id(client.config.subscription_id, STORAGE_ACCOUNT_RESOURCE_TYPE, account_name)
+    return client.delete(resource_group_name, account_name)
+
+
 def list_storage_accounts(cmd, resource_group_name=None):
     scf = storage_client_factory(cmd.cli_ctx)
     if resource_group_name:
@@ -162,6 +162,32 @@ class TestCmdModuleStorageValidators(unittest.TestCase):
         validate_source_uri(MockCmd(self.cli), ns)
         self.assertEqual(ns.copy_source, 'https://other_name.file.core.windows.net/share2?some_sas_token')
 
+    @mock.patch('azure.cli.command_modules.storage._validators.storage_client_factory', autospec=True)
+    def test_query_account_key_of_a_recreated_account(self, client_factory):
+        from msrestazure.azure_exceptions import CloudError
+        from azure.cli.command_modules.storage._validators import _query_account_key
+
+        def _account(resource_group):
+            account = mock.Mock(id='/subscriptions/sub1/resourceGroups/{}/providers/Microsoft.Storage/'
+                                   'storageAccounts/account1'.format(resource_group))
+            account.name = 'account1'
+            return account
+
+        def _list_keys(resource_group_name, account_name):
+            if resource_group_name != 'rg2':
+                raise CloudError(mock.Mock(status_code=404), error='ResourceNotFound')
+            return mock.Mock(key1='key', keys=[mock.Mock(value='key')])
+
+        scf = client_factory.return_value
+        scf.config.subscription_id = 'sub1'
+        # the account was deleted and created again in another resource group since its ID was cached
+        scf.storage_accounts.list.side_effect = [[_account('rg1')], [_account('rg2')]]
+        scf.storage_accounts.list_keys.side_effect = _list_keys
+
+        with mock.patch('azure.cli.core._session.RESOURCE_IDS', {}):
+            self.assertEqual(_query_account_key(self.cli, 'account1'), 'key')
+        self.assertEqual(scf.storage_accounts.list_keys.call_count, 2)
+
 
 @api_version_constraint(resource_type=ResourceType.MGMT_STORAGE, min_api='2016-12-01')
 class TestEncryptionValidators(unittest.TestCase):
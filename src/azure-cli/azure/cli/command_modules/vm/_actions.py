@@ -32,56 +32,239 @@ def _get_thread_count():
     return 5  # don't increase too much till https://github.com/Azure/msrestazure-for-python/issues/6 is fixed
 
 
-def load_images_thru_services(cli_ctx, publisher, offer, sku, location):
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    all_images = []
-    client = _compute_client_factory(cli_ctx)
-    if location is None:
-        location = get_one_of_subscription_locations(cli_ctx)
-
-    def _load_images_from_publisher(publisher):
+# requests' default connection pool holds 10 connections per host; going beyond it only produces
+# "connection pool is full" warnings (https://github.com/Azure/msrestazure-for-python/issues/6)
+_MAX_IMAGE_LIST_CONCURRENCY = 10
+_MAX_THROTTLE_RETRIES = 5
+_DEFAULT_THROTTLE_DELAY = 5
+_IMAGE_CATALOG_DIR = 'vm_image_catalog'
+_DEFAULT_IMAGE_CATALOG_TTL = 60  # minutes
+
+
+class _AdaptiveConcurrency(object):
+    """
+    Bounds the number of in-flight requests. The limit is halved whenever the service throttles
+    and grows back by one after a full window of successful calls.
+    """
+
+    def __init__(self, initial, maximum):
+        import threading
+        self.limit = initial
+        self._maximum = maximum
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, *args):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self._maximum:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+
+    def on_throttled(self):
+        with self._cond:
+            self.limit = max(1, self.limit // 2)
+            self._successes = 0
+
+
+def _get_throttle_delay(ex):
+    """ Return the seconds to back off if `ex` is a throttling error, otherwise None. """
+    if getattr(ex, 'status_code', None) != 429:
+        return None
+    response = getattr(ex, 'response', None)
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return max(int(retry_after), 1)
+    except (TypeError, ValueError):
+        return _DEFAULT_THROTTLE_DELAY
+
+
+class _ImageListScheduler(object):
+    """
+    Walks publishers -> offers -> skus -> versions with every level fanned out on a shared pool, so
+    one large publisher no longer serializes the whole listing behind a single worker.
+    """
+
+    def __init__(self, client, location, offer=None, sku=None):
+        import threading
+        self._client = client
+        self._location = location
+        self._offer = offer
+        self._sku = sku
+        self._concurrency = _AdaptiveConcurrency(_get_thread_count(), _MAX_IMAGE_LIST_CONCURRENCY)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._executor = None
+        self.images = []
+        self.incomplete_publishers = set()
+
+    def run(self, publishers):
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        with ThreadPoolExecutor(max_workers=_MAX_IMAGE_LIST_CONCURRENCY) as executor:
+            self._executor = executor
+            for p in publishers:
+                self._submit(self._list_offers, p)
+            while True:
+                with self._lock:
+                    pending = set(self._pending)
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                with self._lock:
+                    self._pending.difference_update(done)
+                for t in done:
+                    t.result()  # don't use the result but expose exceptions from the threads
+        return self.images
+
+    def _submit(self, func, *args):
+        with self._lock:
+            self._pending.add(self._executor.submit(func, *args))
+
+    def _call(self, publisher, operation, *args):
+        """ Invoke `operation` with throttling-aware retries. Returns None if the call failed. """
+        import time
         from msrestazure.azure_exceptions import CloudError
-        try:
-            offers = client.virtual_machine_images.list_offers(location, publisher)
-        except CloudError as e:
-            logger.warning(str(e))
-            return
-        if offer:
-            offers = [o for o in offers if _matched(offer, o.name)]
-        for o in offers:
-            try:
-                skus = client.virtual_machine_images.list_skus(location, publisher, o.name)
-            except CloudError as e:
-                logger.warning(str(e))
-                continue
-            if sku:
-                skus = [s for s in skus if _matched(sku, s.name)]
-            for s in skus:
+        for attempt in range(_MAX_THROTTLE_RETRIES + 1):
+            with self._concurrency:
                 try:
-                    images = client.virtual_machine_images.list(location, publisher, o.name, s.name)
+                    result = operation(self._location, publisher, *args)
                 except CloudError as e:
-                    logger.warning(str(e))
-                    continue
-                for i in images:
-                    all_images.append({
-                        'publisher': publisher,
-                        'offer': o.name,
-                        'sku': s.name,
-                        'version': i.name})
+                    delay = _get_throttle_delay(e)
+                    if delay is None or attempt == _MAX_THROTTLE_RETRIES:
+                        logger.warning(str(e))
+                        with self._lock:
+                            self.incomplete_publishers.add(publisher)
+                        return None
+                    self._concurrency.on_throttled()
+                    logger.debug("Throttled while listing images of '%s', retrying in %s seconds with %s "
+                                 "concurrent requests", publisher, delay, self._concurrency.limit)
+                else:
+                    self._concurrency.on_success()
+                    return result
+            time.sleep(delay)
+        return None
+
+    def _list_offers(self, publisher):
+        offers = self._call(publisher, self._client.virtual_machine_images.list_offers) or []
+        for o in offers:
+            if _matched(self._offer, o.name):
+                self._submit(self._list_skus, publisher, o.name)
+
+    def _list_skus(self, publisher, offer):
+        skus = self._call(publisher, self._client.virtual_machine_images.list_skus, offer) or []
+        for s in skus:
+            if _matched(self._sku, s.name):
+                self._submit(self._list_versions, publisher, offer, s.name)
+
+    def _list_versions(self, publisher, offer, sku):
+        images = self._call(publisher, self._client.virtual_machine_images.list, offer, sku) or []
+        with self._lock:
+            self.images.extend(_create_image_instance(publisher, offer, sku, i.name) for i in images)
+
+
+class _ImageCatalog(object):
+    """
+    Per-location on-disk copy of the marketplace image listing, so repeated `az vm image list --all`
+    calls are answered locally until the entries are older than `[vm] image_catalog_ttl` minutes.
+    """
+
+    def __init__(self, cli_ctx, location):
+        import os
+        from azure.cli.core._environment import get_config_dir
+        self.ttl = cli_ctx.config.getint('vm', 'image_catalog_ttl', fallback=_DEFAULT_IMAGE_CATALOG_TTL)
+        self.path = os.path.join(get_config_dir(), _IMAGE_CATALOG_DIR, cli_ctx.cloud.name or 'AzureCloud',
+                                 '{}.json'.format(location.lower()))
+        self._data = {'publishers': {}, 'images': {}}
+        self._dirty = False
+        if self.ttl > 0:
+            self._load()
+
+    def _load(self):
+        from ._vm_utils import read_cache_file
+        self._data = read_cache_file(self.path) or self._data
+
+    def _is_fresh(self, entry):
+        import time
+        return bool(entry) and self.ttl > 0 and time.time() - entry.get('last_saved', 0) < self.ttl * 60
+
+    def get_publishers(self):
+        entry = self._data['publishers']
+        return entry['names'] if self._is_fresh(entry) else None
+
+    def set_publishers(self, names):
+        import time
+        self._data['publishers'] = {'last_saved': time.time(), 'names': names}
+        self._dirty = True
+
+    def get_images(self, publisher):
+        entry = self._data['images'].get(publisher)
+        if not self._is_fresh(entry):
+            return None
+        return [_create_image_instance(publisher, *i) for i in entry['images']]
+
+    def set_images(self, publisher, images):
+        import time
+        self._data['images'][publisher] = {
+            'last_saved': time.time(),
+            'images': [[i['offer'], i['sku'], i['version']] for i in images]
+        }
+        self._dirty = True
+
+    def save(self):
+        from ._vm_utils import write_cache_file
+        if self.ttl > 0 and self._dirty:
+            write_cache_file(self.path, self._data)
 
-    publishers = client.virtual_machine_images.list_publishers(location)
-    if publisher:
-        publishers = [p for p in publishers if _matched(publisher, p.name)]
 
-    publisher_num = len(publishers)
-    if publisher_num > 1:
-        with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
-            tasks = [executor.submit(_load_images_from_publisher, p.name) for p in publishers]
-            for t in as_completed(tasks):
-                t.result()  # don't use the result but expose exceptions from the threads
-    elif publisher_num == 1:
-        _load_images_from_publisher(publishers[0].name)
+def load_images_thru_services(cli_ctx, publisher, offer, sku, location):
+    if location is None:
+        location = get_one_of_subscription_locations(cli_ctx)
+    client = _compute_client_factory(cli_ctx)
+    catalog = _ImageCatalog(cli_ctx, location)
 
+    publishers = catalog.get_publishers()
+    if publishers is None:
+        publishers = [p.name for p in client.virtual_machine_images.list_publishers(location)]
+        catalog.set_publishers(publishers)
+    if publisher:
+        publishers = [p for p in publishers if _matched(publisher, p)]
+
+    all_images = []
+    to_load = []
+    for p in publishers:
+        cached = catalog.get_images(p)
+        if cached is None:
+            to_load.append(p)
+        else:
+            all_images.extend(i for i in cached if _matched(offer, i['offer']) and _matched(sku, i['sku']))
+
+    if to_load:
+        scheduler = _ImageListScheduler(client, location, offer, sku)
+        loaded = scheduler.run(to_load)
+        all_images.extend(loaded)
+        if not offer and not sku:
+            # only complete, unfiltered listings of a publisher are worth keeping
+            by_publisher = {p: [] for p in to_load if p not in scheduler.incomplete_publishers}
+            for i in loaded:
+                if i['publisher'] in by_publisher:
+                    by_publisher[i['publisher']].append(i)
+            for p, images in by_publisher.items():
+                catalog.set_images(p, images)
+    catalog.save()
     return all_images
 
 
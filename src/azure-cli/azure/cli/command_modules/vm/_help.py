@@ -1433,6 +1433,10 @@ short-summary: List the VM/VMSS images available in the Azure Marketplace.
 parameters:
   - name: --all
     short-summary: Retrieve image list from live Azure service rather using an offline image list
+    long-summary: >
+        Listings are kept in a per-location catalog under the configuration directory and reused for
+        `[vm] image_catalog_ttl` minutes (default 60). Set it to 0 (or AZURE_VM_IMAGE_CATALOG_TTL=0) to always
+        query the service.
   - name: --offer -f
     short-summary: Image offer name, partial name is accepted
   - name: --publisher -p
@@ -1568,10 +1572,15 @@ examples:
 helps['vm list-skus'] = """
 type: command
 short-summary: Get details for compute-related resource SKUs.
-long-summary: This command incorporates subscription level restriction, offering the most accurate information.
+long-summary: >
+    This command incorporates subscription level restriction, offering the most accurate information.
+    When a location is given, the SKUs of that location are cached locally for `[vm] sku_cache_ttl` minutes (default 60);
+    use `--refresh` to download them again.
 examples:
   - name: List all SKUs in the West US region.
     text: az vm list-skus -l westus
+  - name: List all SKUs in the West US region, bypassing the local cache.
+    text: az vm list-skus -l westus --refresh
   - name: List all available vm sizes in the East US2 region which support availability zone.
     text: az vm list-skus -l eastus2 --zone
   - name: List all available vm sizes in the East US2 region which support availability zone with name like "standard_ds1...".
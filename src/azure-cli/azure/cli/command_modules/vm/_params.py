@@ -446,6 +446,8 @@ def load_arguments(self, _):
         c.argument('show_all', options_list=['--all'], arg_type=get_three_state_flag(),
                    help="show all information including vm sizes not available under the current subscription")
         c.argument('resource_type', options_list=['--resource-type', '-r'], help='resource types e.g. "availabilitySets", "snapshots", "disks", etc')
+        c.argument('refresh', arg_type=get_three_state_flag(),
+                   help="download the SKU list again instead of using the local cache, which is kept for `[vm] sku_cache_ttl` minutes (default 60)")
 
     with self.argument_context('vm restart') as c:
         c.argument('force', action='store_true', help='Force the VM to restart by redeploying it. Use if the VM is unresponsive.')
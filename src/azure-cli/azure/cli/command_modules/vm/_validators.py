@@ -337,12 +337,11 @@ def _get_storage_profile_description(profile):
 
 
 def _validate_location(cmd, namespace, zone_info, size_info):
-    from ._vm_utils import list_sku_info
+    from ._vm_utils import SkuStore
     if not namespace.location:
         get_default_location_from_resource_group(cmd, namespace)
         if zone_info:
-            sku_infos = list_sku_info(cmd.cli_ctx, namespace.location)
-            temp = next((x for x in sku_infos if x.name.lower() == size_info.lower()), None)
+            temp = SkuStore(cmd.cli_ctx, namespace.location).get(size_info)
             # For Stack (compute - 2017-03-30), Resource_sku doesn't implement location_info property
             if not hasattr(temp, 'location_info'):
                 return
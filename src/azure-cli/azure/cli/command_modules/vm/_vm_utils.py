@@ -6,6 +6,7 @@
 import json
 import os
 import re
+import time
 try:
     from urllib.parse import urlparse
 except ImportError:
@@ -127,6 +128,115 @@ def list_sku_info(cli_ctx, location=None):
     return result
 
 
+def read_cache_file(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, IOError, ValueError):
+        return None
+
+
+def write_cache_file(path, data):
+    """ Write `data` as JSON through a temp file and a rename so concurrent readers never see partial content. """
+    from knack.util import ensure_dir
+    from azure.cli.core.util import atomic_write
+    try:
+        ensure_dir(os.path.dirname(path))
+        with atomic_write(path) as f:
+            json.dump(data, f)
+    except (OSError, IOError) as ex:
+        logger.debug("Failed to save cache file '%s': %s", path, ex)
+
+
+_SKU_CACHE_DIR = 'vm_sku_cache'
+_DEFAULT_SKU_CACHE_TTL = 60  # minutes
+_NOT_AVAILABLE_FOR_SUBSCRIPTION = 'NotAvailableForSubscription'
+
+
+class SkuStore(object):
+    """
+    Resource SKUs of a location, indexed by resource type, name, zone support and restriction reason.
+
+    The SKU catalogue is downloaded at most once per `[vm] sku_cache_ttl` minutes (default 60, 0 disables
+    the cache) and kept on disk per subscription and location; entries are only deserialized into SDK
+    models when a query returns them. Without a location nothing is cached.
+    """
+
+    def __init__(self, cli_ctx, location=None, refresh=False):
+        self.cli_ctx = cli_ctx
+        self.location = location
+        self._skus = []
+        self._index = {}
+        self._models = {}
+        self._path = None
+        ttl = cli_ctx.config.getint('vm', 'sku_cache_ttl', fallback=_DEFAULT_SKU_CACHE_TTL)
+        if location and ttl > 0:
+            from azure.cli.core._environment import get_config_dir
+            from azure.cli.core.commands.client_factory import get_subscription_id
+            self._path = os.path.join(get_config_dir(), _SKU_CACHE_DIR, cli_ctx.cloud.name or 'AzureCloud',
+                                      get_subscription_id(cli_ctx), '{}.json'.format(location.lower()))
+        data = None if (refresh or not self._path) else read_cache_file(self._path)
+        if data and time.time() - data.get('last_saved', 0) < ttl * 60:
+            logger.debug("Loading resource SKUs from cache '%s'", self._path)
+            self._skus, self._index = data['skus'], data['index']
+        else:
+            self._load_from_service()
+
+    def _load_from_service(self):
+        skus = list_sku_info(self.cli_ctx, self.location)
+        self._skus = [s.serialize(keep_readonly=True) for s in skus]
+        self._models = dict(enumerate(skus))
+        self._index = self._build_index(skus)
+        if self._path:
+            write_cache_file(self._path, {'last_saved': time.time(), 'skus': self._skus, 'index': self._index})
+
+    @staticmethod
+    def _build_index(skus):
+        index = {'resource_type': {}, 'name': {}, 'zonal': [], 'restriction': {}}
+        for i, sku in enumerate(skus):
+            index['resource_type'].setdefault((sku.resource_type or '').lower(), []).append(i)
+            index['name'].setdefault((sku.name or '').lower(), []).append(i)
+            # For Stack (compute - 2017-03-30), Resource_sku doesn't implement location_info property
+            location_info = getattr(sku, 'location_info', None)
+            if location_info and location_info[0].zones:
+                index['zonal'].append(i)
+            for reason in {r.reason_code for r in (sku.restrictions or [])}:
+                index['restriction'].setdefault(reason, []).append(i)
+        return index
+
+    def _model(self, i):
+        if i not in self._models:
+            from azure.cli.core.profiles import ResourceType, get_sdk
+            ResourceSku = get_sdk(self.cli_ctx, ResourceType.MGMT_COMPUTE, 'ResourceSku', mod='models',
+                                  operation_group='resource_skus')
+            self._models[i] = ResourceSku.deserialize(self._skus[i])
+        return self._models[i]
+
+    def _of_type(self, resource_type):
+        return set(self._index['resource_type'].get(resource_type.lower(), []))
+
+    def query(self, resource_type=None, size=None, zone=None, show_all=False):
+        ids = set(range(len(self._skus)))
+        if resource_type:
+            ids &= self._of_type(resource_type)
+        if size or zone:
+            ids &= self._of_type('virtualMachines')
+        if size:
+            size = size.lower()
+            ids &= {i for name, matches in self._index['name'].items() if size in name for i in matches}
+        if zone:
+            ids &= set(self._index['zonal'])
+        if not show_all:
+            ids -= set(self._index['restriction'].get(_NOT_AVAILABLE_FOR_SUBSCRIPTION, []))
+        return [self._model(i) for i in sorted(ids)]
+
+    def get(self, name, resource_type=None):
+        ids = self._index['name'].get(name.lower(), [])
+        if resource_type:
+            ids = [i for i in ids if i in self._of_type(resource_type)]
+        return self._model(ids[0]) if ids else None
+
+
 def normalize_disk_info(image_data_disks=None,
                         data_disk_sizes_gb=None, attach_data_disks=None, storage_sku=None,
                         os_disk_caching=None, data_disk_cachings=None, size='', ephemeral_os_disk=False):
@@ -934,20 +934,10 @@ def get_vm_details(cmd, resource_group_name, vm_name):
     return result
 
 
-def list_skus(cmd, location=None, size=None, zone=None, show_all=None, resource_type=None):
-    from ._vm_utils import list_sku_info
-    result = list_sku_info(cmd.cli_ctx, location)
-    if not show_all:
-        result = [x for x in result if not [y for y in (x.restrictions or [])
-                                            if y.reason_code == 'NotAvailableForSubscription']]
-    if resource_type:
-        result = [x for x in result if x.resource_type.lower() == resource_type.lower()]
-    if size:
-        result = [x for x in result if x.resource_type == 'virtualMachines' and size.lower() in x.name.lower()]
-    if zone:
-        result = [x for x in result if x.resource_type == 'virtualMachines' and
-                  x.location_info and x.location_info[0].zones]
-    return result
+def list_skus(cmd, location=None, size=None, zone=None, show_all=None, resource_type=None, refresh=None):
+    from ._vm_utils import SkuStore
+    store = SkuStore(cmd.cli_ctx, location, refresh=refresh)
+    return store.query(resource_type=resource_type, size=size, zone=zone, show_all=show_all)
 
 
 def list_vm(cmd, resource_group_name=None, show_details=False):
@@ -401,6 +401,72 @@ class TestVMBootLog(unittest.TestCase):
             get_sdk_mock.assert_called_with(cli_ctx_mock, ResourceType.DATA_STORAGE, 'blob.blockblobservice#BlockBlobService')
 
 
+class TestVMListSkus(unittest.TestCase):
+
+    @staticmethod
+    def _sku(name, resource_type='virtualMachines', zones=None, restricted=False):
+        ResourceSku = get_sdk(DummyCli(), ResourceType.MGMT_COMPUTE, 'ResourceSku', mod='models',
+                              operation_group='resource_skus')
+        data = {
+            'resourceType': resource_type,
+            'name': name,
+            'locations': ['westus'],
+            'locationInfo': [{'location': 'westus', 'zones': zones or []}],
+            'restrictions': [{'type': 'Location', 'values': ['westus'],
+                              'reasonCode': 'NotAvailableForSubscription'}] if restricted else []
+        }
+        return ResourceSku.deserialize(data)
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': self.config_dir}).start()
+        mock.patch('azure.cli.core.commands.client_factory.get_subscription_id', return_value='sub1').start()
+        self.list_sku_info_mock = mock.patch('azure.cli.command_modules.vm._vm_utils.list_sku_info',
+                                             autospec=True).start()
+        self.addCleanup(mock.patch.stopall)
+        self.list_sku_info_mock.return_value = [
+            self._sku('Standard_DS1_v2', zones=['1', '2']),
+            self._sku('Standard_DS2_v2'),
+            self._sku('Standard_M128', restricted=True),
+            self._sku('Aligned', resource_type='availabilitySets'),
+        ]
+
+    def test_list_skus_filters(self):
+        from azure.cli.command_modules.vm.custom import list_skus
+        cmd = _get_test_cmd()
+
+        def names(skus):
+            return [s.name for s in skus]
+
+        self.assertEqual(names(list_skus(cmd, 'westus')), ['Standard_DS1_v2', 'Standard_DS2_v2', 'Aligned'])
+        self.assertEqual(names(list_skus(cmd, 'westus', show_all=True)),
+                         ['Standard_DS1_v2', 'Standard_DS2_v2', 'Standard_M128', 'Aligned'])
+        self.assertEqual(names(list_skus(cmd, 'westus', size='ds')), ['Standard_DS1_v2', 'Standard_DS2_v2'])
+        self.assertEqual(names(list_skus(cmd, 'westus', zone=True)), ['Standard_DS1_v2'])
+        self.assertEqual(names(list_skus(cmd, 'westus', resource_type='availabilitysets')), ['Aligned'])
+        self.assertEqual(list_skus(cmd, 'westus', zone=True)[0].location_info[0].zones, ['1', '2'])
+
+        # only the first call reached the service
+        self.assertEqual(self.list_sku_info_mock.call_count, 1)
+        list_skus(cmd, 'westus', refresh=True)
+        self.assertEqual(self.list_sku_info_mock.call_count, 2)
+        list_skus(cmd, 'eastus')
+        self.assertEqual(self.list_sku_info_mock.call_count, 3)
+
+    def test_sku_store_lookup_by_name(self):
+        from azure.cli.command_modules.vm._vm_utils import SkuStore
+        cli_ctx = DummyCli()
+        SkuStore(cli_ctx, 'westus')
+        store = SkuStore(cli_ctx, 'westus')
+        self.assertEqual(self.list_sku_info_mock.call_count, 1)
+        self.assertEqual(store.get('standard_ds1_v2').location_info[0].zones, ['1', '2'])
+        self.assertIsNone(store.get('Aligned', resource_type='virtualMachines'))
+        self.assertIsNone(store.get('Standard_A0'))
+
+
 class FakedVM(object):  # pylint: disable=too-few-public-methods
     def __init__(self, nics=None, disks=None, os_disk=None):
         self.network_profile = NetworkProfile(network_interfaces=nics)
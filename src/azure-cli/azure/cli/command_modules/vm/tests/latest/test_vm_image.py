@@ -70,6 +70,80 @@ class TestVMImage(unittest.TestCase):
         self.assertEqual(images[0], {'urnAlias': 'CentOS', 'publisher': 'OpenLogic',
                                      'offer': 'CentOS', 'sku': '7.5', 'version': 'latest'})
 
+    @staticmethod
+    def _mock_image_client():
+        def _named(*names):
+            result = []
+            for n in names:
+                item = mock.MagicMock()
+                item.name = n
+                result.append(item)
+            return result
+
+        client = mock.MagicMock()
+        images = client.virtual_machine_images
+        images.list_publishers.return_value = _named('Canonical', 'OpenLogic')
+        images.list_offers.side_effect = lambda location, publisher: _named(publisher + 'Offer1', publisher + 'Offer2')
+        images.list_skus.side_effect = lambda location, publisher, offer: _named('sku1', 'sku2')
+        images.list.side_effect = lambda location, publisher, offer, sku: _named('1.0', '2.0')
+        return client
+
+    @mock.patch('azure.cli.command_modules.vm._actions._compute_client_factory', autospec=True)
+    def test_load_images_thru_services_with_catalog(self, client_factory_mock):
+        import shutil
+        import tempfile
+        from azure.cli.command_modules.vm._actions import load_images_thru_services
+        client = self._mock_image_client()
+        client_factory_mock.return_value = client
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir)
+        cli_ctx = DummyCli()
+
+        with mock.patch.dict('os.environ', {'AZURE_CONFIG_DIR': config_dir}):
+            images = load_images_thru_services(cli_ctx, None, None, None, 'westus')
+            self.assertEqual(len(images), 2 * 2 * 2 * 2)
+            self.assertEqual(client.virtual_machine_images.list.call_count, 8)
+
+            # served from the catalog, filters are applied locally
+            filtered = load_images_thru_services(cli_ctx, 'canon', 'offer1', 'sku2', 'westus')
+            self.assertEqual(client.virtual_machine_images.list.call_count, 8)
+            self.assertEqual(client.virtual_machine_images.list_publishers.call_count, 1)
+            self.assertEqual(sorted(i['version'] for i in filtered), ['1.0', '2.0'])
+            self.assertTrue(all(i['offer'] == 'CanonicalOffer1' and i['sku'] == 'sku2' for i in filtered))
+
+            # a different location has its own catalog
+            load_images_thru_services(cli_ctx, None, None, None, 'eastus')
+            self.assertEqual(client.virtual_machine_images.list_publishers.call_count, 2)
+
+    @mock.patch('azure.cli.command_modules.vm._actions._compute_client_factory', autospec=True)
+    def test_load_images_thru_services_without_catalog(self, client_factory_mock):
+        from azure.cli.command_modules.vm._actions import load_images_thru_services
+        client = self._mock_image_client()
+        client_factory_mock.return_value = client
+        cli_ctx = DummyCli()
+
+        with mock.patch.dict('os.environ', {'AZURE_VM_IMAGE_CATALOG_TTL': '0'}):
+            load_images_thru_services(cli_ctx, 'OpenLogic', None, None, 'westus')
+            images = load_images_thru_services(cli_ctx, 'OpenLogic', None, '1', 'westus')
+        self.assertEqual(client.virtual_machine_images.list_publishers.call_count, 2)
+        self.assertEqual(len(images), 2 * 1 * 2)
+
+    @mock.patch('time.sleep', autospec=True)
+    def test_image_list_scheduler_retries_throttled_calls(self, sleep_mock):
+        from msrestazure.azure_exceptions import CloudError
+        from azure.cli.command_modules.vm._actions import _ImageListScheduler
+        client = self._mock_image_client()
+        throttled = CloudError(mock.MagicMock(status_code=429, headers={'Retry-After': '3'}), error='throttled')
+        offers_side_effect = client.virtual_machine_images.list_offers.side_effect
+        client.virtual_machine_images.list_offers.side_effect = [throttled, offers_side_effect('westus', 'Canonical')]
+
+        scheduler = _ImageListScheduler(client, 'westus')
+        images = scheduler.run(['Canonical'])
+
+        sleep_mock.assert_called_once_with(3)
+        self.assertEqual(len(images), 2 * 2 * 2)
+        self.assertFalse(scheduler.incomplete_publishers)
+
 
 if __name__ == '__main__':
     unittest.main()